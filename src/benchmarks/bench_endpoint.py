@@ -0,0 +1,75 @@
+"""
+Vazão da rota de débitos de ponta a ponta (URL, view, caso de uso, parser e
+renderer) pelo client de testes do Django.
+
+    cd src && python -m benchmarks.bench_endpoint
+
+O cache de respostas é desligado para que toda requisição passe pelo
+serviço, e o webservice é a frota sintética (`SyntheticDetran`): cada
+requisição consulta um veículo diferente.
+"""
+import os
+import time
+from itertools import islice
+from typing import Dict
+
+import django
+
+from core.debts.application.SP.services.synthetic import (
+    SyntheticDetran,
+    SyntheticProfile,
+)
+
+DETRAN = SyntheticDetran(profile=SyntheticProfile(vehicles=10_000))
+
+DEBT_OPTIONS = {"all": "", "ipva": "ipva"}
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+    django.setup()
+
+    from dependency_injector import providers
+
+    from django_app.container import container
+
+    container.detran_SP_response_cache.override(providers.Object(None))
+    container.detran_SP_api.override(providers.Object(DETRAN.api_class()))
+
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    # libera o host "testserver" no ALLOWED_HOSTS
+    setup_test_environment()
+    return Client()
+
+
+def run(requests=500) -> Dict[str, float]:
+    """
+    Segundos por requisição ao `/debts/`, por tipo de busca.
+    """
+    client = setup()
+    results = {}
+    for name, debt_option in DEBT_OPTIONS.items():
+        queries = [
+            {"license_plate": plate, "renavam": renavam, "debt_option": debt_option}
+            for plate, renavam in islice(DETRAN.vehicles(), requests)
+        ]
+        for query in queries[:20]:
+            assert client.get("/debts/", query).status_code == 200
+
+        started_at = time.perf_counter()
+        for query in queries:
+            client.get("/debts/", query)
+        seconds = time.perf_counter() - started_at
+        results[f"endpoint.debts[{name}]"] = seconds / len(queries)
+    return results
+
+
+def main():
+    for name, seconds in run().items():
+        print(f"{name:<24} {seconds * 1e3:8.3f}ms  {1 / seconds:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Consultas ao webservice via HTTPAPI com pool de conexões keep-alive contra
+uma conexão nova por requisição, usando um servidor HTTP local.
+
+    cd src && python -m benchmarks.bench_http_api
+
+O servidor local é HTTP puro: em produção (HTTPS) a diferença é maior, já
+que cada conexão nova também paga o handshake TLS.
+"""
+import http.client
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.debts.application.SP.services.api import API
+from core.debts.application.SP.services.http_api import HTTPAPI, ConnectionPool
+
+PAYLOAD = json.dumps(API("ABC1234", "11111111111", "ConsultaMultas").fetch()).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # cabeçalho e corpo saem em writes separados: sem TCP_NODELAY o
+        # keep-alive esbarra no Nagle + delayed ACK
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch_new_connection(port):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        connection.request(
+            "GET", "/ConsultaMultas?placa=ABC1234", headers={"Connection": "close"}
+        )
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def run(fn, requests, workers):
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda _: fn(), range(requests)))
+    return time.perf_counter() - started_at
+
+
+def main(requests=2_000, workers=8):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+    pool = ConnectionPool(f"http://127.0.0.1:{port}", maxsize=workers)
+
+    try:
+        results = {
+            "new connection": run(
+                lambda: fetch_new_connection(port), requests, workers
+            ),
+            "pooled": run(
+                lambda: HTTPAPI("ABC1234", "1", "ConsultaMultas", pool=pool).fetch(),
+                requests,
+                workers,
+            ),
+        }
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+    for label, seconds in results.items():
+        print(
+            f"{label:<15} {requests / seconds:8.0f} req/s"
+            f"  {seconds / requests * 1e6:8.1f}us/req"
+        )
+    print(f"conexões abertas pelo pool: {pool.connections_created}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Tempo do `SPParser.collect_all_debts` (passada única pela resposta) para
+respostas com 1 a 10.000 débitos, comparado com a coleta categoria por
+categoria concatenando as listas.
+
+    cd src && python -m benchmarks.bench_parser
+"""
+import timeit
+from functools import partial
+from typing import Dict, List
+
+from core.debts.application.dto import SPParserInput
+from core.debts.application.SP.services import SPParser, SPService
+from core.debts.application.SP.services.synthetic import (
+    SyntheticDetran,
+    SyntheticProfile,
+)
+from django_app.container import Container
+
+SIZES = (1, 10, 100, 1_000, 10_000)
+
+
+def make_response(size: int, seed: int = 0) -> Dict:
+    """
+    Resposta completa (as quatro consultas) de um veículo sintético com
+    `size` débitos: um licenciamento e os demais divididos entre multas,
+    IPVAs e DPVATs.
+    """
+    others = size - 1
+    detran = SyntheticDetran(
+        profile=SyntheticProfile(
+            seed=seed,
+            vehicles=1,
+            tickets=others - 2 * (others // 3),
+            ipvas=others // 3,
+            dpvats=others // 3,
+            licensing_rate=1,
+        )
+    )
+    plate, renavam = detran.vehicle(0)
+    return SPService(api_class=detran.api_class()).execute(
+        license_plate=plate, renavam=renavam
+    )
+
+
+def collect_by_category(parser: SPParser, input_param: SPParserInput) -> List:
+    multas = list(parser.collect_ticket_debts(input_param))
+    ipvas = list(parser.collect_ipva_debts(input_param))
+    dpvats = list(parser.collect_insurance_debts(input_param))
+    licenciamento = list(parser.collect_licensing_debts(input_param))
+    return multas + ipvas + dpvats + licenciamento
+
+
+def run(sizes=SIZES, debts_per_round=20_000) -> Dict[str, float]:
+    """
+    Segundos por chamada, por forma de coleta e tamanho de resposta.
+    """
+    parser = Container().application_service_SPParser()
+    results = {}
+    for size in sizes:
+        input_param = SPParserInput(data=make_response(size))
+        number = max(1, debts_per_round // size)
+        for name, collect in (
+            ("collect_all_debts", parser.collect_all_debts),
+            ("collect_by_category", partial(collect_by_category, parser)),
+        ):
+            seconds = min(
+                timeit.repeat(lambda: collect(input_param), number=number, repeat=5)
+            )
+            results[f"parser.{name}[{size}]"] = seconds / number
+    return results
+
+
+def main():
+    for name, seconds in run().items():
+        size = int(name.rstrip("]").rsplit("[", 1)[1])
+        print(
+            f"{name:<34} {seconds * 1e3:10.3f}ms  {seconds / size * 1e6:8.2f}us/débito"
+        )
+
+
+if __name__ == "__main__":
+    main()
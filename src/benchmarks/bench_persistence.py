@@ -0,0 +1,123 @@
+"""
+Gravação dos débitos de uma varredura de frota num SQLite em arquivo: o
+`DjangoDebtWriter` (upsert em lote com `bulk_create`) com alguns tamanhos de
+lote, comparado com um `update_or_create` por débito.
+
+    cd src && python -m benchmarks.bench_persistence
+"""
+import os
+import tempfile
+import time
+from functools import partial
+from itertools import islice
+from typing import Dict, List
+
+import django
+
+from core.debts.application.dto import FleetDebtsOutput, SearchDebtsInput
+from core.debts.application.SP.services.synthetic import (
+    SyntheticDetran,
+    SyntheticProfile,
+)
+
+DETRAN = SyntheticDetran(profile=SyntheticProfile(vehicles=1_000))
+
+BATCH_SIZES = (100, 500, 2_000)
+
+
+def setup(path: str) -> None:
+    """
+    Configura o Django com um banco SQLite novo em `path`.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    # outras suítes podem já ter aberto a conexão com o banco de dev
+    connection.close()
+    connection.settings_dict["NAME"] = path
+
+    call_command("migrate", verbosity=0)
+
+
+def make_results(vehicles: int) -> List[FleetDebtsOutput]:
+    from dependency_injector import providers
+
+    from django_app.container import container
+
+    container.detran_SP_api.override(providers.Object(DETRAN.api_class()))
+    use_case = container.use_case_search_debts_sp()
+    return [
+        FleetDebtsOutput(
+            index=index,
+            license_plate=plate,
+            renavam=renavam,
+            debts_list=use_case.search(
+                SearchDebtsInput(license_plate=plate, renavam=renavam)
+            ).debts_list,
+        )
+        for index, (plate, renavam) in enumerate(islice(DETRAN.vehicles(), vehicles))
+    ]
+
+
+def write_one_by_one(results: List[FleetDebtsOutput]) -> int:
+    from core.debts.infra.django_app.models import Debt
+    from core.debts.infra.django_app.writers import UPDATE_FIELDS, DjangoDebtWriter
+
+    written = 0
+    for result in results:
+        for row in DjangoDebtWriter.rows(
+            result.license_plate, result.renavam, result.debts_list
+        ):
+            Debt.objects.update_or_create(
+                license_plate=row.license_plate,
+                renavam=row.renavam,
+                type=row.type,
+                key=row.key,
+                defaults={name: getattr(row, name) for name in UPDATE_FIELDS},
+            )
+            written += 1
+    return written
+
+
+def bulk_upsert(writer_class, batch_size: int, results: List) -> int:
+    return writer_class(batch_size=batch_size).write(results)
+
+
+def run(vehicles=200) -> Dict[str, float]:
+    """
+    Segundos por débito gravado, por forma de gravação. Cada forma grava a
+    varredura duas vezes (inserção e atualização) numa tabela vazia.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        setup(os.path.join(directory, "bench.sqlite3"))
+
+        from core.debts.infra.django_app.models import Debt
+        from core.debts.infra.django_app.writers import DjangoDebtWriter
+
+        results = make_results(vehicles)
+        writers = {"one_by_one": write_one_by_one}
+        for batch_size in BATCH_SIZES:
+            writers[f"bulk_upsert[{batch_size}]"] = partial(
+                bulk_upsert, DjangoDebtWriter, batch_size
+            )
+
+        timings = {}
+        for name, write in writers.items():
+            Debt.objects.all().delete()
+            started_at = time.perf_counter()
+            written = write(results) + write(results)
+            seconds = time.perf_counter() - started_at
+            timings[f"persistence.{name}"] = seconds / written
+        return timings
+
+
+def main():
+    for name, seconds in run().items():
+        print(f"{name:<34} {seconds * 1e6:10.2f}us/débito")
+
+
+if __name__ == "__main__":
+    main()
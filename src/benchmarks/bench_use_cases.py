@@ -0,0 +1,93 @@
+"""
+Custo por débito dos casos de uso de criação: `execute` (entidade + mapper)
+contra `execute_direct` (output montado direto do registro).
+
+    cd src && python -m benchmarks.bench_use_cases
+"""
+import timeit
+import tracemalloc
+from typing import Dict
+
+from core.debts.application.dto import (
+    DPVATInput,
+    IPVAInput,
+    LicenciamentoInput,
+    MultaInput,
+)
+from core.debts.application.use_cases import (
+    CreateDPVATUseCase,
+    CreateIPVAUseCase,
+    CreateLicenciamentoUseCase,
+    CreateMultaUseCase,
+)
+
+CASES = {
+    "Multa": (
+        CreateMultaUseCase(),
+        MultaInput(
+            amount=20118,
+            auto_infraction="5E5E5E5E  ",
+            description="Estacionar em Desacordo com a Sinalizacao.",
+        ),
+    ),
+    "IPVA": (CreateIPVAUseCase(), IPVAInput(amount=136569, installment=8, year=2021)),
+    "DPVAT": (
+        CreateDPVATUseCase(),
+        DPVATInput(amount=523, description=None, year=2020),
+    ),
+    "Licenciamento": (
+        CreateLicenciamentoUseCase(),
+        LicenciamentoInput(amount=9891, description=None, year=2021),
+    ),
+}
+
+
+def time_per_debt(fn, input_param, number):
+    return min(timeit.repeat(lambda: fn(input_param), number=number, repeat=5)) / number
+
+
+def peak_bytes_per_debt(fn, input_param, number=1_000):
+    """
+    Pico de memória alocada durante a criação de um débito, incluindo os
+    objetos temporários (dicts, entidade) descartados ao final.
+    """
+    tracemalloc.start()
+    fn(input_param)
+    total = 0
+    for _ in range(number):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(input_param)
+        total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return total / number
+
+
+def functions():
+    for name, (use_case, input_param) in CASES.items():
+        for label, fn in (
+            ("execute", use_case.execute),
+            ("execute_direct", use_case.execute_direct),
+        ):
+            yield name, label, fn, input_param
+
+
+def run(number=20_000) -> Dict[str, float]:
+    """
+    Segundos por débito de cada caso de uso.
+    """
+    return {
+        f"use_cases.{name}.{label}": time_per_debt(fn, input_param, number)
+        for name, label, fn, input_param in functions()
+    }
+
+
+def main(number=20_000):
+    for name, label, fn, input_param in functions():
+        seconds = time_per_debt(fn, input_param, number)
+        peak = peak_bytes_per_debt(fn, input_param)
+        print(f"{name:<14} {label:<15} {seconds * 1e6:8.2f}us  peak={peak:7.1f}B")
+
+
+if __name__ == "__main__":
+    main()
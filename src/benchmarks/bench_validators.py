@@ -0,0 +1,79 @@
+"""
+Compara a validação das entidades pelo Serializer do DRF com as regras
+pré-compiladas.
+
+    cd src && python -m benchmarks.bench_validators
+"""
+import timeit
+
+from core.debts.domain.validators import (
+    DPVATValidatorFactory,
+    IPVAValidatorFactory,
+    LicenciamentoValidatorFactory,
+    MultaValidatorFactory,
+)
+
+CASES = {
+    "Multa": (
+        MultaValidatorFactory,
+        {
+            "amount": 20118,
+            "auto_infraction": "5E5E5E5E  ",
+            "description": "Estacionar em Desacordo com a Sinalizacao.",
+            "title": "Infração de Trânsito",
+            "type": "ticket",
+        },
+    ),
+    "IPVA": (
+        IPVAValidatorFactory,
+        {
+            "amount": 136569,
+            "description": "",
+            "installment": 8,
+            "title": "",
+            "type": "ipva",
+            "year": 2021,
+        },
+    ),
+    "DPVAT": (
+        DPVATValidatorFactory,
+        {
+            "amount": 523,
+            "description": None,
+            "title": "Seguro Obrigatório",
+            "type": "insurance",
+            "year": 2020,
+        },
+    ),
+    "Licenciamento": (
+        LicenciamentoValidatorFactory,
+        {
+            "amount": 9891,
+            "description": None,
+            "title": "Licenciamento",
+            "type": "licensing",
+            "year": 2021,
+        },
+    ),
+}
+
+
+def bench(create, data, number):
+    return (
+        min(timeit.repeat(lambda: create().validate(data), number=number, repeat=5))
+        / number
+    )
+
+
+def main(number=20_000):
+    for name, (factory, data) in CASES.items():
+        drf = bench(factory.create_drf, data, number)
+        fast = bench(factory.create, data, number)
+        print(
+            f"{name:<14} drf={drf * 1e6:8.2f}us  fast={fast * 1e6:8.2f}us"
+            f"  speedup={drf / fast:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Roda as suítes de benchmark, salva os resultados em JSON e compara com uma
+execução anterior.
+
+    cd src && python -m benchmarks.run --output bench.json
+    cd src && python -m benchmarks.run --baseline bench.json --threshold 0.2
+
+Os resultados são segundos por operação (menor é melhor). Com `--baseline`,
+qualquer resultado mais lento que `baseline * (1 + threshold)` é reportado
+como regressão e o comando termina com status 1.
+"""
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks import bench_endpoint, bench_parser, bench_persistence, bench_use_cases
+
+SUITES: Dict[str, Callable[[], Dict[str, float]]] = {
+    "parser": bench_parser.run,
+    "use_cases": bench_use_cases.run,
+    "endpoint": bench_endpoint.run,
+    "persistence": bench_persistence.run,
+}
+
+
+def run(suites: List[str]) -> Dict:
+    results = {}
+    for suite in suites:
+        results.update(SUITES[suite]())
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, float], current: Dict[str, float], threshold: float
+) -> List[Tuple[str, float, float, float]]:
+    """
+    Retorna `(nome, baseline, atual, variação)` dos resultados que pioraram
+    mais que `threshold`. Resultados ausentes em um dos lados são ignorados.
+    """
+    regressions = []
+    for name in sorted(baseline.keys() & current.keys()):
+        change = current[name] / baseline[name] - 1
+        if change > threshold:
+            regressions.append((name, baseline[name], current[name], change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=list(SUITES),
+        help="suíte a rodar (pode repetir); padrão: todas",
+    )
+    parser.add_argument("--output", help="arquivo JSON para salvar os resultados")
+    parser.add_argument("--baseline", help="arquivo JSON de uma execução anterior")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="piora relativa tolerada (padrão: 0.2, ou seja, 20%%)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run(args.suite or list(SUITES))
+    for name, seconds in report["results"].items():
+        print(f"{name:<40} {seconds * 1e6:12.2f}us")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+
+    regressions = compare(baseline, report["results"], args.threshold)
+    for name, before, after, change in regressions:
+        print(
+            f"REGRESSÃO {name}: {before * 1e6:.2f}us -> {after * 1e6:.2f}us"
+            f" (+{change:.0%})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,10 @@
+import io
+import json
+from functools import partial
+
+from core.debts.application.SP.services.exceptions import VehicleNotFoundException
+
+
 class API:
     vehicles = [
         ("ABC1234", "11111111111"),
@@ -7,7 +14,7 @@ class API:
         self.debt_option = debt_option
 
         if (license_plate, renavam) not in self.vehicles:
-            raise Exception("veículo não encontrado")
+            raise VehicleNotFoundException()
 
         self.license_plate = license_plate
         self.renavam = renavam
@@ -101,3 +108,10 @@ class API:
             }
         else:
             raise Exception("opção inválida")
+
+    def stream(self, chunk_size=1024):
+        body = io.BytesIO(json.dumps(self.fetch()).encode())
+        return iter(partial(body.read, chunk_size), b"")
+
+    async def afetch(self):
+        return self.fetch()
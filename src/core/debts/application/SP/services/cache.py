@@ -0,0 +1,151 @@
+import abc
+import threading
+import time
+from abc import ABC
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Entrada do cache negativo: veículo que o webservice não encontrou.
+NOT_FOUND = "VeiculoNaoEncontrado"
+
+# Tempo de vida (segundos) de cada consulta: multas mudam com mais frequência
+# do que licenciamento. Veículos não encontrados ficam pouco tempo, para que
+# um cadastro recente apareça logo.
+DEFAULT_TTLS = {
+    "ConsultaMultas": 60,
+    "ConsultaIPVA": 10 * 60,
+    "ConsultaDPVAT": 60 * 60,
+    "ConsultaLicenciamento": 60 * 60,
+    NOT_FOUND: 30,
+}
+
+
+class ResponseCache(ABC):
+    """
+    Cache das respostas do Detran-SP por placa, renavam e consulta.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None) -> None:
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._counters_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(license_plate: str, renavam: str, consultation: str) -> str:
+        return f"{license_plate.strip().upper()}:{renavam.strip()}:{consultation}"
+
+    def get(
+        self, license_plate: str, renavam: str, consultation: str
+    ) -> Optional[Dict]:
+        value = self._get(self.make_key(license_plate, renavam, consultation))
+        with self._counters_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(
+        self, license_plate: str, renavam: str, consultation: str, response: Dict
+    ) -> None:
+        ttl = self.ttls.get(consultation)
+        if response is None or not ttl:
+            return
+        self._set(self.make_key(license_plate, renavam, consultation), response, ttl)
+
+    def is_not_found(self, license_plate: str, renavam: str) -> bool:
+        """
+        Se o veículo foi dado como não encontrado há menos de
+        `ttls[NOT_FOUND]` segundos. Não conta nos hits e misses.
+        """
+        return self._get(self.make_key(license_plate, renavam, NOT_FOUND)) is not None
+
+    def set_not_found(self, license_plate: str, renavam: str) -> None:
+        self.set(license_plate, renavam, NOT_FOUND, {})
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[Dict]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _set(self, key: str, value: Dict, ttl: float) -> None:
+        raise NotImplementedError()
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    Cache local do processo, com TTL e limite de entradas (LRU).
+    """
+
+    def __init__(
+        self, maxsize: int = 10_000, ttls: Optional[Dict[str, float]] = None
+    ) -> None:
+        super().__init__(ttls)
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Tuple[float, Dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Dict, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class DjangoResponseCache(ResponseCache):
+    """
+    Cache sobre um backend do Django (locmem, arquivo, ...), que pode ser
+    compartilhado entre workers. O limite de entradas é o `MAX_ENTRIES` do
+    backend configurado em `CACHES`.
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        key_prefix: str = "debts:SP",
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        super().__init__(ttls)
+        self.alias = alias
+        self.key_prefix = key_prefix
+
+    @property
+    def backend(self) -> Any:
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def _get(self, key: str) -> Optional[Dict]:
+        return self.backend.get(f"{self.key_prefix}:{key}")
+
+    def _set(self, key: str, value: Dict, ttl: float) -> None:
+        self.backend.set(f"{self.key_prefix}:{key}", value, timeout=ttl)
@@ -0,0 +1,59 @@
+from typing import Dict, List, Optional
+
+
+class DetranSPException(Exception):
+    """
+    Erro na consulta ao webservice do Detran-SP.
+    """
+
+
+class DetranSPUnavailableException(DetranSPException):
+    """
+    Falha transitória (timeout, conexão, HTTP 5xx/429): pode ser repetida.
+    """
+
+
+class VehicleNotFoundException(DetranSPException):
+    """
+    Placa e RENAVAM sem veículo correspondente no Detran-SP.
+    """
+
+    def __init__(self, message: str = "veículo não encontrado") -> None:
+        super().__init__(message)
+
+
+class CircuitOpenException(DetranSPException):
+    def __init__(self, consultation: str) -> None:
+        self.consultation = consultation
+        super().__init__(f"{consultation} indisponível no momento")
+
+    def __reduce__(self):
+        return type(self), (self.consultation,)
+
+
+class OverloadedException(DetranSPException):
+    def __init__(self, consultation: str) -> None:
+        self.consultation = consultation
+        super().__init__(f"{consultation}: limite de consultas simultâneas atingido")
+
+    def __reduce__(self):
+        return type(self), (self.consultation,)
+
+
+class IncompleteSearchException(DetranSPException):
+    """
+    Busca completa em que alguma consulta não respondeu (ex.: timeout): os
+    débitos encontrados ficam em `debts_list`, mas não são todos os débitos
+    do veículo. `failures` traz o erro de cada consulta.
+    """
+
+    def __init__(
+        self, failures: Dict[str, str], debts_list: Optional[List] = None
+    ) -> None:
+        self.failures = failures
+        self.debts_list = debts_list or []
+        super().__init__("consultas sem resposta: " + ", ".join(sorted(failures)))
+
+    def __reduce__(self):
+        # volta inteira de um processo filho (search_debts --executor=process)
+        return type(self), (self.failures, self.debts_list)
@@ -0,0 +1,305 @@
+import asyncio
+import http.client
+import json
+import queue
+import threading
+from concurrent.futures import Executor
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from core.debts.application.SP.services.exceptions import (
+    DetranSPException,
+    DetranSPUnavailableException,
+    VehicleNotFoundException,
+)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões HTTP keep-alive para um único host.
+
+    No máximo `maxsize` requisições usam o pool ao mesmo tempo; as demais
+    aguardam uma conexão livre por até `timeout` segundos.
+    """
+
+    def __init__(self, base_url: str, maxsize: int = 10, timeout: float = 10.0):
+        url = urlsplit(base_url)
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.base_path = url.path.rstrip("/")
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.connections_created = 0
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(maxsize)
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes]:
+        timeout = self.timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("nenhuma conexão livre no pool")
+
+        try:
+            connection, reused = self._get()
+            try:
+                return self._send(connection, method, path, headers, timeout)
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                if not reused:
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+
+            # conexão keep-alive fechada pelo servidor: tenta com uma nova
+            connection = self._new()
+            try:
+                return self._send(connection, method, path, headers, timeout)
+            except BaseException:
+                connection.close()
+                raise
+        finally:
+            self._slots.release()
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> "ResponseStream":
+        """
+        Como `request`, mas devolve a resposta assim que os cabeçalhos chegam,
+        para o corpo ser lido em pedaços. A conexão (e a vaga no pool) só é
+        liberada quando a resposta termina de ser lida ou é fechada.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("nenhuma conexão livre no pool")
+
+        try:
+            connection, reused = self._get()
+            try:
+                response = self._start(connection, method, path, headers, timeout)
+                return ResponseStream(self, connection, response)
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                if not reused:
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+
+            connection = self._new()
+            try:
+                response = self._start(connection, method, path, headers, timeout)
+                return ResponseStream(self, connection, response)
+            except BaseException:
+                connection.close()
+                raise
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _send(self, connection, method, path, headers, timeout) -> Tuple[int, bytes]:
+        response = self._start(connection, method, path, headers, timeout)
+        body = response.read()
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        return response.status, body
+
+    def _start(
+        self, connection, method, path, headers, timeout
+    ) -> http.client.HTTPResponse:
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+
+        connection.request(method, f"{self.base_path}{path}", headers=headers or {})
+        return connection.getresponse()
+
+    def _get(self) -> Tuple[http.client.HTTPConnection, bool]:
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._new(), False
+
+    def _new(self) -> http.client.HTTPConnection:
+        connection_class = (
+            http.client.HTTPSConnection
+            if self.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        with self._lock:
+            self.connections_created += 1
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+
+class ResponseStream:
+    """
+    Corpo de uma resposta do `ConnectionPool.stream`, lido em pedaços de até
+    `chunk_size` bytes conforme chegam.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        self.status = response.status
+        self._pool = pool
+        self._connection = connection
+        self._response = response
+        self._exhausted = False
+        self._closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        if self._closed:
+            raise StopIteration
+        try:
+            chunk = self._response.read1(self.chunk_size)
+        except BaseException:
+            self.close()
+            raise
+        if not chunk:
+            if self._response.length:
+                # o read1 não acusa a conexão que cai antes do Content-Length
+                self.close()
+                raise http.client.IncompleteRead(b"", self._response.length)
+            self._exhausted = True
+            self.close()
+            raise StopIteration
+        return chunk
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        # só volta para o pool a conexão cuja resposta foi lida até o fim
+        if self._exhausted and not self._response.will_close:
+            self._response.close()
+            self._pool._idle.put(self._connection)
+        else:
+            self._connection.close()
+        self._pool._slots.release()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class HTTPAPI:
+    """
+    Cliente do webservice do Detran-SP com a mesma interface do `API`
+    (`HTTPAPI(license_plate, renavam, debt_option, pool=...).fetch()`),
+    reaproveitando as conexões do `pool`.
+
+    `afetch` roda o `fetch` bloqueante no `executor`: no máximo
+    `max_workers` consultas assíncronas ocupam threads ao mesmo tempo, sem
+    disputar o executor padrão do event loop (cpu + 4 threads). Sem
+    `executor`, usa o padrão.
+    """
+
+    headers = {"Accept": "application/json"}
+
+    def __init__(
+        self,
+        license_plate,
+        renavam,
+        debt_option,
+        pool: ConnectionPool,
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.license_plate = license_plate
+        self.renavam = renavam
+        self.debt_option = debt_option
+        self.pool = pool
+        self.timeout = timeout
+        self.executor = executor
+
+    def fetch(self):
+        try:
+            status, body = self.pool.request(
+                "GET", self._path(), headers=self.headers, timeout=self.timeout
+            )
+        except (http.client.HTTPException, OSError) as exc:
+            raise DetranSPUnavailableException(
+                f"erro de conexão com o webservice do Detran-SP: {exc!r}"
+            ) from exc
+
+        self._check_status(status)
+        return json.loads(body)
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Corpo da resposta em pedaços de bytes, para o `iter_json_records`.
+        Erros de conexão durante a leitura do corpo também levantam
+        `DetranSPUnavailableException`.
+        """
+        try:
+            response = self.pool.stream(
+                "GET", self._path(), headers=self.headers, timeout=self.timeout
+            )
+        except (http.client.HTTPException, OSError) as exc:
+            raise DetranSPUnavailableException(
+                f"erro de conexão com o webservice do Detran-SP: {exc!r}"
+            ) from exc
+
+        if response.status >= 400:
+            response.close()
+            self._check_status(response.status)
+        return self._read(response)
+
+    @staticmethod
+    def _read(response: ResponseStream) -> Iterator[bytes]:
+        try:
+            yield from response
+        except (http.client.HTTPException, OSError) as exc:
+            raise DetranSPUnavailableException(
+                f"erro de conexão com o webservice do Detran-SP: {exc!r}"
+            ) from exc
+        finally:
+            response.close()
+
+    async def afetch(self):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.fetch)
+
+    def _path(self) -> str:
+        query = urlencode({"placa": self.license_plate, "renavam": self.renavam})
+        return f"/{self.debt_option}?{query}"
+
+    @staticmethod
+    def _check_status(status: int) -> None:
+        if status == 404:
+            raise VehicleNotFoundException()
+        if status == 429 or status >= 500:
+            raise DetranSPUnavailableException(
+                f"erro no webservice do Detran-SP: HTTP {status}"
+            )
+        if status >= 400:
+            raise DetranSPException(f"erro no webservice do Detran-SP: HTTP {status}")
@@ -0,0 +1,158 @@
+import codecs
+import json
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# caminho dos registros de débito dentro da resposta de cada consulta
+RECORD_PATHS = {
+    ("Multas", "Multa"): "Multas",
+    ("IPVAs", "IPVA"): "IPVAs",
+    ("DPVATs", "DPVAT"): "DPVATs",
+}
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONStreamError(ValueError):
+    pass
+
+
+class JSONRecordStream:
+    """
+    Lê um JSON em pedaços de bytes e gera os registros (itens de arrays) que
+    estão nos caminhos de `paths`, um a um, assim que chegam.
+
+    Só o registro atual e o pedaço em leitura ficam em memória: o restante
+    da resposta é percorrido sem ser montado.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        paths: Dict[Tuple[str, ...], str] = RECORD_PATHS,
+    ) -> None:
+        self.paths = paths
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict]]:
+        yield from self._value(())
+        if self._peek(required=False):
+            raise JSONStreamError("conteúdo após o fim do JSON")
+
+    def _value(self, path: Tuple[str, ...]) -> Iterator[Tuple[str, Dict]]:
+        char = self._peek()
+        if char == "{":
+            yield from self._object(path)
+        elif char == "[":
+            yield from self._array(path)
+        else:
+            self._decode()
+
+    def _object(self, path: Tuple[str, ...]) -> Iterator[Tuple[str, Dict]]:
+        self._pos += 1
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise JSONStreamError("chave inválida no JSON")
+            self._expect(":")
+            yield from self._value(path + (key,))
+            if self._next_separator("}"):
+                return
+
+    def _array(self, path: Tuple[str, ...]) -> Iterator[Tuple[str, Dict]]:
+        self._pos += 1
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        category = self.paths.get(path)
+        while True:
+            if category is None:
+                yield from self._value(path)
+            else:
+                yield category, self._decode()
+            if self._next_separator("]"):
+                return
+
+    def _decode(self):
+        """
+        Decodifica o próximo valor inteiro com o `json` da stdlib, lendo mais
+        pedaços enquanto ele estiver incompleto.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            # um número no fim do buffer pode continuar no próximo pedaço
+            if end == len(self._buffer) and self._read():
+                continue
+            self._pos = end
+            return value
+
+    def _next_separator(self, closing: str) -> bool:
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            raise JSONStreamError(f"esperado ',' ou '{closing}', encontrado {char!r}")
+        return False
+
+    def _expect(self, expected: str) -> None:
+        char = self._peek()
+        if char != expected:
+            raise JSONStreamError(f"esperado {expected!r}, encontrado {char!r}")
+        self._pos += 1
+
+    def _peek(self, required: bool = True) -> str:
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in _WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._read():
+                if required:
+                    raise JSONStreamError("JSON incompleto")
+                return ""
+
+    def _read(self) -> bool:
+        if self._eof:
+            return False
+
+        # descarta o que já foi lido antes de crescer o buffer
+        consumed, self._pos = self._pos, 0
+        self._buffer = self._buffer[consumed:]
+
+        text: List[str] = []
+        while not text or not text[-1]:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                text.append(self._decoder.decode(b"", final=True))
+                break
+            text.append(self._decoder.decode(chunk))
+
+        self._buffer += "".join(text)
+        return True
+
+
+def iter_json_records(
+    chunks: Iterable[bytes], paths: Dict[Tuple[str, ...], str] = RECORD_PATHS
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Gera `(categoria, registro)` para cada débito da resposta em `chunks`.
+    """
+    return iter(JSONRecordStream(chunks, paths))
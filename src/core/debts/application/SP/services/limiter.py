@@ -0,0 +1,268 @@
+import asyncio
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from core.debts.application.SP.services.exceptions import OverloadedException
+from core.debts.application.SP.services.resilience import TRANSIENT_EXCEPTIONS
+
+
+class AdaptiveLimit:
+    """
+    Limite de concorrência AIMD: cresce 1 a cada `limit` respostas dentro de
+    `target_latency` e é multiplicado por `backoff` quando uma resposta
+    demora mais que isso ou falha de forma transitória.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        target_latency: float = 1.0,
+        backoff: float = 0.9,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+
+    def on_sample(self, latency: float, failed: bool = False) -> None:
+        if failed or latency > self.target_latency:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def __int__(self) -> int:
+        return int(self.limit)
+
+
+class ConcurrencyLimiter:
+    """
+    Bulkhead na frente do webservice: limita as consultas simultâneas no
+    total (limite adaptativo, ver `AdaptiveLimit`) e por consulta
+    (`per_consultation`, fixo).
+
+    Quem passa do limite aguarda até `queue_timeout` segundos por uma vaga
+    e então recebe `OverloadedException`; com `queue_timeout=0` o excesso é
+    rejeitado na hora. No `acall` a espera é um future do event loop,
+    acordado a cada vaga liberada: a vaga só é ocupada no próprio loop, então
+    um waiter cancelado não deixa vaga presa.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[AdaptiveLimit] = None,
+        per_consultation: Optional[Dict[str, int]] = None,
+        queue_timeout: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limit = limit or AdaptiveLimit()
+        self.per_consultation = per_consultation or {}
+        self.queue_timeout = queue_timeout
+        self.clock = clock
+        self.in_flight = 0
+        self.rejected = 0
+        self._in_flight: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def acquire(self, consultation: str) -> None:
+        if not self._acquire(consultation, self.queue_timeout):
+            self._reject(consultation)
+
+    def release(
+        self, consultation: str, latency: Optional[float] = None, failed: bool = False
+    ) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._in_flight[consultation] -= 1
+            if latency is not None:
+                self.limit.on_sample(latency, failed)
+            self._condition.notify_all()
+            waiters, self._waiters = self._waiters, []
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(self._wake, waiter)
+            except RuntimeError:
+                # event loop já encerrado
+                pass
+
+    def call(self, consultation: str, fn: Callable[[], Any]) -> Any:
+        self.acquire(consultation)
+        started_at = self.clock()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._release(consultation, started_at, exc)
+            raise
+        self._release(consultation, started_at)
+        return result
+
+    def stream(
+        self, consultation: str, fn: Callable[[], Iterable[bytes]]
+    ) -> "LimitedStream":
+        """
+        Como `call`, para respostas lidas em pedaços (ex.: `HTTPAPI.stream`):
+        a vaga só é liberada quando o corpo termina de ser lido, falha ou é
+        fechado, e a latência registrada inclui a leitura do corpo.
+        """
+        self.acquire(consultation)
+        started_at = self.clock()
+        try:
+            chunks = fn()
+        except BaseException as exc:
+            self._release(consultation, started_at, exc)
+            raise
+        return LimitedStream(self, consultation, started_at, chunks)
+
+    async def acall(self, consultation: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not await self._aacquire(consultation):
+            self._reject(consultation)
+
+        started_at = self.clock()
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._release(consultation, started_at, exc)
+            raise
+        self._release(consultation, started_at)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "per_consultation": dict(self._in_flight),
+        }
+
+    def _has_room(self, consultation: str) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        cap = self.per_consultation.get(consultation)
+        return cap is None or self._in_flight.get(consultation, 0) < cap
+
+    def _acquire(self, consultation: str, timeout: float) -> bool:
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._has_room(consultation), timeout=timeout
+            ):
+                return False
+            self._take(consultation)
+            return True
+
+    async def _aacquire(self, consultation: str) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout
+        while True:
+            with self._condition:
+                if self._has_room(consultation):
+                    self._take(consultation)
+                    return True
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._condition:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def _take(self, consultation: str) -> None:
+        self.in_flight += 1
+        self._in_flight[consultation] = self._in_flight.get(consultation, 0) + 1
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _reject(self, consultation: str) -> None:
+        with self._condition:
+            self.rejected += 1
+        raise OverloadedException(consultation)
+
+    def _release(
+        self,
+        consultation: str,
+        started_at: float,
+        exc: Optional[BaseException] = None,
+    ) -> None:
+        # erros que não são de sobrecarga (ex.: veículo não encontrado) não
+        # dizem nada sobre a latência do webservice
+        if exc is None or isinstance(exc, TRANSIENT_EXCEPTIONS):
+            self.release(consultation, self.clock() - started_at, exc is not None)
+        else:
+            self.release(consultation)
+
+
+class LimitedStream:
+    """
+    Pedaços de uma resposta que ocupa uma vaga do `ConcurrencyLimiter` até
+    terminar de ser lida, falhar ou ser fechada.
+    """
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        consultation: str,
+        started_at: float,
+        chunks: Iterable[bytes],
+    ) -> None:
+        self._limiter = limiter
+        self._consultation = consultation
+        self._started_at = started_at
+        self._chunks = chunks
+        self._iterator = iter(chunks)
+        self._released = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        if self._released:
+            raise StopIteration
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self._release()
+            raise
+        except BaseException as exc:
+            self._release(exc)
+            raise
+
+    def close(self) -> None:
+        close = getattr(self._chunks, "close", None)
+        try:
+            if close is not None:
+                close()
+        finally:
+            self._release()
+
+    def _release(self, exc: Optional[BaseException] = None) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._limiter._release(self._consultation, self._started_at, exc)
+
+    def __del__(self) -> None:
+        self.close()
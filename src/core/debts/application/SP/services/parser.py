@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import Generator, List
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
 
+from core.debts import metrics
 from core.debts.application.dto import (
+    BatchDebtsOutput,
+    BatchDebtsOutputMapper,
+    DebtRecordError,
     DPVATInput,
     DPVATOutput,
     IPVAInput,
@@ -18,6 +22,7 @@ from core.debts.application.use_cases import (
     CreateLicenciamentoUseCase,
     CreateMultaUseCase,
 )
+from core.debts.domain.exceptions import EntityValidationException
 
 
 @dataclass(kw_only=True, slots=True, frozen=True)
@@ -27,6 +32,7 @@ class SPParser:
     use_case_create_DPVAT: CreateDPVATUseCase
     use_case_create_licenciamento: CreateLicenciamentoUseCase
 
+    @metrics.timed("debts_parser_seconds", category="IPVAs")
     def collect_ipva_debts(
         self, input_param: SPParserInput
     ) -> Generator[IPVAOutput, None, None]:
@@ -34,21 +40,10 @@ class SPParser:
         Formatar os dados de IPVA.
         """
 
-        debts = self._get_debts_from_json(input_param.data, "IPVAs")
-
-        if debts is None:
-            return []
-        else:
-            debts = debts["IPVA"]
-
-        for debt in debts:
-            ipva_input_param = IPVAInput(
-                amount=debt.get("Valor"),
-                installment=debt.get("Cota", None),
-                year=debt.get("Exercicio"),
-            )
-            yield self.use_case_create_IPVA.execute(ipva_input_param)
+        for _, ipva_input_param in self._ipva_inputs(input_param.data):
+            yield self.use_case_create_IPVA.execute_direct(ipva_input_param)
 
+    @metrics.timed("debts_parser_seconds", category="Multas")
     def collect_ticket_debts(
         self, input_param: SPParserInput
     ) -> Generator[MultaOutput, None, None]:
@@ -56,21 +51,10 @@ class SPParser:
         Formatar os dados de Multas.
         """
 
-        debts = self._get_debts_from_json(input_param.data, "Multas")
-
-        if debts is None:
-            return []
-        else:
-            debts = debts["Multa"]
-
-        for debt in debts:
-            multa_input_param = MultaInput(
-                amount=debt.get("Valor"),
-                auto_infraction=debt.get("AIIP"),
-                description=debt.get("DescricaoEnquadramento"),
-            )
-            yield self.use_case_create_multa.execute(multa_input_param)
+        for _, multa_input_param in self._ticket_inputs(input_param.data):
+            yield self.use_case_create_multa.execute_direct(multa_input_param)
 
+    @metrics.timed("debts_parser_seconds", category="DPVATs")
     def collect_insurance_debts(
         self, input_param: SPParserInput
     ) -> Generator[DPVATOutput, None, None]:
@@ -78,21 +62,10 @@ class SPParser:
         Formatar os dados de DPVAT.
         """
 
-        debts = self._get_debts_from_json(input_param.data, "DPVATs")
-
-        if debts is None:
-            return []
-        else:
-            debts = debts["DPVAT"]
-
-        for debt in debts:
-            dpvat_input_param = DPVATInput(
-                amount=debt.get("Valor"),
-                description=debt.get("DescricaoServico", None),
-                year=debt.get("Exercicio"),
-            )
-            yield self.use_case_create_DPVAT.execute(dpvat_input_param)
+        for _, dpvat_input_param in self._insurance_inputs(input_param.data):
+            yield self.use_case_create_DPVAT.execute_direct(dpvat_input_param)
 
+    @metrics.timed("debts_parser_seconds", category="Licenciamento")
     def collect_licensing_debts(
         self, input_param: SPParserInput
     ) -> Generator[LicenciamentoOutput, None, None]:
@@ -100,28 +73,213 @@ class SPParser:
         Formatar os dados de Licenciamento.
         """
 
-        debt = self._get_debts_from_json(input_param.data, "Licenciamento")
+        for _, licenciamento_input_param in self._licensing_inputs(input_param.data):
+            yield self.use_case_create_licenciamento.execute_direct(
+                licenciamento_input_param
+            )
 
-        if not debt:
-            return []
+    def collect_all_debts(self, input_param: SPParserInput) -> List[object]:
+        """
+        Formatar os dados de todos as categorias de debitos.
+        """
+        return list(self.iter_all_debts(input_param))
 
-        licancimento_input_param = LicenciamentoInput(
-            amount=debt.get("TaxaLicenciamento"),
-            description=debt.get("DescricaoLicenciamento", None),
-            year=debt.get("Exercicio"),
+    @metrics.timed("debts_parser_seconds", category="all")
+    def iter_all_debts(self, input_param: SPParserInput) -> Iterable[object]:
+        """
+        Mesmos débitos de `collect_all_debts`, gerados sob demanda numa única
+        passada pela resposta: multas, IPVAs, DPVATs e licenciamento, nessa
+        ordem.
+        """
+        data = input_param.data
+        for category, key, to_input, create in self._record_types():
+            debts = data.get(category)
+            execute = create.execute_direct
+            if key is None:
+                # licenciamento vem como um único registro
+                if debts:
+                    yield execute(to_input(debts))
+            elif debts is not None:
+                for debt in debts[key]:
+                    yield execute(to_input(debt))
+
+    @metrics.timed("debts_parser_seconds", category="records")
+    def iter_records_debts(
+        self, records: Iterable[Tuple[str, Dict]]
+    ) -> Iterable[object]:
+        """
+        Formata registros `(categoria, registro)` um a um, na ordem em que
+        chegam (ex.: os gerados pelo `iter_json_records`).
+        """
+        dispatch = {
+            category: (to_input, create.execute_direct)
+            for category, _, to_input, create in self._record_types()
+        }
+        for category, record in records:
+            to_input, execute = dispatch[category]
+            yield execute(to_input(record))
+
+    def collect_debts_batch(
+        self, input_param: SPParserInput, category: str
+    ) -> BatchDebtsOutput:
+        """
+        Formatar os dados de uma categoria validando cada registro sem
+        interromper os demais. Registros inválidos entram no relatório de
+        erros e não impedem o retorno dos válidos.
+        """
+        return BatchDebtsOutputMapper.to_output(
+            self.iter_debts_batch(input_param, (category,))
         )
-        yield self.use_case_create_licenciamento.execute(licancimento_input_param)
 
-    def collect_all_debts(self, input_param: SPParserInput) -> List[object]:
+    def collect_all_debts_batch(self, input_param: SPParserInput) -> BatchDebtsOutput:
         """
-        Formatar os dados de todos as categorias de debitos.
+        Formatar os dados de todas as categorias em modo lote.
         """
-        multas = list(self.collect_ticket_debts(input_param))
-        ipvas = list(self.collect_ipva_debts(input_param))
-        dpvats = list(self.collect_insurance_debts(input_param))
-        licenciamento = list(self.collect_licensing_debts(input_param))
+        return BatchDebtsOutputMapper.to_output(self.iter_debts_batch(input_param))
 
-        return multas + ipvas + dpvats + licenciamento
+    @metrics.timed("debts_parser_seconds", category="batch")
+    def iter_debts_batch(
+        self, input_param: SPParserInput, categories: Optional[Iterable[str]] = None
+    ) -> Iterable[object]:
+        """
+        Gera os débitos das `categories` (todas por padrão) na ordem de
+        `iter_all_debts`, com um `DebtRecordError` no lugar de cada registro
+        inválido.
+        """
+        data = input_param.data
+        for category, key, _, _ in self._record_types():
+            if categories is not None and category not in categories:
+                continue
+            debts = data.get(category)
+            if key is None:
+                # licenciamento vem como um único registro
+                records = [debts] if debts else []
+            else:
+                records = debts[key] if debts is not None else []
+            for index, record in enumerate(records):
+                yield self.parse_record(category, index, record)
+
+    @metrics.timed("debts_parser_seconds", category="records_batch")
+    def iter_records_batch(
+        self, records: Iterable[Tuple[str, Dict]]
+    ) -> Iterable[object]:
+        """
+        Como `iter_records_debts`, com um `DebtRecordError` no lugar de cada
+        registro inválido. O `index` conta os registros de cada categoria.
+        """
+        indexes: Dict[str, int] = {}
+        for category, record in records:
+            index = indexes[category] = indexes.get(category, -1) + 1
+            yield self.parse_record(category, index, record)
+
+    def parse_record(self, category: str, index: int, record: Dict) -> object:
+        """
+        Valida e formata um registro da `category`. Um registro inválido
+        volta como `DebtRecordError`, com os erros de cada campo.
+        """
+        _, to_input, use_case = self._record_type(category)
+        if not isinstance(record, dict):
+            errors = {
+                "non_field_errors": [
+                    "Invalid data. Expected a dictionary, but got "
+                    f"{type(record).__name__}."
+                ]
+            }
+        else:
+            try:
+                return use_case.execute_direct(to_input(record))
+            except EntityValidationException as exc:
+                errors = exc.error
+
+        return DebtRecordError(
+            category=category, index=index, record=record, errors=errors
+        )
+
+    def _record_type(self, category: str) -> Tuple:
+        for record_type in self._record_types():
+            if record_type[0] == category:
+                return record_type[1:]
+        raise KeyError(category)
+
+    def _record_types(self) -> Tuple:
+        return (
+            ("Multas", "Multa", self._ticket_input, self.use_case_create_multa),
+            ("IPVAs", "IPVA", self._ipva_input, self.use_case_create_IPVA),
+            ("DPVATs", "DPVAT", self._insurance_input, self.use_case_create_DPVAT),
+            (
+                "Licenciamento",
+                None,
+                self._licensing_input,
+                self.use_case_create_licenciamento,
+            ),
+        )
+
+    def _ipva_inputs(self, data) -> Iterable[Tuple[Dict, IPVAInput]]:
+        debts = self._get_debts_from_json(data, "IPVAs")
+
+        if debts is None:
+            return
+
+        for debt in debts["IPVA"]:
+            yield debt, self._ipva_input(debt)
+
+    def _ticket_inputs(self, data) -> Iterable[Tuple[Dict, MultaInput]]:
+        debts = self._get_debts_from_json(data, "Multas")
+
+        if debts is None:
+            return
+
+        for debt in debts["Multa"]:
+            yield debt, self._ticket_input(debt)
+
+    def _insurance_inputs(self, data) -> Iterable[Tuple[Dict, DPVATInput]]:
+        debts = self._get_debts_from_json(data, "DPVATs")
+
+        if debts is None:
+            return
+
+        for debt in debts["DPVAT"]:
+            yield debt, self._insurance_input(debt)
+
+    def _licensing_inputs(self, data) -> Iterable[Tuple[Dict, LicenciamentoInput]]:
+        debt = self._get_debts_from_json(data, "Licenciamento")
+
+        if not debt:
+            return
+
+        yield debt, self._licensing_input(debt)
+
+    @staticmethod
+    def _ipva_input(debt: Dict) -> IPVAInput:
+        return IPVAInput(
+            amount=debt.get("Valor"),
+            installment=debt.get("Cota", None),
+            year=debt.get("Exercicio"),
+        )
+
+    @staticmethod
+    def _ticket_input(debt: Dict) -> MultaInput:
+        return MultaInput(
+            amount=debt.get("Valor"),
+            auto_infraction=debt.get("AIIP"),
+            description=debt.get("DescricaoEnquadramento"),
+        )
+
+    @staticmethod
+    def _insurance_input(debt: Dict) -> DPVATInput:
+        return DPVATInput(
+            amount=debt.get("Valor"),
+            description=debt.get("DescricaoServico", None),
+            year=debt.get("Exercicio"),
+        )
+
+    @staticmethod
+    def _licensing_input(debt: Dict) -> LicenciamentoInput:
+        return LicenciamentoInput(
+            amount=debt.get("TaxaLicenciamento"),
+            description=debt.get("DescricaoLicenciamento", None),
+            year=debt.get("Exercicio"),
+        )
 
     def _get_debts_from_json(self, data, category):
         """
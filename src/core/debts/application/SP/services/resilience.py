@@ -0,0 +1,188 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+
+from core.debts.application.SP.services.exceptions import (
+    CircuitOpenException,
+    DetranSPUnavailableException,
+)
+
+TRANSIENT_EXCEPTIONS = (DetranSPUnavailableException, TimeoutError, ConnectionError)
+
+
+@dataclass(kw_only=True)
+class RetryPolicy:
+    """
+    Repetições com backoff exponencial e jitter completo: a espera antes da
+    tentativa `n` é um valor aleatório entre 0 e min(max_delay, base * 2^n).
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    retry_on: Tuple[Type[BaseException], ...] = TRANSIENT_EXCEPTIONS
+    random: Callable[[], float] = random.random
+
+    def delay(self, attempt: int) -> float:
+        return self.random() * min(self.max_delay, self.base_delay * 2**attempt)
+
+
+@dataclass(kw_only=True)
+class CircuitBreaker:
+    """
+    Abre após `failure_threshold` falhas transitórias seguidas e passa a
+    falhar rápido. Depois de `reset_timeout` segundos deixa passar uma única
+    chamada de teste (meio-aberto): sucesso fecha o circuito, falha reabre.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    name: str
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    state: str = CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    _probing: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenException(self.name)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def on_ignored(self) -> None:
+        """
+        Erro não transitório (ex.: veículo não encontrado): o webservice
+        respondeu, então não conta como falha.
+        """
+        with self._lock:
+            self._probing = False
+
+
+class Resilience:
+    """
+    Repetições e circuit breaker por consulta em volta das chamadas ao
+    webservice. `stats()` expõe o estado dos circuitos e as repetições.
+    """
+
+    def __init__(
+        self,
+        retry: RetryPolicy = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sleep = sleep
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, consultation: str) -> CircuitBreaker:
+        with self._lock:
+            if consultation not in self.breakers:
+                self.breakers[consultation] = CircuitBreaker(
+                    name=consultation,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout=self.reset_timeout,
+                )
+            return self.breakers[consultation]
+
+    def call(self, consultation: str, fn: Callable[[], Any]) -> Any:
+        breaker = self.breaker(consultation)
+        for attempt in range(self.retry.max_attempts):
+            breaker.before_call()
+            try:
+                result = fn()
+            except self.retry.retry_on:
+                breaker.on_failure()
+                if self._gives_up(breaker, attempt):
+                    raise
+            except BaseException:
+                breaker.on_ignored()
+                raise
+            else:
+                breaker.on_success()
+                return result
+
+            self._count_retry(consultation)
+            self.sleep(self.retry.delay(attempt))
+
+    async def acall(self, consultation: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        breaker = self.breaker(consultation)
+        for attempt in range(self.retry.max_attempts):
+            breaker.before_call()
+            try:
+                result = await fn()
+            except self.retry.retry_on:
+                breaker.on_failure()
+                if self._gives_up(breaker, attempt):
+                    raise
+            except BaseException:
+                breaker.on_ignored()
+                raise
+            else:
+                breaker.on_success()
+                return result
+
+            self._count_retry(consultation)
+            await asyncio.sleep(self.retry.delay(attempt))
+
+    def record_failure(self, consultation: str) -> None:
+        """
+        Falha transitória fora do `call` (ex.: a conexão caiu na leitura de
+        uma resposta em streaming): conta no circuit breaker, sem repetição.
+        """
+        self.breaker(consultation).on_failure()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            "retries": dict(self.retries),
+            "breakers": {
+                name: {"state": breaker.state, "failures": breaker.failures}
+                for name, breaker in self.breakers.items()
+            },
+        }
+
+    def _gives_up(self, breaker: CircuitBreaker, attempt: int) -> bool:
+        # com o circuito aberto a falha original é mais útil que o
+        # CircuitOpenException da próxima tentativa
+        return (
+            attempt + 1 >= self.retry.max_attempts
+            or breaker.state != CircuitBreaker.CLOSED
+        )
+
+    def _count_retry(self, consultation: str) -> None:
+        with self._lock:
+            self.retries[consultation] = self.retries.get(consultation, 0) + 1
@@ -1,59 +1,346 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 
+from core.debts import metrics
 from core.debts.application.SP.services.api import API
+from core.debts.application.SP.services.cache import ResponseCache
+from core.debts.application.SP.services.exceptions import (
+    DetranSPException,
+    DetranSPUnavailableException,
+    VehicleNotFoundException,
+)
+from core.debts.application.SP.services.json_stream import iter_json_records
+from core.debts.application.SP.services.limiter import ConcurrencyLimiter
+from core.debts.application.SP.services.resilience import (
+    TRANSIENT_EXCEPTIONS,
+    Resilience,
+)
+from core.debts.application.SP.services.singleflight import SingleFlight
+from core.debts.domain.license_plate import normalize_license_plate
+
+CONSULTATIONS = {
+    "Multas": "ConsultaMultas",
+    "IPVAs": "ConsultaIPVA",
+    "DPVATs": "ConsultaDPVAT",
+    "Licenciamento": "ConsultaLicenciamento",
+}
+
+# chave da busca com as consultas que não responderam: {consulta: erro}
+FAILURES = "Falhas"
+
+DEBT_OPTIONS = {
+    "ticket": "ConsultaMultas",
+    "ipva": "ConsultaIPVA",
+    "dpvat": "ConsultaDPVAT",
+    "licensing": "ConsultaLicenciamento",
+}
 
 
 @dataclass(kw_only=True)
 class SPService:
     """
     Conecta com o webservice do Detran-SP.
+
+    Guarda os parâmetros da busca em `params`, por isso cada busca deve usar
+    a sua própria instância (o container registra o serviço como Factory).
+    A placa é normalizada para o padrão cinza ao iniciar a busca (ver
+    `normalize_license_plate`).
+
+    Com `concurrent=True` a busca completa dispara as quatro consultas ao
+    mesmo tempo; cada consulta tem seu próprio timeout (`timeouts` por
+    consulta ou `timeout` como padrão). A que estourar o timeout ou falhar
+    de forma inesperada volta como `None` e entra em `FAILURES`, para a
+    busca não passar por completa; erros do webservice (`DetranSPException`:
+    sobrecarga, circuito aberto, indisponível, veículo não encontrado)
+    interrompem a busca.
+
+    `api_class` troca o cliente do webservice (padrão: `API`), por exemplo
+    pelo `HTTPAPI` com pool de conexões.
+
+    Com `single_flight`, buscas idênticas em andamento compartilham a mesma
+    ida ao webservice.
+
+    Com `resilience`, falhas transitórias de cada consulta são repetidas
+    com backoff e um circuit breaker por consulta evita insistir num
+    webservice fora do ar.
+
+    `stream_records` lê as respostas em pedaços e gera os débitos conforme
+    chegam; `stream_responses` indica que a busca em streaming deve usá-lo.
+
+    Com `limiter`, cada ida ao webservice (inclusive as repetições) ocupa
+    uma vaga do bulkhead de consultas simultâneas; no `stream_records`, a
+    vaga só é liberada quando o corpo da resposta termina de ser lido ou a
+    busca é fechada.
+
+    Com `cache`, um veículo não encontrado também fica no cache (cache
+    negativo, ver `ResponseCache.is_not_found`) e as buscas seguintes
+    levantam `VehicleNotFoundException` sem consultar o webservice.
     """
 
-    params: Dict = field(default_factory=lambda: dict)
-    tickets: Dict = field(default_factory=lambda: dict)
-    ipvas: Dict = field(default_factory=lambda: dict)
-    dpvats: Dict = field(default_factory=lambda: dict)
-    licensing: Dict = field(default_factory=lambda: dict)
+    params: Dict = field(default_factory=dict)
+    concurrent: bool = False
+    timeout: Optional[float] = None
+    timeouts: Dict[str, float] = field(default_factory=dict)
+    executor: Optional[ThreadPoolExecutor] = None
+    cache: Optional[ResponseCache] = None
+    single_flight: Optional[SingleFlight] = None
+    api_class: Optional[Callable[..., API]] = None
+    resilience: Optional[Resilience] = None
+    limiter: Optional[ConcurrencyLimiter] = None
+    stream_responses: bool = False
 
-    def execute(self, **kwargs) -> Dict:
-        self.params = kwargs
-        return self.debt_search()
-
-    def _convert_to_gray_plate(self, license_plate):
-        mercosul_map_converter = {
-            "A": "0",
-            "B": "1",
-            "C": "2",
-            "D": "3",
-            "E": "4",
-            "F": "5",
-            "G": "6",
-            "H": "7",
-            "I": "8",
-            "J": "9",
+    def __post_init__(self) -> None:
+        if "license_plate" in self.params:
+            self._set_params(self.params)
+
+    def _set_params(self, params: Dict) -> None:
+        """
+        Guarda os parâmetros da busca com a placa já normalizada (padrão
+        cinza), uma vez por busca e não a cada consulta.
+        """
+        self.params = {
+            **params,
+            "license_plate": normalize_license_plate(params["license_plate"]),
         }
 
-        license_plate_split = list(license_plate)
-        license_plate_split[4] = mercosul_map_converter[license_plate_split[4].upper()]
-        license_plate = "".join(license_plate_split)
+    def _check_not_found(self) -> None:
+        if self.cache is not None and self.cache.is_not_found(
+            self._license_plate(), self.params["renavam"]
+        ):
+            raise VehicleNotFoundException()
 
-        return license_plate
+    def execute(self, **kwargs) -> Dict:
+        self._set_params(kwargs)
+        self._check_not_found()
+        if self.single_flight is None:
+            return self.debt_search()
+        return self.single_flight.do(self._search_key(), self.debt_search)
 
-    def get_json_response(self, method):
+    async def aexecute(self, **kwargs) -> Dict:
+        self._set_params(kwargs)
+        self._check_not_found()
+        if self.single_flight is None:
+            return await self.adebt_search()
+        return await self.single_flight.ado(self._search_key(), self.adebt_search)
+
+    def stream_records(self, **kwargs) -> Iterator[Tuple[str, Dict]]:
         """
-        Pega a resposta da requisição em json.
+        Gera `(categoria, registro)` de cada débito sem montar as respostas
+        inteiras em memória (ver `iter_json_records`). Não passa pelo cache
+        nem pelo single_flight.
+
+        A primeira consulta é aberta antes de retornar, para que erros como
+        veículo não encontrado apareçam já na chamada.
         """
-        license_plate = self.params["license_plate"]
+        self._set_params(kwargs)
+        self._check_not_found()
+        debt_option = self.params.get("debt_option", "")
+
+        match debt_option:
+            case "":
+                methods = list(CONSULTATIONS.values())
+            case option if option in DEBT_OPTIONS:
+                methods = [DEBT_OPTIONS[option]]
+            case _:
+                raise Exception("opção inválida")
 
-        if license_plate[4].isalpha():
-            license_plate = self._convert_to_gray_plate(license_plate)
+        first = self._stream_consultation(methods[0])
+        return self._chain_consultations(first, methods[1:])
 
-        return API(
-            license_plate=license_plate,
+    def _chain_consultations(
+        self, first: Iterator[Tuple[str, Dict]], methods
+    ) -> Iterator[Tuple[str, Dict]]:
+        try:
+            yield from first
+            for method in methods:
+                yield from self._stream_consultation(method)
+        finally:
+            # a primeira consulta já foi aberta: fecha mesmo sem ter sido lida
+            close = getattr(first, "close", None)
+            if close is not None:
+                close()
+
+    def _stream_consultation(self, method) -> Iterator[Tuple[str, Dict]]:
+        if method == CONSULTATIONS["Licenciamento"]:
+            # resposta plana e pequena: o próprio corpo é o registro
+            response = self.get_json_response(method)
+            return iter([("Licenciamento", response)] if response else [])
+        return self._iter_records(method, self._fetch(method, stream=True))
+
+    def _iter_records(
+        self, method, chunks: Iterable[bytes]
+    ) -> Iterator[Tuple[str, Dict]]:
+        # fecha a resposta (e libera a vaga no bulkhead) mesmo se a leitura
+        # for interrompida antes do fim
+        try:
+            yield from iter_json_records(chunks)
+        except ValueError as exc:
+            # JSONStreamError, JSONDecodeError ou UnicodeDecodeError: corpo
+            # truncado ou corrompido no meio da leitura
+            self._record_failure(method)
+            raise DetranSPUnavailableException(
+                f"{method}: resposta incompleta do webservice do Detran-SP: {exc}"
+            ) from exc
+        except TRANSIENT_EXCEPTIONS:
+            self._record_failure(method)
+            raise
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def _record_failure(self, method) -> None:
+        if self.resilience is not None:
+            self.resilience.record_failure(method)
+
+    def _search_key(self):
+        return (
+            self._license_plate(),
+            self.params["renavam"],
+            self.params.get("debt_option", ""),
+        )
+
+    def _license_plate(self) -> str:
+        return self.params["license_plate"]
+
+    def _api(self, method) -> API:
+        return (self.api_class or API)(
+            license_plate=self._license_plate(),
             renavam=self.params["renavam"],
             debt_option=method,
-        ).fetch()
+        )
+
+    def _fetch(self, method, stream=False):
+        try:
+            api = self._api(method)
+            fetch = api.stream if stream else api.fetch
+            if self.limiter is not None:
+                limit = self.limiter.stream if stream else self.limiter.call
+                fetch = partial(limit, method, fetch)
+            if self.resilience is None:
+                return fetch()
+            return self.resilience.call(method, fetch)
+        except VehicleNotFoundException:
+            self._set_not_found()
+            raise
+
+    async def _afetch(self, method):
+        try:
+            afetch = self._api(method).afetch
+            if self.limiter is not None:
+                afetch = partial(self.limiter.acall, method, afetch)
+            if self.resilience is None:
+                return await afetch()
+            return await self.resilience.acall(method, afetch)
+        except VehicleNotFoundException:
+            self._set_not_found()
+            raise
+
+    def _set_not_found(self) -> None:
+        if self.cache is not None:
+            self.cache.set_not_found(self._license_plate(), self.params["renavam"])
+
+    def get_json_response(self, method):
+        """
+        Pega a resposta da requisição em json.
+        """
+        with metrics.timer("debts_upstream_seconds", consultation=method):
+            if self.cache is None:
+                return self._fetch(method)
+
+            cache_key = (self._license_plate(), self.params["renavam"], method)
+            response = self.cache.get(*cache_key)
+            if response is None:
+                response = self._fetch(method)
+                self.cache.set(*cache_key, response)
+            return response
+
+    async def aget_json_response(self, method):
+        """
+        Versão assíncrona de `get_json_response`.
+        """
+        with metrics.timer("debts_upstream_seconds", consultation=method):
+            if self.cache is None:
+                return await self._afetch(method)
+
+            cache_key = (self._license_plate(), self.params["renavam"], method)
+            response = self.cache.get(*cache_key)
+            if response is None:
+                response = await self._afetch(method)
+                self.cache.set(*cache_key, response)
+            return response
+
+    def get_json_responses(self) -> Dict[str, Optional[Dict]]:
+        """
+        Executa as quatro consultas em paralelo.
+
+        Retorna as respostas indexadas pelo nome da consulta; consultas que
+        estourarem o timeout ou falharem de forma inesperada retornam `None`
+        e o erro fica em `FAILURES`. Erros do webservice são propagados.
+        """
+        executor = self.executor or ThreadPoolExecutor(max_workers=len(CONSULTATIONS))
+        try:
+            started_at = time.monotonic()
+            futures = {
+                method: executor.submit(self.get_json_response, method)
+                for method in CONSULTATIONS.values()
+            }
+
+            responses, failures = {}, {}
+            for method, future in futures.items():
+                timeout = self.timeouts.get(method, self.timeout)
+                if timeout is not None:
+                    timeout = max(0, started_at + timeout - time.monotonic())
+                try:
+                    responses[method] = future.result(timeout=timeout)
+                except DetranSPException:
+                    # sobrecarga, circuito aberto ou veículo não encontrado:
+                    # a busca falhou, não veio vazia
+                    for pending in futures.values():
+                        pending.cancel()
+                    raise
+                except Exception as exc:
+                    future.cancel()
+                    responses[method] = None
+                    failures[method] = repr(exc)
+            if failures:
+                responses[FAILURES] = failures
+            return responses
+        finally:
+            if executor is not self.executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def aget_json_responses(self) -> Dict[str, Optional[Dict]]:
+        """
+        Versão assíncrona de `get_json_responses`.
+        """
+        methods = list(CONSULTATIONS.values())
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self.aget_json_response(method),
+                    timeout=self.timeouts.get(method, self.timeout),
+                )
+                for method in methods
+            ),
+            return_exceptions=True,
+        )
+
+        responses, failures = {}, {}
+        for method, result in zip(methods, results):
+            if isinstance(result, DetranSPException):
+                raise result
+            if isinstance(result, Exception):
+                failures[method] = repr(result)
+                result = None
+            responses[method] = result
+        if failures:
+            responses[FAILURES] = failures
+        return responses
 
     def debt_search(self):
         """
@@ -62,35 +349,47 @@ class SPService:
         debt_option = self.params.get("debt_option", "")
 
         match debt_option:
+            case "" if self.concurrent:
+                responses = self.get_json_responses()
             case "":
-                self.tickets = self.get_json_response("ConsultaMultas").get(
-                    "Multas", {}
-                )
-                self.ipvas = self.get_json_response("ConsultaIPVA").get("IPVAs", {})
-                self.dpvats = self.get_json_response("ConsultaDPVAT").get("DPVATs", {})
-                self.licensing = self.get_json_response("ConsultaLicenciamento")
-            case "ticket":
-                self.tickets = self.get_json_response("ConsultaMultas").get(
-                    "Multas", {}
-                )
-            case "ipva":
-                self.ipvas = self.get_json_response("ConsultaIPVA").get("IPVAs", {})
-            case "dpvat":
-                self.dpvats = self.get_json_response("ConsultaDPVAT").get("DPVATs", {})
-            case "licensing":
-                self.licensing = self.get_json_response("ConsultaLicenciamento")
+                responses = {
+                    method: self.get_json_response(method)
+                    for method in CONSULTATIONS.values()
+                }
+            case option if option in DEBT_OPTIONS:
+                method = DEBT_OPTIONS[option]
+                responses = {method: self.get_json_response(method)}
             case _:
                 raise Exception("opção inválida")
 
-        debts = {
-            "Multas": self.tickets,
-            "IPVAs": self.ipvas,
-            "DPVATs": self.dpvats,
-            "Licenciamento": self.licensing,
-        }
+        return self._build_debts(responses)
+
+    async def adebt_search(self):
+        """
+        Versão assíncrona de `debt_search`; a busca completa é sempre
+        concorrente.
+        """
+        debt_option = self.params.get("debt_option", "")
+
+        match debt_option:
+            case "":
+                responses = await self.aget_json_responses()
+            case option if option in DEBT_OPTIONS:
+                method = DEBT_OPTIONS[option]
+                responses = {method: await self.aget_json_response(method)}
+            case _:
+                raise Exception("opção inválida")
+
+        return self._build_debts(responses)
 
-        for debt in debts:
-            if debts[debt] == {}:
-                debts[debt] = None
+    def _build_debts(self, responses: Dict[str, Optional[Dict]]) -> Dict:
+        debts = {}
+        for category, method in CONSULTATIONS.items():
+            response = responses.get(method) or {}
+            if category != "Licenciamento":
+                response = response.get(category, {})
+            debts[category] = response or None
 
+        if FAILURES in responses:
+            debts[FAILURES] = responses[FAILURES]
         return debts
@@ -0,0 +1,234 @@
+import io
+import json
+import random
+import string
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from core.debts.application.SP.services.exceptions import VehicleNotFoundException
+from core.debts.domain.renavam import renavam_check_digit
+
+Count = Union[int, Tuple[int, int], Callable[[random.Random], int]]
+
+TICKET_DESCRIPTIONS = (
+    "Estacionar em Desacordo com a Sinalizacao.",
+    "Trans. Veloc. Super. a Maxima Permitida em Ate 20%.",
+    "Avancar o Sinal Vermelho do Semaforo.",
+    "Dirigir Veiculo Utilizando-se de Telefone Celular.",
+    "Transitar em Faixa Exclusiva de Onibus.",
+)
+
+# campo do registro que um registro malformado perde ou recebe com tipo errado
+MALFORMABLE_FIELDS = ("Valor", "Exercicio", "AIIP", "TaxaLicenciamento")
+
+
+@dataclass(kw_only=True)
+class SyntheticProfile:
+    """
+    Parâmetros da frota sintética. As quantidades de débitos por veículo
+    aceitam um número fixo, um intervalo `(mínimo, máximo)` uniforme ou uma
+    função que recebe o `random.Random` do veículo.
+    """
+
+    seed: int = 0
+    vehicles: int = 1_000
+    tickets: Count = (0, 4)
+    ipvas: Count = (0, 3)
+    dpvats: Count = (0, 2)
+    licensing_rate: float = 0.6
+    malformed_rate: float = 0.0
+    ticket_amounts: Tuple[int, int] = (8_838, 293_470)
+    ipva_amounts: Tuple[int, int] = (20_000, 600_000)
+    dpvat_amounts: Tuple[int, int] = (523, 10_514)
+    licensing_amounts: Tuple[int, int] = (9_891, 16_094)
+    years: Tuple[int, int] = (2017, 2023)
+
+
+@dataclass(kw_only=True)
+class SyntheticDetran:
+    """
+    Gera respostas determinísticas no formato do webservice do Detran-SP
+    para uma frota de `profile.vehicles` veículos: a mesma semente, placa,
+    RENAVAM e consulta sempre geram a mesma resposta, em qualquer ordem ou
+    thread.
+    """
+
+    profile: SyntheticProfile = field(default_factory=SyntheticProfile)
+
+    def vehicle(self, index: int) -> Tuple[str, str]:
+        """
+        Placa (padrão cinza) e RENAVAM do veículo `index` da frota.
+        """
+        letters, digits = divmod(index, 10_000)
+        plate = "".join(
+            string.ascii_uppercase[letters // 26**power % 26] for power in (2, 1, 0)
+        )
+        base = f"{index + 1:010d}"
+        return f"{plate}{digits:04d}", base + renavam_check_digit(base)
+
+    def vehicles(self) -> Iterable[Tuple[str, str]]:
+        return (self.vehicle(index) for index in range(self.profile.vehicles))
+
+    def index(self, license_plate: str, renavam: str) -> Optional[int]:
+        """
+        Índice do veículo na frota, ou `None` se não fizer parte dela.
+        """
+        plate = license_plate.upper()
+        if len(plate) != 7 or not plate[:3].isalpha() or not plate[3:].isdigit():
+            return None
+
+        letters = 0
+        for letter in plate[:3]:
+            letters = letters * 26 + string.ascii_uppercase.index(letter)
+        index = letters * 10_000 + int(plate[3:])
+
+        if index >= self.profile.vehicles or self.vehicle(index)[1] != renavam:
+            return None
+        return index
+
+    def fetch(self, license_plate: str, renavam: str, debt_option: str) -> Dict:
+        if self.index(license_plate, renavam) is None:
+            raise VehicleNotFoundException()
+
+        rng = random.Random(
+            f"{self.profile.seed}:{license_plate}:{renavam}:{debt_option}"
+        )
+        vehicle = {
+            "UF": "SP",
+            "Placa": license_plate,
+            "CPFCNPJ": "000.000.000-00",
+            "Renavam": renavam,
+            "Proprietario": "JOHN",
+        }
+
+        match debt_option:
+            case "ConsultaMultas":
+                return self._list_payload(
+                    rng, "Multas", "Multa", self.profile.tickets, self._ticket, vehicle
+                )
+            case "ConsultaIPVA":
+                return self._list_payload(
+                    rng, "IPVAs", "IPVA", self.profile.ipvas, self._ipva, vehicle
+                )
+            case "ConsultaDPVAT":
+                return self._list_payload(
+                    rng, "DPVATs", "DPVAT", self.profile.dpvats, self._dpvat, vehicle
+                )
+            case "ConsultaLicenciamento":
+                # sem licenciamento em aberto a resposta vem vazia
+                if rng.random() >= self.profile.licensing_rate:
+                    return {}
+                return {
+                    "Servico": "Licenciamento",
+                    "Veiculo": vehicle,
+                    **self._malformed(
+                        rng,
+                        {
+                            "Exercicio": rng.randint(*self.profile.years),
+                            "TaxaLicenciamento": rng.randint(
+                                *self.profile.licensing_amounts
+                            ),
+                        },
+                    ),
+                }
+            case _:
+                raise Exception("opção inválida")
+
+    def api_class(self) -> Callable[..., "SyntheticAPI"]:
+        """
+        Classe com a interface do `API`, para o `SPService.api_class`.
+        """
+        detran = self
+
+        class BoundSyntheticAPI(SyntheticAPI):
+            synthetic_detran = detran
+
+        return BoundSyntheticAPI
+
+    def _list_payload(self, rng, category, key, count, make_record, vehicle):
+        records: List[Dict] = [
+            self._malformed(rng, make_record(rng))
+            for _ in range(self._count(rng, count))
+        ]
+        return {category: {key: records}, "Servico": category, "Veiculo": vehicle}
+
+    def _ticket(self, rng: random.Random) -> Dict:
+        record = {
+            "AIIP": f"{rng.getrandbits(32):08X}  ",
+            "Valor": rng.randint(*self.profile.ticket_amounts),
+            "DescricaoEnquadramento": rng.choice(TICKET_DESCRIPTIONS),
+        }
+        if rng.random() < 0.5:
+            record["Guia"] = rng.randint(100_000_000, 999_999_999)
+        return record
+
+    def _ipva(self, rng: random.Random) -> Dict:
+        record = {
+            "Valor": rng.randint(*self.profile.ipva_amounts),
+            "Exercicio": rng.randint(*self.profile.years),
+        }
+        installment = rng.choice((None, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10))
+        if installment is not None:
+            record["Cota"] = installment
+        return record
+
+    def _dpvat(self, rng: random.Random) -> Dict:
+        return {
+            "Valor": rng.randint(*self.profile.dpvat_amounts),
+            "Exercicio": rng.randint(*self.profile.years),
+        }
+
+    def _malformed(self, rng: random.Random, record: Dict) -> Dict:
+        if rng.random() >= self.profile.malformed_rate:
+            return record
+
+        name = rng.choice([name for name in MALFORMABLE_FIELDS if name in record])
+        match rng.randrange(3):
+            case 0:
+                del record[name]
+            case 1:
+                record[name] = None
+            case _ if isinstance(record[name], str):
+                # números viram texto na validação; lista nunca é válida
+                record[name] = [record[name]]
+            case _:
+                record[name] = f"{record[name]},00"
+        return record
+
+    @staticmethod
+    def _count(rng: random.Random, count: Count) -> int:
+        if callable(count):
+            return count(rng)
+        if isinstance(count, tuple):
+            return rng.randint(*count)
+        return count
+
+
+class SyntheticAPI:
+    """
+    Substituto do `API` que responde com a frota sintética de
+    `synthetic_detran` (ver `SyntheticDetran.api_class`).
+    """
+
+    synthetic_detran = SyntheticDetran()
+
+    def __init__(self, license_plate, renavam, debt_option):
+        self.license_plate = license_plate
+        self.renavam = renavam
+        self.debt_option = debt_option
+
+        if self.synthetic_detran.index(license_plate, renavam) is None:
+            raise VehicleNotFoundException()
+
+    def fetch(self):
+        return self.synthetic_detran.fetch(
+            self.license_plate, self.renavam, self.debt_option
+        )
+
+    def stream(self, chunk_size=1024):
+        body = io.BytesIO(json.dumps(self.fetch()).encode())
+        return iter(partial(body.read, chunk_size), b"")
+
+    async def afetch(self):
+        return self.fetch()
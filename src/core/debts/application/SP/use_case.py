@@ -1,66 +1,206 @@
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
 from dataclasses import asdict, dataclass
-from typing import Dict, Generator
+from typing import (
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from core.debts.application.dto import (
+    BatchDebtsOutputMapper,
+    DebtOutputMapper,
+    FleetDebtsOutput,
     SearchDebtsInput,
     SearchDebtsOutput,
     SearchDebtsOutputMapper,
     SPParserInput,
 )
+from core.debts.application.snapshots import DebtSnapshotStore
 from core.debts.application.SP.services import SPParser, SPService
+from core.debts.application.SP.services.exceptions import IncompleteSearchException
+from core.debts.application.SP.services.service import FAILURES
+
+# categorias do parser consultadas em cada `debt_option` (None: todas)
+DEBT_OPTION_CATEGORIES = {
+    "": None,
+    "ticket": ("Multas",),
+    "ipva": ("IPVAs",),
+    "dpvat": ("DPVATs",),
+    "licensing": ("Licenciamento",),
+}
 
 
 @dataclass(kw_only=True, frozen=True, slots=True)
 class SearchcDebtsUseCase:
     service_detran_SP: SPService
     service_parser_SP: SPParser
+    snapshot_store: Optional[DebtSnapshotStore] = None
 
     def execute(
         self, input_param: SearchDebtsInput
     ) -> Generator[SearchDebtsOutput, None, None]:
+        yield self.search(input_param)
+
+    async def aexecute(
+        self, input_param: SearchDebtsInput
+    ) -> AsyncGenerator[SearchDebtsOutput, None]:
+        yield await self.asearch(input_param)
+
+    def search(self, input_param: SearchDebtsInput) -> SearchDebtsOutput:
+        """
+        Busca e formata os débitos; erros são propagados. Uma busca em que
+        alguma consulta não respondeu levanta `IncompleteSearchException` com
+        os débitos encontrados.
+
+        Registros do webservice que não passam na validação vêm em
+        `invalid_records`, sem impedir a formatação dos demais.
+
+        Com `snapshot_store`, uma busca recente do mesmo veículo é servida do
+        snapshot e cada nova busca completa é registrada nele (`_parse`
+        levanta antes do registro quando falta alguma consulta; buscas com
+        registros inválidos não são registradas).
+        """
+        if self.snapshot_store is not None:
+            debts = self.snapshot_store.fresh(**asdict(input_param))
+            if debts is not None:
+                return SearchDebtsOutputMapper.to_output(debts)
+
+        response: Dict = self.service_detran_SP.execute(**asdict(input_param))
+        output = self._parse(input_param, response)
+
+        if self.snapshot_store is not None and not output.invalid_records:
+            self.snapshot_store.save(
+                **asdict(input_param), debts=self._snapshot_debts(output)
+            )
+        return output
+
+    async def asearch(self, input_param: SearchDebtsInput) -> SearchDebtsOutput:
+        """
+        Versão assíncrona de `search`. O `snapshot_store` é usado fora do
+        event loop, em threads.
+        """
+        if self.snapshot_store is not None:
+            debts = await asyncio.to_thread(
+                self.snapshot_store.fresh, **asdict(input_param)
+            )
+            if debts is not None:
+                return SearchDebtsOutputMapper.to_output(debts)
+
+        response: Dict = await self.service_detran_SP.aexecute(**asdict(input_param))
+        output = self._parse(input_param, response)
+
+        if self.snapshot_store is not None and not output.invalid_records:
+            await asyncio.to_thread(
+                self.snapshot_store.save,
+                **asdict(input_param),
+                debts=self._snapshot_debts(output),
+            )
+        return output
+
+    def stream(self, input_param: SearchDebtsInput) -> Iterable[object]:
+        """
+        Busca os débitos e os gera um a um, conforme o parser os formata.
+        Cada registro inválido gera um `DebtRecordError` no lugar do débito.
+
+        Com `service_detran_SP.stream_responses`, os débitos são formatados
+        conforme as respostas do webservice chegam, sem montá-las inteiras.
+        """
+        if self.service_detran_SP.stream_responses:
+            records = self.service_detran_SP.stream_records(**asdict(input_param))
+            return self.service_parser_SP.iter_records_batch(records)
+
+        response: Dict = self.service_detran_SP.execute(**asdict(input_param))
+        if FAILURES in response:
+            # levanta antes do primeiro débito, enquanto dá para responder erro
+            self._parse(input_param, response)
+        return self._collect(input_param, response)
+
+    @staticmethod
+    def _snapshot_debts(output: SearchDebtsOutput) -> List[Dict]:
+        return [DebtOutputMapper.to_dict(debt) for debt in output.debts_list]
+
+    def _parse(
+        self, input_param: SearchDebtsInput, response: Dict
+    ) -> SearchDebtsOutput:
+        batch = BatchDebtsOutputMapper.to_output(self._collect(input_param, response))
+        if FAILURES in response:
+            raise IncompleteSearchException(response[FAILURES], batch.debts)
+        return SearchDebtsOutputMapper.to_output(batch.debts, batch.errors)
+
+    def _collect(
+        self, input_param: SearchDebtsInput, response: Dict
+    ) -> Iterable[object]:
+        if input_param.debt_option not in DEBT_OPTION_CATEGORIES:
+            raise Exception("opção inválida")
+
+        return self.service_parser_SP.iter_debts_batch(
+            SPParserInput(data=response),
+            DEBT_OPTION_CATEGORIES[input_param.debt_option],
+        )
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class SearchFleetDebtsUseCase:
+    """
+    Busca os débitos de vários veículos em paralelo (no máximo `max_workers`
+    buscas ao mesmo tempo). Os resultados são gerados na ordem em que as
+    buscas terminam e erros de um veículo não interrompem os demais.
+
+    Para rodar num pool de processos, informe `executor_class` e uma
+    `search_function` que possa ser serializada (função de módulo).
+    """
+
+    use_case_search_debts_SP: Callable[[], SearchcDebtsUseCase]
+    max_workers: int = 8
+    executor_class: Callable[..., Executor] = ThreadPoolExecutor
+    search_function: Optional[Callable[[SearchDebtsInput], SearchDebtsOutput]] = None
+
+    def execute(
+        self, inputs: Iterable[Tuple[int, SearchDebtsInput]]
+    ) -> Generator[FleetDebtsOutput, None, None]:
+        executor = self.executor_class(max_workers=self.max_workers)
+        search = self.search_function or self._search
+        pending = {}
         try:
-            response: Dict = self.service_detran_SP.execute(**asdict(input_param))
-            parser_input_param = SPParserInput(data=response)
-
-            match input_param.debt_option:
-                case "":
-                    yield SearchDebtsOutputMapper.to_output(
-                        self.service_parser_SP.collect_all_debts(parser_input_param)
-                    )
-                case "ticket":
-                    yield SearchDebtsOutputMapper.to_output(
-                        list(
-                            self.service_parser_SP.collect_ticket_debts(
-                                parser_input_param
-                            )
-                        )
-                    )
-                case "ipva":
-                    yield SearchDebtsOutputMapper.to_output(
-                        list(
-                            self.service_parser_SP.collect_ipva_debts(
-                                parser_input_param
-                            )
-                        )
-                    )
-                case "dpvat":
-                    yield SearchDebtsOutputMapper.to_output(
-                        list(
-                            self.service_parser_SP.collect_insurance_debts(
-                                parser_input_param
-                            )
-                        )
-                    )
-                case "licensing":
-                    yield SearchDebtsOutputMapper.to_output(
-                        list(
-                            self.service_parser_SP.collect_licensing_debts(
-                                parser_input_param
-                            )
-                        )
-                    )
-                case _:
-                    raise Exception("opção inválida")
-
-        except Exception as exc:
-            print(exc)
+            for index, input_param in inputs:
+                if len(pending) >= self.max_workers * 2:
+                    yield from self._completed(pending)
+
+                future = executor.submit(search, input_param)
+                pending[future] = (index, input_param)
+
+            while pending:
+                yield from self._completed(pending)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search(self, input_param: SearchDebtsInput) -> SearchDebtsOutput:
+        return self.use_case_search_debts_SP().search(input_param)
+
+    def _completed(self, pending: Dict) -> Generator[FleetDebtsOutput, None, None]:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, input_param = pending.pop(future)
+            try:
+                output = future.result()
+                debts_list, error = output.debts_list, None
+                invalid_records = output.invalid_records or None
+            except Exception as exc:
+                debts_list, error = None, str(exc) or repr(exc)
+                invalid_records = None
+
+            yield FleetDebtsOutput(
+                index=index,
+                license_plate=input_param.license_plate,
+                renavam=input_param.renavam,
+                debt_option=input_param.debt_option,
+                debts_list=debts_list,
+                error=error,
+                invalid_records=invalid_records,
+            )
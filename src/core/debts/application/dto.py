@@ -1,6 +1,7 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterable, List, Optional
 
+from core.debts import metrics
 from core.debts.domain.entities import DPVAT, IPVA, Licenciamento, Multa
 
 
@@ -9,7 +10,7 @@ from core.debts.domain.entities import DPVAT, IPVA, Licenciamento, Multa
 class MultaInput:
     amount: float
     auto_infraction: str
-    description: str
+    description: Optional[str]
     title: Optional[str] = Multa.get_field("title").default
     type: Optional[str] = Multa.get_field("type").default
 
@@ -26,6 +27,7 @@ class MultaOutput:
 @dataclass(frozen=True, slots=True)
 class MultaOutPutMapper:
     @classmethod
+    @metrics.timed("debts_mapper_seconds", mapper="MultaOutPutMapper")
     def to_output(cls, multa: Multa) -> MultaOutput:
         return MultaOutput(
             amount=multa.amount,
@@ -60,8 +62,9 @@ class IPVAOutput:
 @dataclass(frozen=True, slots=True)
 class IPVAOutPutMapper:
     @classmethod
+    @metrics.timed("debts_mapper_seconds", mapper="IPVAOutPutMapper")
     def to_output(cls, ipva: IPVA) -> IPVAOutput:
-        output = IPVAOutput(
+        return cls.build(
             amount=ipva.amount,
             description=ipva.description,
             installment=ipva.installment,
@@ -69,6 +72,11 @@ class IPVAOutPutMapper:
             type=ipva.type,
             year=ipva.year,
         )
+
+    @classmethod
+    @metrics.timed("debts_mapper_seconds", mapper="IPVAOutPutMapper.build")
+    def build(cls, **fields) -> IPVAOutput:
+        output = IPVAOutput(**fields)
         if output.installment is None:
             object.__delattr__(output, "installment")
         return output
@@ -96,6 +104,7 @@ class DPVATOutput:
 @dataclass(frozen=True, slots=True)
 class DPVATOutPutMapper:
     @classmethod
+    @metrics.timed("debts_mapper_seconds", mapper="DPVATOutPutMapper")
     def to_output(cls, dpvat: DPVAT) -> DPVATOutput:
         return DPVATOutput(
             amount=dpvat.amount,
@@ -128,6 +137,7 @@ class LicenciamentoOutput:
 @dataclass(frozen=True, slots=True)
 class LicenciamentoOutPutMapper:
     @classmethod
+    @metrics.timed("debts_mapper_seconds", mapper="LicenciamentoOutPutMapper")
     def to_output(cls, licenciamento: Licenciamento) -> LicenciamentoOutput:
         return LicenciamentoOutput(
             amount=licenciamento.amount,
@@ -138,12 +148,58 @@ class LicenciamentoOutPutMapper:
         )
 
 
+@dataclass(frozen=True, slots=True)
+class DebtOutputMapper:
+    @classmethod
+    def to_dict(cls, output: object) -> Dict:
+        """
+        Converte um *Output em dict sem cópia profunda, ignorando campos
+        removidos (ex.: `installment` do IPVA). Débitos que já são dict (ex.:
+        vindos de snapshots ou de outro processo) são devolvidos como estão.
+        """
+        if isinstance(output, dict):
+            return output
+        return {
+            field.name: getattr(output, field.name)
+            for field in fields(output)
+            if hasattr(output, field.name)
+        }
+
+
 # SPParse
 @dataclass(slots=True, frozen=True)
 class SPParserInput:
     data: dict
 
 
+# Validação em lote
+@dataclass(kw_only=True, slots=True, frozen=True)
+class DebtRecordError:
+    category: str
+    index: int
+    record: Dict
+    errors: Dict[str, List[str]]
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class BatchDebtsOutput:
+    debts: List[object]
+    errors: List[DebtRecordError]
+
+
+@dataclass(frozen=True, slots=True)
+class BatchDebtsOutputMapper:
+    @classmethod
+    def to_output(cls, items: Iterable[object]) -> BatchDebtsOutput:
+        """
+        Separa os débitos formatados dos `DebtRecordError`, mantendo a ordem.
+        """
+        debts, errors = [], []
+        for item in items:
+            (errors if isinstance(item, DebtRecordError) else debts).append(item)
+        return BatchDebtsOutput(debts=debts, errors=errors)
+
+
 # SearchDebts
 @dataclass(kw_only=True, slots=True, frozen=True)
 class SearchDebtsInput:
@@ -155,10 +211,32 @@ class SearchDebtsInput:
 @dataclass(kw_only=True, frozen=True, slots=True)
 class SearchDebtsOutput:
     debts_list: List[Dict]
+    # registros do webservice que não passaram na validação
+    invalid_records: List[DebtRecordError] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
 class SearchDebtsOutputMapper:
     @classmethod
-    def to_output(cls, collection: List[Dict] = []) -> SearchDebtsOutput:
-        return SearchDebtsOutput(debts_list=collection)
+    @metrics.timed("debts_mapper_seconds", mapper="SearchDebtsOutputMapper")
+    def to_output(
+        cls,
+        collection: List[Dict] = [],
+        invalid_records: Optional[List[DebtRecordError]] = None,
+    ) -> SearchDebtsOutput:
+        return SearchDebtsOutput(
+            debts_list=collection, invalid_records=invalid_records or []
+        )
+
+
+# SearchFleetDebts
+@dataclass(kw_only=True, frozen=True, slots=True)
+class FleetDebtsOutput:
+    index: int
+    license_plate: Optional[str]
+    renavam: Optional[str]
+    debt_option: Optional[str] = ""
+    debts_list: Optional[List[Dict]] = None
+    error: Optional[str] = None
+    errors: Optional[Dict[str, List[str]]] = None
+    invalid_records: Optional[List[DebtRecordError]] = None
@@ -0,0 +1,94 @@
+import abc
+from abc import ABC
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# campos que identificam um débito do mesmo tipo entre duas buscas
+DEBT_IDENTITIES = {
+    "ticket": ("auto_infraction",),
+    "ipva": ("year", "installment"),
+    "insurance": ("year",),
+    "licensing": ("year",),
+}
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class DebtsDiff:
+    new: List[Dict] = field(default_factory=list)
+    paid: List[Dict] = field(default_factory=list)
+    changed: List[Dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.new or self.paid or self.changed)
+
+    def to_dict(self) -> Dict:
+        return {"new": self.new, "paid": self.paid, "changed": self.changed}
+
+
+def debt_identity(debt: Dict) -> Tuple:
+    fields = DEBT_IDENTITIES.get(debt.get("type"))
+    if fields is None:
+        return (debt.get("type"), tuple(sorted(debt.items())))
+    return (debt["type"], *(debt.get(name) for name in fields))
+
+
+def diff_debts(before: List[Dict], after: List[Dict]) -> DebtsDiff:
+    """
+    Compara duas buscas do mesmo veículo: débitos que surgiram (`new`), que
+    sumiram (`paid`) e que mudaram (`changed`, com `before` e `after`).
+    """
+    previous = _by_identity(before)
+    current = _by_identity(after)
+
+    diff = DebtsDiff()
+    for identity, debt in current.items():
+        if identity not in previous:
+            diff.new.append(debt)
+        elif previous[identity] != debt:
+            diff.changed.append({"before": previous[identity], "after": debt})
+    for identity, debt in previous.items():
+        if identity not in current:
+            diff.paid.append(debt)
+    return diff
+
+
+def _by_identity(debts: List[Dict]) -> Dict[Tuple, Dict]:
+    # débitos repetidos (mesma identidade) são diferenciados pela ordem
+    seen: Dict[Tuple, int] = defaultdict(int)
+    indexed = {}
+    for debt in debts:
+        identity = debt_identity(debt)
+        indexed[identity + (seen[identity],)] = debt
+        seen[identity] += 1
+    return indexed
+
+
+class DebtSnapshotStore(ABC):
+    """
+    Guarda o último resultado de cada busca (veículo e opção de débito).
+
+    Só recebe buscas completas: uma busca com erro ou em que alguma consulta
+    não respondeu (`IncompleteSearchException`) não é registrada, então o
+    que `fresh` devolve e o que `save` compara são sempre listas completas.
+    """
+
+    @abc.abstractmethod
+    def fresh(
+        self, license_plate: str, renavam: str, debt_option: str
+    ) -> Optional[List[Dict]]:
+        """
+        Débitos da última busca, se ela ainda estiver dentro do prazo de
+        validade; `None` caso contrário.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def save(
+        self, license_plate: str, renavam: str, debt_option: str, debts: List[Dict]
+    ) -> DebtsDiff:
+        """
+        Registra o resultado de uma busca e retorna as mudanças em relação à
+        busca anterior.
+        """
+        raise NotImplementedError()
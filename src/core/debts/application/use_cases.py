@@ -1,5 +1,7 @@
 from dataclasses import asdict, dataclass
+from typing import Dict
 
+from core.debts import metrics
 from core.debts.application.dto import (
     DPVATInput,
     DPVATOutput,
@@ -21,7 +23,8 @@ from core.debts.domain.entities import DPVAT, IPVA, Licenciamento, Multa
 class CreateMultaUseCase:
     def execute(self, input_param: MultaInput) -> MultaOutput:
         # cria entidade de dominio
-        multa = Multa(**asdict(input_param))
+        with metrics.timer("debts_validation_seconds", entity="Multa"):
+            multa = Multa(**asdict(input_param))
 
         # aplica regras de negócio
         multa.amount_to_float()
@@ -29,12 +32,48 @@ class CreateMultaUseCase:
         # retorna um output conforme necessidade do caso de uso
         return MultaOutPutMapper.to_output(multa)
 
+    def execute_direct(self, input_param: MultaInput, validate=True) -> MultaOutput:
+        """
+        Mesmas validações e regras de `execute`, montando o output direto dos
+        valores validados, sem criar a entidade.
+        """
+        values = self.to_values(input_param)
+        if validate:
+            with metrics.timer("debts_validation_seconds", entity="Multa"):
+                values = Multa.validate_values(values)
+
+        return self.build(values)
+
+    @staticmethod
+    def build(values: Dict) -> MultaOutput:
+        """
+        Aplica as regras de negócio em valores já validados.
+        """
+        return MultaOutput(
+            amount=Multa.amount_in_reais(values["amount"]),
+            auto_infraction=values["auto_infraction"],
+            description=values["description"],
+            title=values["title"],
+            type=values["type"],
+        )
+
+    @staticmethod
+    def to_values(input_param: MultaInput) -> Dict:
+        return {
+            "amount": input_param.amount,
+            "auto_infraction": input_param.auto_infraction,
+            "description": input_param.description,
+            "title": input_param.title,
+            "type": input_param.type,
+        }
+
 
 @dataclass(slots=True, frozen=True)
 class CreateIPVAUseCase:
     def execute(self, input_param: IPVAInput) -> IPVAOutput:
         # cria entidade de dominio
-        ipva = IPVA(**asdict(input_param))
+        with metrics.timer("debts_validation_seconds", entity="IPVA"):
+            ipva = IPVA(**asdict(input_param))
 
         # aplica regras de negócio
         ipva.build_title()
@@ -45,24 +84,137 @@ class CreateIPVAUseCase:
         # retorna um output conforme necessidade do caso de uso
         return IPVAOutPutMapper.to_output(ipva)
 
+    def execute_direct(self, input_param: IPVAInput, validate=True) -> IPVAOutput:
+        """
+        Mesmas validações e regras de `execute`, montando o output direto dos
+        valores validados, sem criar a entidade.
+        """
+        values = self.to_values(input_param)
+        if validate:
+            with metrics.timer("debts_validation_seconds", entity="IPVA"):
+                values = IPVA.validate_values(values)
+
+        return self.build(values)
+
+    @staticmethod
+    def build(values: Dict) -> IPVAOutput:
+        """
+        Aplica as regras de negócio em valores já validados.
+        """
+        return IPVAOutPutMapper.build(
+            amount=IPVA.amount_in_reais(values["amount"]),
+            description=IPVA.description_for(values["year"]),
+            installment=IPVA.normalize_installment(values["installment"]),
+            title=IPVA.title_for(values["installment"]),
+            type=values["type"],
+            year=values["year"],
+        )
+
+    @staticmethod
+    def to_values(input_param: IPVAInput) -> Dict:
+        return {
+            "amount": input_param.amount,
+            "description": input_param.description,
+            "installment": input_param.installment,
+            "title": input_param.title,
+            "type": input_param.type,
+            "year": input_param.year,
+        }
+
 
 @dataclass(slots=True, frozen=True)
 class CreateDPVATUseCase:
     def execute(self, input_param: DPVATInput) -> DPVATOutput:
-        dpvat = DPVAT(**asdict(input_param))
+        with metrics.timer("debts_validation_seconds", entity="DPVAT"):
+            dpvat = DPVAT(**asdict(input_param))
 
         dpvat.amount_to_float()
         dpvat.build_description()
 
         return DPVATOutPutMapper.to_output(dpvat)
 
+    def execute_direct(self, input_param: DPVATInput, validate=True) -> DPVATOutput:
+        """
+        Mesmas validações e regras de `execute`, montando o output direto dos
+        valores validados, sem criar a entidade.
+        """
+        values = self.to_values(input_param)
+        if validate:
+            with metrics.timer("debts_validation_seconds", entity="DPVAT"):
+                values = DPVAT.validate_values(values)
+
+        return self.build(values)
+
+    @staticmethod
+    def build(values: Dict) -> DPVATOutput:
+        """
+        Aplica as regras de negócio em valores já validados.
+        """
+        return DPVATOutput(
+            amount=DPVAT.amount_in_reais(values["amount"]),
+            description=DPVAT.description_for(values["description"], values["year"]),
+            title=values["title"],
+            type=values["type"],
+            year=values["year"],
+        )
+
+    @staticmethod
+    def to_values(input_param: DPVATInput) -> Dict:
+        return {
+            "amount": input_param.amount,
+            "description": input_param.description,
+            "title": input_param.title,
+            "type": input_param.type,
+            "year": input_param.year,
+        }
+
 
 @dataclass(slots=True, frozen=True)
 class CreateLicenciamentoUseCase:
     def execute(self, input_param: LicenciamentoInput) -> LicenciamentoOutput:
-        licenciamento = Licenciamento(**asdict(input_param))
+        with metrics.timer("debts_validation_seconds", entity="Licenciamento"):
+            licenciamento = Licenciamento(**asdict(input_param))
 
         licenciamento.amount_to_float()
         licenciamento.build_description()
 
         return LicenciamentoOutPutMapper.to_output(licenciamento)
+
+    def execute_direct(
+        self, input_param: LicenciamentoInput, validate=True
+    ) -> LicenciamentoOutput:
+        """
+        Mesmas validações e regras de `execute`, montando o output direto dos
+        valores validados, sem criar a entidade.
+        """
+        values = self.to_values(input_param)
+        if validate:
+            with metrics.timer("debts_validation_seconds", entity="Licenciamento"):
+                values = Licenciamento.validate_values(values)
+
+        return self.build(values)
+
+    @staticmethod
+    def build(values: Dict) -> LicenciamentoOutput:
+        """
+        Aplica as regras de negócio em valores já validados.
+        """
+        return LicenciamentoOutput(
+            amount=Licenciamento.amount_in_reais(values["amount"]),
+            description=Licenciamento.description_for(
+                values["description"], values["year"]
+            ),
+            title=values["title"],
+            type=values["type"],
+            year=values["year"],
+        )
+
+    @staticmethod
+    def to_values(input_param: LicenciamentoInput) -> Dict:
+        return {
+            "amount": input_param.amount,
+            "description": input_param.description,
+            "title": input_param.title,
+            "type": input_param.type,
+            "year": input_param.year,
+        }
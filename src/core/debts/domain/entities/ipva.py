@@ -1,5 +1,5 @@
 from dataclasses import Field, asdict, dataclass, field
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from core.debts.domain.exceptions import EntityValidationException
 from core.debts.domain.validators import IPVAValidatorFactory, ValidatorInterface
@@ -22,25 +22,47 @@ class IPVA:
         return entity_dict
 
     def validate(self):
+        for name, value in self.validate_values(self.to_dict()).items():
+            self._set(name, value)
+
+    @staticmethod
+    def validate_values(values: Dict) -> Dict:
         validator: ValidatorInterface = IPVAValidatorFactory.create()
-        is_valid = validator.validate(self.to_dict())
+        is_valid = validator.validate(values)
         if not is_valid:
             raise EntityValidationException(validator.errors)
+        return validator.validated_data
 
     def build_title(self):
-        value_cota = "Única" if self.installment in [7, 8, 0] else self.installment
-        builded_title = f"IPVA - Cota {value_cota}"
-        self._set("title", builded_title)
+        self._set("title", self.title_for(self.installment))
 
     def amount_to_float(self):
-        self._set("amount", (self.amount / 100))
+        self._set("amount", self.amount_in_reais(self.amount))
 
     def set_description(self):
-        self._set("description", f"IPVA {self.year}")
+        self._set("description", self.description_for(self.year))
 
     def set_installment(self):
-        if _ := bool(self.installment in [0, 7, 8]):
-            self._set("installment", "unique")
+        self._set("installment", self.normalize_installment(self.installment))
+
+    @staticmethod
+    def title_for(installment: Optional[str | int]) -> str:
+        value_cota = "Única" if installment in [7, 8, 0] else installment
+        return f"IPVA - Cota {value_cota}"
+
+    @staticmethod
+    def amount_in_reais(amount: float) -> float:
+        return amount / 100
+
+    @staticmethod
+    def description_for(year: int) -> str:
+        return f"IPVA {year}"
+
+    @staticmethod
+    def normalize_installment(installment: Optional[str | int]):
+        if _ := bool(installment in [0, 7, 8]):
+            return "unique"
+        return installment
 
     @classmethod
     def get_field(cls, entity_field: str) -> Field:
@@ -1,5 +1,5 @@
 from dataclasses import Field, asdict, dataclass, field
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from core.debts.domain.exceptions import EntityValidationException
 from core.debts.domain.validators import (
@@ -24,17 +24,30 @@ class Licenciamento:
         return entity_dict
 
     def validate(self):
+        for name, value in self.validate_values(self.to_dict()).items():
+            self._set(name, value)
+
+    @staticmethod
+    def validate_values(values: Dict) -> Dict:
         validator: ValidatorInterface = LicenciamentoValidatorFactory.create()
-        is_valid = validator.validate(self.to_dict())
+        is_valid = validator.validate(values)
         if not is_valid:
             raise EntityValidationException(validator.errors)
+        return validator.validated_data
 
     def amount_to_float(self):
-        self._set("amount", (self.amount / 100))
+        self._set("amount", self.amount_in_reais(self.amount))
 
     def build_description(self):
-        if not self.description:
-            self._set("description", f"Licenciamento {self.year}")
+        self._set("description", self.description_for(self.description, self.year))
+
+    @staticmethod
+    def amount_in_reais(amount: float) -> float:
+        return amount / 100
+
+    @staticmethod
+    def description_for(description: Optional[str], year: int) -> str:
+        return description if description else f"Licenciamento {year}"
 
     @classmethod
     def get_field(cls, entity_field: str) -> Field:
@@ -1,5 +1,5 @@
 from dataclasses import Field, asdict, dataclass, field
-from typing import Any
+from typing import Any, Dict, Optional
 
 from core.debts.domain.exceptions import EntityValidationException
 from core.debts.domain.validators import MultaValidatorFactory, ValidatorInterface
@@ -9,7 +9,7 @@ from core.debts.domain.validators import MultaValidatorFactory, ValidatorInterfa
 class Multa:
     amount: float
     auto_infraction: str
-    description: str
+    description: Optional[str]
     title: str = field(default="Infração de Trânsito")
     type: str = field(default="ticket")
 
@@ -21,13 +21,23 @@ class Multa:
         return entity_dict
 
     def validate(self):
+        for name, value in self.validate_values(self.to_dict()).items():
+            self._set(name, value)
+
+    @staticmethod
+    def validate_values(values: Dict) -> Dict:
         validator: ValidatorInterface = MultaValidatorFactory.create()
-        is_valid = validator.validate(self.to_dict())
+        is_valid = validator.validate(values)
         if not is_valid:
             raise EntityValidationException(validator.errors)
+        return validator.validated_data
 
     def amount_to_float(self):
-        self._set("amount", (self.amount / 100))
+        self._set("amount", self.amount_in_reais(self.amount))
+
+    @staticmethod
+    def amount_in_reais(amount: float) -> float:
+        return amount / 100
 
     @classmethod
     def get_field(cls, entity_field: str) -> Field:
@@ -7,3 +7,11 @@ class EntityValidationException(Exception):
     def __init__(self, error: Dict[str, List[str]]) -> None:
         self.error = error
         super().__init__("Entity Validation Error")
+
+
+class InvalidLicensePlateException(Exception):
+    license_plate: object
+
+    def __init__(self, license_plate: object) -> None:
+        self.license_plate = license_plate
+        super().__init__(f"placa inválida: {license_plate!r}")
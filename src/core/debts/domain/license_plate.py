@@ -0,0 +1,29 @@
+import re
+from functools import lru_cache
+
+from core.debts.domain.exceptions import InvalidLicensePlateException
+
+# 5º caractere da placa Mercosul -> dígito da placa no padrão cinza
+MERCOSUL_TO_GRAY = str.maketrans("ABCDEFGHIJ", "0123456789")
+
+LICENSE_PLATE_PATTERN = re.compile(r"[A-Z]{3}[0-9][0-9A-J][0-9]{2}")
+
+
+@lru_cache(maxsize=4096)
+def normalize_license_plate(license_plate: str) -> str:
+    """
+    Placa no padrão cinza (ex.: "ABC1234"), como o webservice do Detran-SP
+    espera. Aceita minúsculas, espaços nas pontas, o hífen ("ABC-1234") e o
+    padrão Mercosul ("ABC1C34"); qualquer outro formato levanta
+    `InvalidLicensePlateException`.
+    """
+    if not isinstance(license_plate, str):
+        raise InvalidLicensePlateException(license_plate)
+
+    plate = license_plate.strip().upper()
+    if len(plate) == 8 and plate[3] == "-":
+        plate = plate[:3] + plate[4:]
+    if not LICENSE_PLATE_PATTERN.fullmatch(plate):
+        raise InvalidLicensePlateException(license_plate)
+
+    return plate[:4] + plate[4].translate(MERCOSUL_TO_GRAY) + plate[5:]
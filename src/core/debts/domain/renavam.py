@@ -0,0 +1,21 @@
+RENAVAM_WEIGHTS = (3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+def renavam_check_digit(base: str) -> str:
+    """
+    Dígito verificador do RENAVAM para os 10 primeiros dígitos.
+    """
+    total = sum(int(digit) * weight for digit, weight in zip(base, RENAVAM_WEIGHTS))
+    digit = total * 10 % 11
+    return "0" if digit == 10 else str(digit)
+
+
+def is_valid_renavam(renavam: str) -> bool:
+    """
+    RENAVAM com 11 dígitos e dígito verificador correto.
+    """
+    return (
+        len(renavam) == 11
+        and renavam.isdigit()
+        and renavam_check_digit(renavam[:10]) == renavam[10]
+    )
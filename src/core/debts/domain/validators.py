@@ -1,7 +1,8 @@
 import abc
+import re
 from abc import ABC
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
 
 from rest_framework import serializers
 from rest_framework.fields import CharField, DictField, Field, FloatField, IntegerField
@@ -54,12 +55,175 @@ class CharOrIntField(Field):
         self.fail("invalid", input=data)
 
 
+class FieldError(Exception):
+    pass
+
+
+MAX_STRING_LENGTH = 1000
+DECIMAL_SUFFIX = re.compile(r"\.0*\s*$")
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
+        raise FieldError("String value too large.")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise FieldError("A valid number is required.")
+    except OverflowError:
+        raise FieldError("Integer value too large to convert to float")
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
+        raise FieldError("String value too large.")
+    try:
+        return int(DECIMAL_SUFFIX.sub("", str(value)))
+    except (TypeError, ValueError):
+        raise FieldError("A valid integer is required.")
+
+
+def _to_str(value: Any) -> str:
+    # como o CharField: números viram texto, bool e compostos são inválidos
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise FieldError("Not a valid string.")
+    value = str(value)
+    if "\x00" in value:
+        raise FieldError("Null characters are not allowed.")
+    return value
+
+
+def _to_char_or_int(value: Any) -> Any:
+    if not isinstance(value, (str, int)):
+        raise FieldError("Invalid value.")
+    return value
+
+
+# conversão de cada campo do DRF (`to_internal_value`), com as mesmas regras
+# de coerção e as mensagens padrão
+FIELD_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    FloatField: _to_float,
+    IntegerField: _to_int,
+    CharField: _to_str,
+    CharOrIntField: _to_char_or_int,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FieldRule:
+    name: str
+    to_internal_value: Callable[[Any], Any]
+    required: bool = True
+    allow_null: bool = False
+    # só para CharField
+    is_char: bool = False
+    allow_blank: bool = False
+    trim_whitespace: bool = True
+
+    def run(self, value: Any) -> Any:
+        """
+        Valor convertido, como o `Field.run_validation` do DRF; levanta
+        `FieldError` com a mensagem do DRF.
+        """
+        if self.is_char and (
+            value == "" or (self.trim_whitespace and str(value).strip() == "")
+        ):
+            if not self.allow_blank:
+                raise FieldError("This field may not be blank.")
+            return ""
+        if value is None:
+            if not self.allow_null:
+                raise FieldError("This field may not be null.")
+            return None
+
+        value = self.to_internal_value(value)
+        if self.is_char and self.trim_whitespace:
+            value = value.strip()
+        return value
+
+
+def compile_rules(rules: Type[serializers.Serializer]) -> Tuple[FieldRule, ...]:
+    """
+    Converte os campos de um Serializer em regras avaliadas sem instanciar o
+    DRF, com a mesma semântica dos campos (coerção, null, blank e
+    obrigatoriedade). Os Rules abaixo anotam os campos, que valem junto com
+    os declarados.
+    """
+    fields = {**rules.__annotations__, **rules._declared_fields}
+    compiled = []
+    for name, field in fields.items():
+        compiled.append(
+            FieldRule(
+                name=name,
+                to_internal_value=FIELD_CONVERTERS[type(field)],
+                required=field.required,
+                allow_null=field.allow_null,
+                is_char=isinstance(field, CharField),
+                allow_blank=getattr(field, "allow_blank", False),
+                trim_whitespace=getattr(field, "trim_whitespace", True),
+            )
+        )
+    return tuple(compiled)
+
+
+class FastValidatorAdapter(ValidatorInterface, ABC):
+    """
+    Valida com regras pré-compiladas e devolve os erros e os dados
+    validados no mesmo formato do `DRFValidatorAdapter`.
+    """
+
+    rules: Tuple[FieldRule, ...] = ()
+
+    def validate(self, data: Dict):
+        validated_data, errors = self.run(data if data is not None else {})
+
+        if errors:
+            self.errors = errors
+            return False
+
+        self.validated_data = validated_data
+        return True
+
+    def validate_many(self, records: Iterable[Dict]) -> List[Dict[str, List[str]]]:
+        """
+        Valida vários registros de uma vez; retorna os erros de cada registro
+        na mesma ordem (dict vazio para registros válidos).
+        """
+        check = self.check
+        return [check(data if data is not None else {}) for data in records]
+
+    @classmethod
+    def check(cls, data: Dict) -> Dict[str, List[str]]:
+        return cls.run(data)[1]
+
+    @classmethod
+    def run(cls, data: Dict) -> Tuple[Dict, Dict[str, List[str]]]:
+        validated_data, errors = {}, {}
+
+        for rule in cls.rules:
+            if rule.name not in data:
+                if rule.required:
+                    errors[rule.name] = ["This field is required."]
+                continue
+
+            try:
+                validated_data[rule.name] = rule.run(data[rule.name])
+            except FieldError as exc:
+                errors[rule.name] = [str(exc)]
+
+        return validated_data, errors
+
+
 # Multa
 class MultaDRFValidator(DRFValidatorAdapter):
     class MultaRules(serializers.Serializer):
         amount: FloatField(required=True)
-        auto_infraction: CharField(required=True)
-        description: CharField(required=True)
+        # os textos do Detran seguem para o output como chegaram
+        auto_infraction: CharField(required=True, trim_whitespace=False)
+        # algumas infrações chegam sem `DescricaoEnquadramento`
+        description: CharField(
+            required=True, allow_null=True, allow_blank=True, trim_whitespace=False
+        )
         title: CharField(required=True)
         type: CharField(required=True)
 
@@ -68,9 +232,17 @@ class MultaDRFValidator(DRFValidatorAdapter):
         return super().validate(rules)
 
 
+class MultaFastValidator(FastValidatorAdapter):
+    rules = compile_rules(MultaDRFValidator.MultaRules)
+
+
 class MultaValidatorFactory:
     @staticmethod
     def create():
+        return MultaFastValidator()
+
+    @staticmethod
+    def create_drf():
         return MultaDRFValidator()
 
 
@@ -78,9 +250,12 @@ class MultaValidatorFactory:
 class IPVADRFValidator(DRFValidatorAdapter):
     class IPVARules(serializers.Serializer):
         amount: FloatField(required=True)
-        description: CharField(required=False, allow_null=True, allow_blank=True)
+        description: CharField(
+            required=False, allow_null=True, allow_blank=True, trim_whitespace=False
+        )
         installment: CharOrIntField(required=False, allow_null=True)
-        title: CharField(required=True)
+        # o título é montado depois da validação (`build_title`)
+        title: CharField(required=True, allow_blank=True)
         type: CharField(required=True)
         year: IntegerField(required=True)
 
@@ -89,9 +264,17 @@ class IPVADRFValidator(DRFValidatorAdapter):
         return super().validate(rules)
 
 
+class IPVAFastValidator(FastValidatorAdapter):
+    rules = compile_rules(IPVADRFValidator.IPVARules)
+
+
 class IPVAValidatorFactory:
     @staticmethod
     def create():
+        return IPVAFastValidator()
+
+    @staticmethod
+    def create_drf():
         return IPVADRFValidator()
 
 
@@ -99,7 +282,9 @@ class IPVAValidatorFactory:
 class DPVATDRFValidator(DRFValidatorAdapter):
     class DPVATRules(serializers.Serializer):
         amount: FloatField(required=True)
-        description: CharField(required=False, allow_null=True, allow_blank=True)
+        description: CharField(
+            required=False, allow_null=True, allow_blank=True, trim_whitespace=False
+        )
         title: CharField(required=True)
         type: CharField(required=True)
         year: IntegerField(required=True)
@@ -109,9 +294,17 @@ class DPVATDRFValidator(DRFValidatorAdapter):
         return super().validate(rules)
 
 
+class DPVATFastValidator(FastValidatorAdapter):
+    rules = compile_rules(DPVATDRFValidator.DPVATRules)
+
+
 class DPVATValidatorFactory:
     @staticmethod
     def create():
+        return DPVATFastValidator()
+
+    @staticmethod
+    def create_drf():
         return DPVATDRFValidator()
 
 
@@ -119,7 +312,9 @@ class DPVATValidatorFactory:
 class LicenciamentoValidator(DRFValidatorAdapter):
     class LicenciamentoRules(serializers.Serializer):
         amount: FloatField(required=True)
-        description: CharField(required=False, allow_null=True, allow_blank=True)
+        description: CharField(
+            required=False, allow_null=True, allow_blank=True, trim_whitespace=False
+        )
         title: CharField(required=True)
         type: CharField(required=True)
         year: IntegerField(required=True)
@@ -129,9 +324,17 @@ class LicenciamentoValidator(DRFValidatorAdapter):
         return super().validate(rules)
 
 
+class LicenciamentoFastValidator(FastValidatorAdapter):
+    rules = compile_rules(LicenciamentoValidator.LicenciamentoRules)
+
+
 class LicenciamentoValidatorFactory:
     @staticmethod
     def create():
+        return LicenciamentoFastValidator()
+
+    @staticmethod
+    def create_drf():
         return LicenciamentoValidator()
 
 
@@ -1,5 +1,9 @@
-# noqa: F401
-
 from django.contrib import admin
 
-# Register your models here.
+from .models import DebtSnapshot
+
+
+@admin.register(DebtSnapshot)
+class DebtSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("license_plate", "renavam", "debt_option", "searched_at")
+    search_fields = ("license_plate", "renavam")
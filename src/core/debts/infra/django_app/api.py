@@ -1,20 +1,270 @@
-from dataclasses import asdict, dataclass
-from typing import Callable
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.debts.application.dto import SearchDebtsInput
-from core.debts.application.SP.use_case import SearchcDebtsUseCase
+from core.debts import metrics
+from core.debts.application.dto import DebtOutputMapper, FleetDebtsOutput
+from core.debts.application.SP.services.cache import ResponseCache
+from core.debts.application.SP.services.exceptions import (
+    DetranSPException,
+    IncompleteSearchException,
+    VehicleNotFoundException,
+)
+from core.debts.application.SP.services.limiter import ConcurrencyLimiter
+from core.debts.application.SP.services.resilience import CircuitBreaker, Resilience
+from core.debts.application.SP.services.singleflight import SingleFlight
+from core.debts.application.SP.use_case import (
+    SearchcDebtsUseCase,
+    SearchFleetDebtsUseCase,
+)
+
+from .renderers import DebtsJSONRenderer, dumps
+from .validators import invalid_vehicle, search_validator
+
+# debts_circuit_breaker_state: 0 fechado, 1 meio-aberto, 2 aberto
+BREAKER_STATES = {
+    CircuitBreaker.CLOSED: 0,
+    CircuitBreaker.HALF_OPEN: 1,
+    CircuitBreaker.OPEN: 2,
+}
+
+
+def search_error(exc: DetranSPException) -> Tuple[Dict, int]:
+    """
+    Corpo e status da resposta de uma busca que falhou: 404 para veículo não
+    encontrado e 503 para o webservice sobrecarregado, indisponível ou que
+    não respondeu todas as consultas (com os débitos encontrados, que não
+    são a lista completa).
+    """
+    if isinstance(exc, VehicleNotFoundException):
+        return {"error": str(exc)}, 404
+    if isinstance(exc, IncompleteSearchException):
+        return {
+            "error": str(exc),
+            "failures": exc.failures,
+            "debts_list": [DebtOutputMapper.to_dict(d) for d in exc.debts_list],
+        }, 503
+    return {"error": str(exc)}, 503
 
 
 @dataclass(slots=True)
 class DebtResource(APIView):
     use_case_search_debts_SP: Callable[[], SearchcDebtsUseCase]
 
+    def get_renderers(self):
+        if settings.DEBTS.get("fast_renderer"):
+            return [DebtsJSONRenderer()]
+        # slots=True recria a classe e quebra o super() sem argumentos
+        return APIView.get_renderers(self)
+
+    @metrics.timed("debts_view_seconds", view="DebtResource")
+    def get(self, request: Request):
+        validator = search_validator()
+        if not validator.validate(request.query_params.dict()):
+            return Response({"errors": validator.errors}, status=400)
+        input_param = validator.input_param
+
+        try:
+            output = next(self.use_case_search_debts_SP().execute(input_param))
+        except DetranSPException as exc:
+            return Response(*search_error(exc))
+        if isinstance(request.accepted_renderer, DebtsJSONRenderer):
+            return Response(output)
+        # asdict quebra nos *Output com campos removidos (ex.: `installment`)
+        return Response(
+            {
+                "debts_list": [DebtOutputMapper.to_dict(d) for d in output.debts_list],
+                "invalid_records": [
+                    DebtOutputMapper.to_dict(r) for r in output.invalid_records
+                ],
+            }
+        )
+
+
+@dataclass(slots=True)
+class AsyncDebtResource(View):
+    """
+    Busca de débitos assíncrona, para ser servida via ASGI.
+    """
+
+    use_case_search_debts_SP: Callable[[], SearchcDebtsUseCase]
+
+    async def get(self, request: HttpRequest):
+        validator = search_validator()
+        if not validator.validate(request.GET.dict()):
+            return JsonResponse({"errors": validator.errors}, status=400)
+        input_param = validator.input_param
+
+        try:
+            output = await anext(self.use_case_search_debts_SP().aexecute(input_param))
+        except DetranSPException as exc:
+            body, status = search_error(exc)
+            return JsonResponse(body, status=status)
+        return HttpResponse(dumps(output), content_type="application/json")
+
+
+@dataclass(slots=True)
+class DebtStreamResource(APIView):
+    """
+    Busca de débitos em NDJSON: cada débito é escrito numa linha assim que o
+    parser o formata, sem montar a lista completa em memória. Um registro
+    inválido do webservice sai na sua linha como `DebtRecordError`
+    (`category`, `index`, `record` e `errors`).
+
+    Erros depois do início da resposta (ex.: a conexão com o webservice caiu
+    no meio do corpo) não podem mais mudar o status: a resposta termina com
+    uma linha `{"error": ...}` e os débitos anteriores a ela são parciais.
+    """
+
+    use_case_search_debts_SP: Callable[[], SearchcDebtsUseCase]
+
     def get(self, request: Request):
-        input_param = SearchDebtsInput(**request.query_params.dict())
+        validator = search_validator()
+        if not validator.validate(request.query_params.dict()):
+            return Response({"errors": validator.errors}, status=400)
+        input_param = validator.input_param
+
+        try:
+            debts = self.use_case_search_debts_SP().stream(input_param)
+        except DetranSPException as exc:
+            return Response(*search_error(exc))
+        return StreamingHttpResponse(
+            self._ndjson(debts), content_type="application/x-ndjson"
+        )
+
+    @staticmethod
+    def _ndjson(debts: Iterable[object]) -> Iterable[bytes]:
+        try:
+            for debt in debts:
+                yield dumps(debt) + b"\n"
+        except DetranSPException as exc:
+            yield dumps({"error": str(exc)}) + b"\n"
+
+
+@dataclass(slots=True)
+class FleetDebtResource(APIView):
+    """
+    Busca em lote: recebe `{"vehicles": [{"license_plate", "renavam",
+    "debt_option"}, ...]}` e devolve uma linha NDJSON por veículo assim que
+    a sua busca termina. Veículos inválidos ou com erro são reportados na
+    própria linha.
+    """
+
+    use_case_search_fleet_debts_SP: Callable[[], SearchFleetDebtsUseCase]
+
+    def post(self, request: Request):
+        vehicles = (
+            request.data.get("vehicles") if isinstance(request.data, dict) else None
+        )
+        max_vehicles = settings.DEBTS["fleet"]["max_vehicles"]
+
+        if not isinstance(vehicles, list) or not vehicles:
+            return Response({"error": "informe a lista 'vehicles'"}, status=400)
+        if len(vehicles) > max_vehicles:
+            return Response(
+                {"error": f"máximo de {max_vehicles} veículos por requisição"},
+                status=400,
+            )
+
+        inputs, errors = [], []
+        for index, vehicle in enumerate(vehicles):
+            validator = search_validator()
+            if not isinstance(vehicle, dict):
+                errors.append(
+                    invalid_vehicle(index, {}, {"vehicle": ["objeto esperado"]})
+                )
+            elif validator.validate(vehicle):
+                inputs.append((index, validator.input_param))
+            else:
+                errors.append(invalid_vehicle(index, vehicle, validator.errors))
+
+        results = self.use_case_search_fleet_debts_SP().execute(inputs)
+        return StreamingHttpResponse(
+            self._ndjson(chain(errors, results)), content_type="application/x-ndjson"
+        )
+
+    @staticmethod
+    def _ndjson(results: Iterable[FleetDebtsOutput]) -> Iterable[bytes]:
+        for result in results:
+            yield dumps(result) + b"\n"
+
+
+@dataclass(slots=True)
+class MetricsResource(View):
+    """
+    Tempos das etapas da busca no formato de texto do Prometheus, junto com
+    os contadores e o estado do single flight, do cache de respostas, das
+    repetições e circuit breakers e do limitador de consultas.
+    """
+
+    single_flight: Optional[Callable[[], SingleFlight]] = None
+    response_cache: Optional[Callable[[], Optional[ResponseCache]]] = None
+    resilience: Optional[Callable[[], Resilience]] = None
+    limiter: Optional[Callable[[], ConcurrencyLimiter]] = None
+
+    def get(self, request: HttpRequest):
+        return HttpResponse(
+            metrics.get_sink().to_prometheus()
+            + metrics.samples_to_prometheus(self._samples()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    def _samples(self) -> List[metrics.Sample]:
+        samples: List[metrics.Sample] = []
+
+        if self.single_flight is not None:
+            stats = self.single_flight().stats()
+            samples += [
+                (
+                    "debts_single_flight_coalesced_total",
+                    "counter",
+                    (),
+                    stats["coalesced"],
+                ),
+                ("debts_single_flight_in_flight", "gauge", (), stats["in_flight"]),
+            ]
+
+        cache = self.response_cache() if self.response_cache is not None else None
+        if cache is not None:
+            stats = cache.stats()
+            samples += [
+                ("debts_response_cache_hits_total", "counter", (), stats["hits"]),
+                ("debts_response_cache_misses_total", "counter", (), stats["misses"]),
+            ]
+
+        if self.resilience is not None:
+            stats = self.resilience().stats()
+            for consultation, retries in stats["retries"].items():
+                labels = (("consultation", consultation),)
+                samples.append(
+                    ("debts_upstream_retries_total", "counter", labels, retries)
+                )
+            for consultation, breaker in stats["breakers"].items():
+                labels = (("consultation", consultation),)
+                state = BREAKER_STATES[breaker["state"]]
+                samples += [
+                    ("debts_circuit_breaker_state", "gauge", labels, state),
+                    (
+                        "debts_circuit_breaker_failures",
+                        "gauge",
+                        labels,
+                        breaker["failures"],
+                    ),
+                ]
+
+        if self.limiter is not None:
+            stats = self.limiter().stats()
+            samples += [
+                ("debts_limiter_limit", "gauge", (), stats["limit"]),
+                ("debts_limiter_in_flight", "gauge", (), stats["in_flight"]),
+                ("debts_limiter_rejected_total", "counter", (), stats["rejected"]),
+            ]
 
-        output = next(self.use_case_search_debts_SP().execute(input_param))
-        return Response(asdict(output))
+        return samples
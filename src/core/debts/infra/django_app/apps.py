@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class DjangoAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core.debts.infra.django_app"
+
+    def ready(self):
+        from django.conf import settings
+
+        from core.debts import metrics
+        from django_app.container import container
+
+        container.config.from_dict(settings.DEBTS)
+        metrics.set_sink(container.metrics_sink())
@@ -0,0 +1,213 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.debts.application.dto import (
+    DebtOutputMapper,
+    FleetDebtsOutput,
+    SearchDebtsInput,
+    SearchDebtsOutput,
+    SearchDebtsOutputMapper,
+)
+from core.debts.infra.django_app.renderers import dumps
+from core.debts.infra.django_app.validators import (
+    ALLOWED_FIELDS,
+    invalid_vehicle,
+    search_validator,
+)
+from django_app.container import container
+
+FSYNC_EVERY = 100
+
+
+def search_in_process(input_param: SearchDebtsInput) -> SearchDebtsOutput:
+    """
+    Busca executada num processo filho; os débitos voltam como dict para
+    serem serializados entre processos.
+    """
+    output = container.use_case_search_debts_sp().search(input_param)
+    return SearchDebtsOutputMapper.to_output(
+        [DebtOutputMapper.to_dict(debt) for debt in output.debts_list],
+        output.invalid_records,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Busca os débitos de uma lista de veículos (CSV ou JSONL) e grava os "
+        "resultados em JSONL, um veículo por linha. O próprio arquivo de saída "
+        "é o checkpoint: com --resume, veículos já gravados são ignorados. "
+        "Com --save, os débitos também são gravados no banco, em lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", type=Path)
+        parser.add_argument("output", type=Path)
+        parser.add_argument("--format", choices=["csv", "jsonl"])
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument(
+            "--executor", choices=["thread", "process"], default="thread"
+        )
+        parser.add_argument("--resume", action="store_true")
+        parser.add_argument("--save", action="store_true")
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, **options):
+        input_path: Path = options["input"]
+        output_path: Path = options["output"]
+        input_format = options["format"] or input_path.suffix.lstrip(".").lower()
+
+        if input_format not in ("csv", "jsonl"):
+            raise CommandError("formato de entrada deve ser csv ou jsonl")
+        if not input_path.exists():
+            raise CommandError(f"arquivo {input_path} não encontrado")
+
+        done = self._checkpoint(output_path) if options["resume"] else set()
+        if not options["resume"]:
+            output_path.write_bytes(b"")
+
+        use_case = container.use_case_search_fleet_debts_sp(
+            max_workers=options["workers"],
+            **(
+                {
+                    "executor_class": ProcessPoolExecutor,
+                    "search_function": search_in_process,
+                }
+                if options["executor"] == "process"
+                else {"executor_class": ThreadPoolExecutor}
+            ),
+        )
+
+        writer = None
+        if options["save"]:
+            writer = (
+                container.debts_writer(batch_size=options["batch_size"])
+                if options["batch_size"]
+                else container.debts_writer()
+            )
+
+        processed = errors = 0
+        invalid: List[FleetDebtsOutput] = []
+        # com --save, um veículo só entra no checkpoint depois que o lote com
+        # os seus débitos foi gravado no banco
+        pending: List[FleetDebtsOutput] = []
+        started_at = time.monotonic()
+        with output_path.open("ab") as output:
+            vehicles = self._read(input_path, input_format, done, invalid)
+            for result in self._with_invalid(use_case.execute(vehicles), invalid):
+                pending.append(result)
+                errors += result.error is not None
+                if writer is not None:
+                    writer.add(result)
+                    if writer.pending:
+                        continue
+
+                for saved in pending:
+                    output.write(dumps(saved) + b"\n")
+                    processed += 1
+                    if processed % FSYNC_EVERY == 0:
+                        output.flush()
+                        os.fsync(output.fileno())
+                output.flush()
+                pending.clear()
+
+            if writer is not None:
+                writer.flush()
+            output.writelines(dumps(saved) + b"\n" for saved in pending)
+            processed += len(pending)
+            output.flush()
+            os.fsync(output.fileno())
+
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(
+            f"veículos: {processed} (ignorados: {len(done)}), erros: {errors}, "
+            f"tempo: {elapsed:.2f}s, "
+            f"{processed / elapsed if elapsed else 0:.1f} veículos/s"
+        )
+
+    def _read(
+        self,
+        path: Path,
+        input_format: str,
+        done: Set[int],
+        invalid: List[FleetDebtsOutput],
+    ) -> Iterator[Tuple[int, SearchDebtsInput]]:
+        """
+        Veículos válidos da entrada. Linhas ilegíveis ou inválidas não
+        interrompem a leitura: viram linhas de erro em `invalid`.
+        """
+        validator = search_validator()
+        with path.open(newline="") as file:
+            records: Iterable = (
+                csv.DictReader(file)
+                if input_format == "csv"
+                else (line for line in file if line.strip())
+            )
+            for index, record in enumerate(records):
+                if index in done:
+                    continue
+
+                record, errors = self._record(record)
+                if errors:
+                    invalid.append(invalid_vehicle(index, record, errors))
+                elif validator.validate(record):
+                    yield index, validator.input_param
+                else:
+                    invalid.append(invalid_vehicle(index, record, validator.errors))
+
+    @staticmethod
+    def _record(record) -> Tuple[Dict, Optional[Dict[str, List[str]]]]:
+        """
+        Campos conhecidos de uma linha (dict do CSV ou texto do JSONL) e os
+        erros que impedem a validação; demais colunas são ignoradas.
+        """
+        if isinstance(record, str):
+            try:
+                record = json.loads(record)
+            except ValueError:
+                return {}, {"line": ["JSON inválido"]}
+        if not isinstance(record, dict):
+            return {}, {"vehicle": ["objeto esperado"]}
+        if None in record:
+            # linha do CSV com mais valores que o cabeçalho
+            return {}, {"line": ["colunas a mais"]}
+
+        return {
+            name: value for name, value in record.items() if name in ALLOWED_FIELDS
+        }, None
+
+    @staticmethod
+    def _with_invalid(
+        results: Iterable[FleetDebtsOutput], invalid: List[FleetDebtsOutput]
+    ) -> Iterator[FleetDebtsOutput]:
+        """
+        Intercala os resultados das buscas com as linhas de erro que a
+        leitura acumulou até ali.
+        """
+        for result in results:
+            yield from invalid
+            invalid.clear()
+            yield result
+        yield from invalid
+        invalid.clear()
+
+    def _checkpoint(self, path: Path) -> Set[int]:
+        """
+        Índices já gravados na saída; uma última linha incompleta (queda no
+        meio da escrita) é descartada.
+        """
+        if not path.exists():
+            return set()
+
+        content = path.read_bytes()
+        complete = content[: content.rfind(b"\n") + 1]
+        if len(complete) != len(content):
+            path.write_bytes(complete)
+
+        return {json.loads(line)["index"] for line in complete.splitlines() if line}
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DebtSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("license_plate", models.CharField(max_length=8)),
+                ("renavam", models.CharField(max_length=11)),
+                (
+                    "debt_option",
+                    models.CharField(blank=True, default="", max_length=16),
+                ),
+                ("debts", models.JSONField(default=list)),
+                ("changes", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("searched_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "license_plate",
+                            "renavam",
+                            "debt_option",
+                            "-searched_at",
+                        ],
+                        name="debt_snapshot_vehicle_idx",
+                    )
+                ],
+            },
+        ),
+    ]
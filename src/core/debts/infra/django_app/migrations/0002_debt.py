@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_app", "0001_debt_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Debt",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("license_plate", models.CharField(max_length=8)),
+                ("renavam", models.CharField(max_length=11)),
+                ("type", models.CharField(max_length=16)),
+                ("key", models.CharField(max_length=64)),
+                ("amount", models.FloatField()),
+                ("title", models.CharField(blank=True, default="", max_length=128)),
+                ("description", models.TextField(blank=True, default="")),
+                ("year", models.IntegerField(null=True)),
+                ("installment", models.CharField(max_length=16, null=True)),
+                (
+                    "auto_infraction",
+                    models.CharField(blank=True, default="", max_length=32),
+                ),
+                ("updated_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="debt",
+            constraint=models.UniqueConstraint(
+                fields=("license_plate", "renavam", "type", "key"),
+                name="debt_vehicle_key_unique",
+            ),
+        ),
+    ]
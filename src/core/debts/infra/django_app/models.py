@@ -1,3 +1,60 @@
 from django.db import models
 
-# Create your models here.
+
+class DebtSnapshot(models.Model):
+    """
+    Resultado de uma busca de débitos. Uma nova linha só é criada quando os
+    débitos mudam; buscas sem mudança apenas atualizam `searched_at`.
+    """
+
+    license_plate = models.CharField(max_length=8)
+    renavam = models.CharField(max_length=11)
+    debt_option = models.CharField(max_length=16, blank=True, default="")
+    debts = models.JSONField(default=list)
+    # mudanças em relação à linha anterior do mesmo veículo: new, paid, changed
+    changes = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    searched_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["license_plate", "renavam", "debt_option", "-searched_at"],
+                name="debt_snapshot_vehicle_idx",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.license_plate}/{self.renavam} {self.searched_at:%Y-%m-%d %H:%M}"
+
+
+class Debt(models.Model):
+    """
+    Débito em aberto de um veículo, gravado em lote pelo `DjangoDebtWriter`;
+    os que somem da última busca completa do veículo (quitados) são
+    apagados. `key` identifica o débito entre buscas (AIIP da multa,
+    exercício e cota do IPVA, exercício do DPVAT e do licenciamento).
+    """
+
+    license_plate = models.CharField(max_length=8)
+    renavam = models.CharField(max_length=11)
+    type = models.CharField(max_length=16)
+    key = models.CharField(max_length=64)
+    amount = models.FloatField()
+    title = models.CharField(max_length=128, blank=True, default="")
+    description = models.TextField(blank=True, default="")
+    year = models.IntegerField(null=True)
+    installment = models.CharField(max_length=16, null=True)
+    auto_infraction = models.CharField(max_length=32, blank=True, default="")
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["license_plate", "renavam", "type", "key"],
+                name="debt_vehicle_key_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.license_plate}/{self.renavam} {self.type} {self.key}"
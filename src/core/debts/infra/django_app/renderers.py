@@ -0,0 +1,51 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from core.debts import metrics
+from core.debts.application.dto import DebtOutputMapper
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    """
+    Serializa dicts, listas e os *Output (dataclasses com slots) sem passar
+    por `asdict`. Usa o orjson quando instalado e o `json` da stdlib caso
+    contrário.
+    """
+    if orjson is not None:
+        # OPT_PASSTHROUGH_DATACLASS: os campos removidos (ex.: `installment`)
+        # precisam passar pelo `to_dict`.
+        return orjson.dumps(
+            data,
+            default=DebtOutputMapper.to_dict,
+            option=orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+
+    return json.dumps(
+        data,
+        default=DebtOutputMapper.to_dict,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class DebtsJSONRenderer(BaseRenderer):
+    """
+    Renderer da rota de débitos, habilitado com
+    `settings.DEBTS["fast_renderer"]`.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    @metrics.timed("debts_render_seconds", renderer="DebtsJSONRenderer")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.debts.application.snapshots import DebtsDiff, DebtSnapshotStore, diff_debts
+
+
+class DjangoDebtSnapshotStore(DebtSnapshotStore):
+    """
+    Snapshots no banco (`DebtSnapshot`). Resultados com menos de `max_age`
+    segundos são servidos sem consultar o webservice.
+    """
+
+    def __init__(self, max_age: float = 300) -> None:
+        self.max_age = max_age
+
+    def fresh(
+        self, license_plate: str, renavam: str, debt_option: str
+    ) -> Optional[List[Dict]]:
+        if not self.max_age:
+            return None
+
+        snapshot = (
+            self._snapshots(license_plate, renavam, debt_option)
+            .filter(searched_at__gte=timezone.now() - timedelta(seconds=self.max_age))
+            .only("debts")
+            .first()
+        )
+        return None if snapshot is None else snapshot.debts
+
+    def save(
+        self, license_plate: str, renavam: str, debt_option: str, debts: List[Dict]
+    ) -> DebtsDiff:
+        from .models import DebtSnapshot
+
+        now = timezone.now()
+        with transaction.atomic():
+            last = self._snapshots(license_plate, renavam, debt_option).first()
+            diff = diff_debts([] if last is None else last.debts, debts)
+
+            if last is not None and not diff:
+                last.searched_at = now
+                last.save(update_fields=["searched_at"])
+            else:
+                DebtSnapshot.objects.create(
+                    license_plate=self._plate(license_plate),
+                    renavam=renavam.strip(),
+                    debt_option=debt_option,
+                    debts=debts,
+                    changes=diff.to_dict(),
+                    searched_at=now,
+                )
+        return diff
+
+    def history(self, license_plate: str, renavam: str, debt_option: str = ""):
+        """
+        Snapshots do veículo, do mais recente ao mais antigo.
+        """
+        return self._snapshots(license_plate, renavam, debt_option)
+
+    def _snapshots(self, license_plate: str, renavam: str, debt_option: str):
+        # import tardio: o container é importado antes do Django estar pronto
+        from .models import DebtSnapshot
+
+        return DebtSnapshot.objects.filter(
+            license_plate=self._plate(license_plate),
+            renavam=renavam.strip(),
+            debt_option=debt_option,
+        ).order_by("-searched_at")
+
+    @staticmethod
+    def _plate(license_plate: str) -> str:
+        return license_plate.strip().upper()
@@ -2,7 +2,13 @@ from django.urls import path
 
 from django_app.container import container
 
-from .api import DebtResource
+from .api import (
+    AsyncDebtResource,
+    DebtResource,
+    DebtStreamResource,
+    FleetDebtResource,
+    MetricsResource,
+)
 
 urlpatterns = [
     path(
@@ -10,5 +16,32 @@ urlpatterns = [
         DebtResource.as_view(
             use_case_search_debts_SP=container.use_case_search_debts_sp,
         ),
-    )
+    ),
+    path(
+        "debts/stream/",
+        DebtStreamResource.as_view(
+            use_case_search_debts_SP=container.use_case_search_debts_sp,
+        ),
+    ),
+    path(
+        "debts/bulk/",
+        FleetDebtResource.as_view(
+            use_case_search_fleet_debts_SP=container.use_case_search_fleet_debts_sp,
+        ),
+    ),
+    path(
+        "async/debts/",
+        AsyncDebtResource.as_view(
+            use_case_search_debts_SP=container.use_case_search_debts_sp,
+        ),
+    ),
+    path(
+        "metrics/",
+        MetricsResource.as_view(
+            single_flight=container.detran_SP_single_flight,
+            response_cache=container.detran_SP_response_cache,
+            resilience=container.detran_SP_resilience,
+            limiter=container.detran_SP_limiter,
+        ),
+    ),
 ]
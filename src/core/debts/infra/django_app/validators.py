@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Dict, List, Mapping
+
+from django.conf import settings
+
+from core.debts.application.dto import FleetDebtsOutput, SearchDebtsInput
+from core.debts.application.SP.services.service import DEBT_OPTIONS
+from core.debts.domain.exceptions import InvalidLicensePlateException
+from core.debts.domain.license_plate import normalize_license_plate
+from core.debts.domain.renavam import is_valid_renavam
+
+REQUIRED_FIELDS = ("license_plate", "renavam")
+ALLOWED_FIELDS = frozenset(REQUIRED_FIELDS + ("debt_option",))
+ALLOWED_DEBT_OPTIONS = frozenset(DEBT_OPTIONS) | {""}
+
+DEBT_OPTION_ERROR = "opção inválida; use " + ", ".join(sorted(DEBT_OPTIONS))
+
+
+@dataclass(slots=True)
+class SearchDebtsValidator:
+    """
+    Valida os parâmetros de uma busca antes de qualquer consulta: campos
+    conhecidos, formato da placa, RENAVAM (11 dígitos e, com
+    `check_renavam_digit`, o dígito verificador) e `debt_option`.
+
+    Segue a interface do `ValidatorInterface`: `validate` retorna se os
+    dados são válidos e preenche `errors` ou `input_param` (com a placa já
+    normalizada).
+    """
+
+    check_renavam_digit: bool = True
+    errors: Dict[str, List[str]] = None
+    input_param: SearchDebtsInput = None
+
+    def validate(self, data: Mapping) -> bool:
+        errors: Dict[str, List[str]] = {}
+
+        for name in sorted(data.keys() - ALLOWED_FIELDS):
+            errors[name] = ["parâmetro desconhecido"]
+        for name in REQUIRED_FIELDS:
+            if not data.get(name):
+                errors[name] = ["campo obrigatório"]
+
+        license_plate = data.get("license_plate")
+        if license_plate and "license_plate" not in errors:
+            try:
+                license_plate = normalize_license_plate(license_plate)
+            except (InvalidLicensePlateException, TypeError):
+                errors["license_plate"] = ["placa inválida"]
+
+        renavam = data.get("renavam")
+        if renavam and not self._valid_renavam(renavam):
+            errors["renavam"] = ["RENAVAM inválido"]
+
+        debt_option = data.get("debt_option") or ""
+        if not isinstance(debt_option, str) or debt_option not in ALLOWED_DEBT_OPTIONS:
+            errors["debt_option"] = [DEBT_OPTION_ERROR]
+
+        if errors:
+            self.errors = errors
+            return False
+
+        self.errors = None
+        self.input_param = SearchDebtsInput(
+            license_plate=license_plate, renavam=renavam, debt_option=debt_option
+        )
+        return True
+
+    def _valid_renavam(self, renavam) -> bool:
+        if not isinstance(renavam, str):
+            return False
+        if self.check_renavam_digit:
+            return is_valid_renavam(renavam)
+        return len(renavam) == 11 and renavam.isdigit()
+
+
+def search_validator() -> SearchDebtsValidator:
+    """
+    Validador das buscas conforme `settings.DEBTS`: o dígito verificador do
+    RENAVAM não é conferido com o backend "stub" (RENAVAM fictício).
+    """
+    return SearchDebtsValidator(
+        check_renavam_digit=settings.DEBTS["validation"]["renavam_check_digit"]
+        and settings.DEBTS["detran_api"]["backend"] != "stub"
+    )
+
+
+def invalid_vehicle(
+    index: int, vehicle: Mapping, errors: Dict[str, List[str]]
+) -> FleetDebtsOutput:
+    """
+    Linha de erro de um veículo inválido numa busca em lote, repetindo os
+    dados enviados que sejam texto para que o veículo seja identificado.
+    """
+    submitted = {
+        name: value
+        for name in ALLOWED_FIELDS
+        if isinstance(value := vehicle.get(name), str)
+    }
+    return FleetDebtsOutput(
+        index=index,
+        license_plate=submitted.get("license_plate"),
+        renavam=submitted.get("renavam"),
+        debt_option=submitted.get("debt_option", ""),
+        error="veículo inválido",
+        errors=errors,
+    )
@@ -0,0 +1,165 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.debts.application.dto import DebtOutputMapper, FleetDebtsOutput
+from core.debts.application.snapshots import debt_identity
+
+UNIQUE_FIELDS = ["license_plate", "renavam", "type", "key"]
+UPDATE_FIELDS = [
+    "amount",
+    "title",
+    "description",
+    "year",
+    "installment",
+    "auto_infraction",
+    "updated_at",
+]
+
+
+# tipos de débito que cada `debt_option` consulta
+DEBT_TYPES = {
+    "": ("ticket", "ipva", "insurance", "licensing"),
+    "ticket": ("ticket",),
+    "ipva": ("ipva",),
+    "dpvat": ("insurance",),
+    "licensing": ("licensing",),
+}
+
+
+class DjangoDebtWriter:
+    """
+    Grava os débitos das buscas em lote no modelo `Debt`: as linhas são
+    acumuladas e gravadas a cada `batch_size` com um único
+    `bulk_create(update_conflicts=True)` (upsert), em vez de uma query por
+    débito.
+
+    Cada busca bem-sucedida é a lista completa dos débitos em aberto do
+    veículo (nos tipos que ela consultou): na mesma transação do upsert, os
+    débitos gravados antes que não aparecem mais nela são apagados. Buscas
+    com erro, incompletas ou com registros inválidos não alteram nada.
+    """
+
+    def __init__(self, batch_size: int = 500) -> None:
+        self.batch_size = batch_size
+        self.written = 0
+        self.deleted = 0
+        self._rows: Dict[Tuple, object] = {}
+        # (placa, renavam) -> {tipo: chaves da última busca}
+        self._vehicles: Dict[Tuple[str, str], Dict[str, Set[str]]] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows) + len(self._vehicles)
+
+    def add(self, result: FleetDebtsOutput) -> None:
+        """
+        Acumula os débitos de um veículo, gravando o lote quando ele enche.
+        Resultados com erro ou com registros inválidos (lista incompleta)
+        são ignorados.
+        """
+        if (
+            result.error is not None
+            or result.debts_list is None
+            or result.invalid_records
+        ):
+            return
+
+        vehicle = self.vehicle(result.license_plate, result.renavam)
+        keys = {debt_type: set() for debt_type in DEBT_TYPES[result.debt_option or ""]}
+        for row in self.rows(result.license_plate, result.renavam, result.debts_list):
+            keys.setdefault(row.type, set()).add(row.key)
+            # o mesmo débito duas vezes no lote: vale o último
+            self._rows[tuple(getattr(row, name) for name in UNIQUE_FIELDS)] = row
+        self._vehicles.setdefault(vehicle, {}).update(keys)
+
+        # só grava entre veículos, para não apagar débitos ainda no lote
+        if max(len(self._rows), len(self._vehicles)) >= self.batch_size:
+            self.flush()
+
+    def write(self, results: Iterable[FleetDebtsOutput]) -> int:
+        """
+        Grava todos os `results` e retorna o total de linhas gravadas.
+        """
+        for result in results:
+            self.add(result)
+        self.flush()
+        return self.written
+
+    def flush(self) -> None:
+        from .models import Debt
+
+        if not self.pending:
+            return
+
+        rows, self._rows = list(self._rows.values()), {}
+        vehicles, self._vehicles = self._vehicles, {}
+        with transaction.atomic():
+            if rows:
+                Debt.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=UNIQUE_FIELDS,
+                    update_fields=UPDATE_FIELDS,
+                )
+            self.deleted += self._delete_missing(vehicles)
+        self.written += len(rows)
+
+    @staticmethod
+    def _delete_missing(vehicles: Dict[Tuple[str, str], Dict[str, Set[str]]]) -> int:
+        """
+        Apaga os débitos dos `vehicles` que não estão nas suas últimas buscas.
+        """
+        from .models import Debt
+
+        existing = Debt.objects.filter(
+            license_plate__in={plate for plate, _ in vehicles}
+        ).values_list("pk", "license_plate", "renavam", "type", "key")
+        missing = [
+            pk
+            for pk, plate, renavam, debt_type, key in existing
+            if debt_type in (keys := vehicles.get((plate, renavam), {}))
+            and key not in keys[debt_type]
+        ]
+        if missing:
+            Debt.objects.filter(pk__in=missing).delete()
+        return len(missing)
+
+    @staticmethod
+    def vehicle(license_plate: str, renavam: str) -> Tuple[str, str]:
+        return license_plate.strip().upper(), renavam.strip()
+
+    @staticmethod
+    def rows(license_plate: str, renavam: str, debts: Iterable[object]) -> List:
+        """
+        Instâncias (não salvas) de `Debt` para os débitos de um veículo
+        (*Output ou dict).
+        """
+        from .models import Debt
+
+        now = timezone.now()
+        plate, renavam = DjangoDebtWriter.vehicle(license_plate, renavam)
+        rows = []
+        for debt in debts:
+            fields = DebtOutputMapper.to_dict(debt)
+            installment = fields.get("installment")
+            rows.append(
+                Debt(
+                    license_plate=plate,
+                    renavam=renavam,
+                    type=fields["type"],
+                    key=":".join(
+                        "" if value is None else str(value)
+                        for value in debt_identity(fields)[1:]
+                    ),
+                    amount=fields["amount"],
+                    title=fields.get("title") or "",
+                    description=fields.get("description") or "",
+                    year=fields.get("year"),
+                    installment=None if installment is None else str(installment),
+                    auto_infraction=fields.get("auto_infraction") or "",
+                    updated_at=now,
+                )
+            )
+        return rows
@@ -0,0 +1,236 @@
+"""
+Tempos de cada etapa da busca de débitos (webservice, parser, validação,
+mappers, view e renderer) registrados como histogramas num sink plugável.
+
+Por padrão o sink é o `NullSink`, desligado: as funções instrumentadas só
+conferem `sink.enabled` e seguem direto, sem medir nada.
+"""
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import wraps
+from inspect import isgeneratorfunction
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# (nome, tipo, labels, valor) de um counter ou gauge lido na hora da coleta
+Sample = Tuple[str, str, Labels, float]
+
+
+class MetricsSink(ABC):
+    enabled = True
+
+    @abstractmethod
+    def observe(self, name: str, seconds: float, labels: Labels = ()) -> None:
+        raise NotImplementedError()
+
+    def to_prometheus(self) -> str:
+        return ""
+
+
+class NullSink(MetricsSink):
+    enabled = False
+
+    def observe(self, name: str, seconds: float, labels: Labels = ()) -> None:
+        pass
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> Iterable[Tuple[str, int]]:
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield ("+Inf" if bound == float("inf") else repr(bound)), total
+
+
+class InMemorySink(MetricsSink):
+    """
+    Guarda um histograma por métrica e conjunto de labels, no processo.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, labels: Labels = ()) -> None:
+        with self._lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        return self.histograms[(name, tuple(sorted(labels.items())))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Formato de exposição em texto do Prometheus (versão 0.0.4).
+        """
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            lines: List[str] = []
+            name = None
+            for (metric, labels), histogram in histograms:
+                if metric != name:
+                    name = metric
+                    lines.append(f"# TYPE {name} histogram")
+                for bound, count in histogram.cumulative():
+                    lines.append(
+                        f"{name}_bucket{_labels(labels + (('le', bound),))} {count}"
+                    )
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum!r}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+_sink: MetricsSink = NullSink()
+
+
+def get_sink() -> MetricsSink:
+    return _sink
+
+
+def set_sink(sink: MetricsSink) -> None:
+    global _sink
+    _sink = sink
+
+
+class timer:
+    """
+    Mede o bloco `with` quando o sink está ligado:
+
+        with metrics.timer("debts_upstream_seconds", consultation=method):
+            ...
+    """
+
+    __slots__ = ("sink", "name", "labels", "started_at")
+
+    def __init__(self, name: str, **labels: str) -> None:
+        self.sink = _sink
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "timer":
+        if self.sink.enabled:
+            self.started_at = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.sink.enabled:
+            self.sink.observe(
+                self.name,
+                perf_counter() - self.started_at,
+                tuple(sorted(self.labels.items())),
+            )
+
+
+def timed(name: str, **labels: str) -> Callable:
+    """
+    Decorator que mede cada chamada da função. Em geradores soma só o tempo
+    gasto dentro do gerador, sem contar o consumidor, e registra quando o
+    gerador termina ou é fechado.
+    """
+    label_items = tuple(sorted(labels.items()))
+
+    def decorator(fn: Callable) -> Callable:
+        if isgeneratorfunction(fn):
+
+            @wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                sink = _sink
+                if not sink.enabled:
+                    return fn(*args, **kwargs)
+                return _timed_generator(sink, name, label_items, fn(*args, **kwargs))
+
+            return generator_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            sink = _sink
+            if not sink.enabled:
+                return fn(*args, **kwargs)
+            started_at = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                sink.observe(name, perf_counter() - started_at, label_items)
+
+        return wrapper
+
+    return decorator
+
+
+def _timed_generator(sink: MetricsSink, name: str, labels: Labels, generator):
+    elapsed = 0.0
+    try:
+        while True:
+            started_at = perf_counter()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += perf_counter() - started_at
+            yield item
+    finally:
+        generator.close()
+        sink.observe(name, elapsed, labels)
+
+
+def samples_to_prometheus(samples: Iterable[Sample]) -> str:
+    """
+    Counters e gauges (ex.: os `stats()` do cache e do single flight) no
+    mesmo formato de texto do `InMemorySink.to_prometheus`.
+    """
+    lines: List[str] = []
+    name = None
+    for metric, kind, labels, value in sorted(samples, key=lambda s: s[:3]):
+        if metric != name:
+            name = metric
+            lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name}{_labels(labels)} {value!r}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
@@ -0,0 +1,115 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.cache import InMemoryResponseCache
+from core.debts.application.SP.services.exceptions import VehicleNotFoundException
+
+
+@pytest.fixture
+def cache():
+    yield InMemoryResponseCache(maxsize=2)
+
+
+def test_cache_hits_and_misses(cache):
+    """
+    GIVEN um cache de respostas vazio
+    WHEN uma resposta for gravada e lida novamente
+    THEN a primeira leitura deve contar um miss e a segunda um hit.
+    """
+    assert cache.get("ABC1234", "11111111111", "ConsultaMultas") is None
+
+    cache.set("abc1234 ", "11111111111", "ConsultaMultas", {"Multas": {}})
+
+    assert cache.get("ABC1234", "11111111111", "ConsultaMultas") == {"Multas": {}}
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_cache_ttl_per_consultation(cache):
+    """
+    GIVEN TTLs diferentes por consulta
+    WHEN o TTL de uma consulta expirar
+    THEN apenas a resposta dessa consulta deve deixar o cache.
+    """
+    cache.ttls.update({"ConsultaMultas": 10, "ConsultaLicenciamento": 100})
+
+    with patch("time.monotonic", return_value=0):
+        cache.set("ABC1234", "11111111111", "ConsultaMultas", {"Multas": {}})
+        cache.set("ABC1234", "11111111111", "ConsultaLicenciamento", {"Exercicio": 1})
+
+    with patch("time.monotonic", return_value=50):
+        assert cache.get("ABC1234", "11111111111", "ConsultaMultas") is None
+        assert cache.get("ABC1234", "11111111111", "ConsultaLicenciamento")
+
+
+def test_cache_lru_eviction(cache):
+    """
+    GIVEN um cache com limite de 2 entradas
+    WHEN uma terceira entrada for gravada
+    THEN a entrada usada há mais tempo deve ser descartada.
+    """
+    cache.set("AAA1111", "1", "ConsultaIPVA", {"IPVAs": 1})
+    cache.set("BBB2222", "2", "ConsultaIPVA", {"IPVAs": 2})
+    cache.get("AAA1111", "1", "ConsultaIPVA")
+    cache.set("CCC3333", "3", "ConsultaIPVA", {"IPVAs": 3})
+
+    assert len(cache) == 2
+    assert cache.get("BBB2222", "2", "ConsultaIPVA") is None
+    assert cache.get("AAA1111", "1", "ConsultaIPVA") == {"IPVAs": 1}
+
+
+def test_service_uses_cache(cache):
+    """
+    GIVEN um SPService com cache
+    WHEN a mesma consulta for feita duas vezes, com placa Mercosul e cinza
+    THEN o webservice deve ser chamado apenas uma vez.
+    """
+    sp_service = SPService(cache=cache)
+    sp_service._api = Mock(return_value=Mock(fetch=Mock(return_value={"Multas": {}})))
+
+    sp_service.execute(license_plate="ABC1C34", renavam="1", debt_option="ticket")
+    sp_service.execute(license_plate="ABC1234", renavam="1", debt_option="ticket")
+
+    assert sp_service._api.call_count == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_negative_cache(cache):
+    """
+    GIVEN um veículo não encontrado gravado no cache negativo
+    WHEN o TTL de veículo não encontrado expirar
+    THEN o veículo deve deixar o cache negativo, sem contar hits e misses.
+    """
+    with patch("time.monotonic", return_value=0):
+        cache.set_not_found("ZZZ9999", "11111111111")
+
+    with patch("time.monotonic", return_value=10):
+        assert cache.is_not_found("zzz9999", "11111111111")
+        assert not cache.is_not_found("ABC1234", "11111111111")
+
+    with patch("time.monotonic", return_value=31):
+        assert not cache.is_not_found("ZZZ9999", "11111111111")
+
+    assert cache.stats() == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_service_negative_cache(cache, concurrent):
+    """
+    GIVEN um veículo que o webservice não encontra
+    WHEN a mesma busca for repetida
+    THEN deve levantar VehicleNotFoundException sem consultar o webservice
+    de novo.
+    """
+    api_class = Mock(side_effect=VehicleNotFoundException())
+    calls = []
+
+    for _ in range(3):
+        service = SPService(cache=cache, api_class=api_class, concurrent=concurrent)
+        with pytest.raises(VehicleNotFoundException):
+            service.execute(license_plate="ZZZ9999", renavam="11111111111")
+        calls.append(api_class.call_count)
+
+    assert calls[0] >= 1
+    assert calls[0] == calls[1] == calls[2]
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.api import API
+from core.debts.application.SP.services.exceptions import DetranSPUnavailableException
+from core.debts.application.SP.services.http_api import HTTPAPI, ConnectionPool
+from core.debts.application.SP.services.json_stream import iter_json_records
+
+
+class DetranHandler(BaseHTTPRequestHandler):
+    """
+    Webservice falso que responde com os dados do `API` em memória.
+    """
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        type(self).connections += 1
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: value[0] for key, value in parse_qs(url.query).items()}
+        if query["placa"] == "ERR5030":
+            body, status = {"erro": "indisponível"}, 503
+        elif query["placa"] == "CUT1234":
+            body, status = self.consult(url, {**query, "placa": "ABC1234"})
+        else:
+            body, status = self.consult(url, query)
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if query["placa"] == "CUT1234":
+            # conexão cai no meio do corpo
+            self.wfile.write(payload[: len(payload) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+    def consult(self, url, query):
+        try:
+            body = API(
+                license_plate=query["placa"],
+                renavam=query["renavam"],
+                debt_option=url.path.rsplit("/", 1)[-1],
+            ).fetch()
+            return body, 200
+        except Exception as exc:
+            return {"erro": str(exc)}, 404
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pool():
+    DetranHandler.connections = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DetranHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    pool = ConnectionPool(f"http://127.0.0.1:{server.server_port}/sp", maxsize=2)
+    yield pool
+
+    pool.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_api_reuses_connections(pool):
+    """
+    GIVEN o webservice do Detran-SP acessado via HTTPAPI
+    WHEN várias consultas forem feitas
+    THEN as respostas devem ser iguais às do API
+    AND a mesma conexão deve ser reaproveitada.
+    """
+    sp_service = SPService(api_class=lambda **kwargs: HTTPAPI(**kwargs, pool=pool))
+
+    debts = [
+        sp_service.execute(license_plate="ABC1234", renavam="11111111111")
+        for _ in range(5)
+    ]
+
+    assert (
+        debts
+        == [SPService().execute(license_plate="ABC1234", renavam="11111111111")] * 5
+    )
+    assert pool.connections_created == 1
+    assert DetranHandler.connections == 1
+
+
+def test_http_api_vehicle_not_found(pool):
+    """
+    GIVEN o webservice do Detran-SP acessado via HTTPAPI
+    WHEN o veículo não existir
+    THEN deve lançar a mesma exceção do API.
+    """
+    with pytest.raises(Exception, match="veículo não encontrado"):
+        HTTPAPI("XYZ9999", "1", "ConsultaIPVA", pool=pool).fetch()
+
+
+def test_http_api_server_error_is_transient(pool):
+    """
+    GIVEN o webservice do Detran-SP acessado via HTTPAPI
+    WHEN o webservice responder com erro 5xx
+    THEN deve lançar uma exceção transitória, que pode ser repetida.
+    """
+    with pytest.raises(DetranSPUnavailableException, match="HTTP 503"):
+        HTTPAPI("ERR5030", "1", "ConsultaIPVA", pool=pool).fetch()
+
+
+def test_http_api_stream(pool):
+    """
+    GIVEN o webservice do Detran-SP acessado via HTTPAPI
+    WHEN as respostas forem lidas em streaming, até o fim ou não
+    THEN os registros devem ser os mesmos da resposta inteira
+    AND as conexões devem voltar ao pool.
+    """
+    api = HTTPAPI("ABC1234", "11111111111", "ConsultaMultas", pool=pool)
+
+    for _ in range(5):
+        records = list(iter_json_records(api.stream()))
+
+    assert [record for _, record in records] == api.fetch()["Multas"]["Multa"]
+    assert pool.connections_created == 1
+
+    for _ in range(5):
+        api.stream().close()
+    assert len(list(iter_json_records(api.stream()))) == 2
+    with pytest.raises(Exception, match="veículo não encontrado"):
+        HTTPAPI("XYZ9999", "1", "ConsultaIPVA", pool=pool).stream()
+
+
+def test_http_api_stream_connection_lost(pool):
+    """
+    GIVEN o webservice do Detran-SP acessado via HTTPAPI
+    WHEN a conexão cair no meio do corpo de uma resposta em streaming
+    THEN a leitura deve lançar uma exceção transitória
+    AND a conexão não deve voltar ao pool.
+    """
+    api = HTTPAPI("CUT1234", "11111111111", "ConsultaMultas", pool=pool)
+
+    with pytest.raises(DetranSPUnavailableException, match="erro de conexão"):
+        b"".join(api.stream())
+
+    HTTPAPI("ABC1234", "11111111111", "ConsultaMultas", pool=pool).fetch()
+    assert pool.connections_created == 2
+
+
+def test_http_api_afetch_uses_executor(pool):
+    """
+    GIVEN um HTTPAPI com executor próprio
+    WHEN consultas assíncronas forem feitas
+    THEN devem rodar nas threads desse executor, e não no executor padrão.
+    """
+    threads = set()
+
+    class RecordingHTTPAPI(HTTPAPI):
+        def fetch(self):
+            threads.add(threading.current_thread().name)
+            return super().fetch()
+
+    async def fetch_all(executor):
+        return await asyncio.gather(
+            *(
+                RecordingHTTPAPI(
+                    "ABC1234", "11111111111", debt_option, pool, executor=executor
+                ).afetch()
+                for debt_option in ("ConsultaMultas", "ConsultaIPVA") * 4
+            )
+        )
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="detran") as executor:
+        responses = asyncio.run(fetch_all(executor))
+
+    assert responses[0] == API("ABC1234", "11111111111", "ConsultaMultas").fetch()
+    assert len(threads) <= 2
+    assert all(name.startswith("detran") for name in threads)
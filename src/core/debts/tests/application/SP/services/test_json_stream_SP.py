@@ -0,0 +1,130 @@
+import json
+import tracemalloc
+
+import pytest
+
+from core.debts.application.dto import SPParserInput
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.api import API
+from core.debts.application.SP.services.json_stream import (
+    JSONStreamError,
+    iter_json_records,
+)
+from django_app.container import Container
+
+CONSULTATIONS = (
+    "ConsultaMultas",
+    "ConsultaIPVA",
+    "ConsultaDPVAT",
+    "ConsultaLicenciamento",
+)
+
+
+def chunked(body: bytes, size: int):
+    return (body[start:][:size] for start in range(0, len(body), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 100_000])
+@pytest.mark.parametrize("consultation", CONSULTATIONS)
+def test_records_match_json_loads(consultation, chunk_size):
+    """
+    GIVEN a resposta de uma consulta dividida em pedaços de qualquer tamanho
+    WHEN os registros forem lidos em streaming
+    THEN devem ser os mesmos débitos da resposta decodificada inteira.
+    """
+    response = API("ABC1234", "11111111111", consultation).fetch()
+    body = json.dumps(response, indent=2, ensure_ascii=False).encode()
+
+    records = list(iter_json_records(chunked(body, chunk_size)))
+
+    expected = [
+        (category, record)
+        for category, key in (
+            ("Multas", "Multa"),
+            ("IPVAs", "IPVA"),
+            ("DPVATs", "DPVAT"),
+        )
+        if category in response
+        for record in response[category][key]
+    ]
+    assert records == expected
+
+
+def test_split_tokens():
+    """
+    GIVEN números, textos com escape e caracteres multibyte quebrados entre
+    pedaços
+    WHEN os registros forem lidos em streaming
+    THEN os valores devem chegar inteiros.
+    """
+    chunks = [
+        b'{"Total": 12',
+        b'34, "Multas": {"Multa": [{"Valor": 1',
+        b'0, "AIIP": "a\\',
+        b'"b"}, {"DescricaoEnquadramento": "Sinaliza\xc3',
+        b'\xa7\xc3\xa3o"}]}, "Veiculo": [1e5, null, true]}',
+    ]
+
+    assert list(iter_json_records(chunks)) == [
+        ("Multas", {"Valor": 10, "AIIP": 'a"b'}),
+        ("Multas", {"DescricaoEnquadramento": "Sinalização"}),
+    ]
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"Multas": {"Multa": [{"Valor": 1}', b'{"Multas" 1}', b"{} []"]
+)
+def test_invalid_json(body):
+    """
+    GIVEN uma resposta truncada ou inválida
+    WHEN os registros forem lidos em streaming
+    THEN deve lançar erro de JSON.
+    """
+    with pytest.raises((JSONStreamError, json.JSONDecodeError)):
+        list(iter_json_records(chunked(body, 5)))
+
+
+def test_memory_is_bounded_by_one_record():
+    """
+    GIVEN uma resposta com dezenas de milhares de multas, gerada sob demanda
+    WHEN os registros forem lidos em streaming
+    THEN o pico de memória deve ser uma fração pequena do tamanho da resposta.
+    """
+    record = {"AIIP": "5E5E5E5E  ", "Valor": 20118, "DescricaoEnquadramento": "x" * 80}
+    count = 20_000
+
+    def body():
+        yield b'{"Multas": {"Multa": ['
+        for index in range(count):
+            yield (b"," if index else b"") + json.dumps(record).encode()
+        yield b'], "Servico": "Multas"}}'
+
+    size = sum(map(len, body()))
+    tracemalloc.start()
+    read = sum(1 for _ in iter_json_records(body()))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert read == count
+    assert size > 2_000_000
+    assert peak < 64 * 1024
+
+
+def test_stream_search():
+    """
+    GIVEN o serviço lendo as respostas em streaming
+    WHEN os débitos forem buscados e formatados
+    THEN devem ser os mesmos da busca com as respostas inteiras.
+    """
+    parser = Container().application_service_SPParser()
+    params = dict(license_plate="ABC1234", renavam="11111111111")
+
+    records = SPService().stream_records(**params)
+    response = SPService().execute(**params)
+
+    assert list(parser.iter_records_debts(records)) == parser.collect_all_debts(
+        SPParserInput(data=response)
+    )
+
+    with pytest.raises(Exception, match="veículo não encontrado"):
+        SPService().stream_records(license_plate="XYZ9999", renavam="1")
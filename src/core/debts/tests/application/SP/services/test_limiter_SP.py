@@ -0,0 +1,309 @@
+import asyncio
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.exceptions import (
+    DetranSPUnavailableException,
+    OverloadedException,
+)
+from core.debts.application.SP.services.limiter import AdaptiveLimit, ConcurrencyLimiter
+
+
+class SlowAPI:
+    """
+    API falsa que registra quantas consultas estão em andamento.
+    """
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, license_plate, renavam, debt_option):
+        pass
+
+    def fetch(self):
+        with SlowAPI.lock:
+            SlowAPI.in_flight += 1
+            SlowAPI.peak = max(SlowAPI.peak, SlowAPI.in_flight)
+        time.sleep(0.02)
+        with SlowAPI.lock:
+            SlowAPI.in_flight -= 1
+        return {}
+
+
+def test_aimd_limit():
+    """
+    GIVEN um limite adaptativo
+    WHEN as respostas chegarem dentro da latência alvo
+    THEN o limite deve crescer aos poucos
+    AND deve cair multiplicativamente com respostas lentas ou falhas.
+    """
+    limit = AdaptiveLimit(initial_limit=10, max_limit=12, target_latency=0.5)
+
+    for _ in range(11):
+        limit.on_sample(0.1)
+    assert int(limit) == 11
+
+    limit.on_sample(1.0)
+    assert int(limit) == 9
+    limit.on_sample(0.1, failed=True)
+    assert int(limit) == 8
+
+    for _ in range(100):
+        limit.on_sample(0.1)
+    assert int(limit) == 12
+
+
+@pytest.mark.parametrize(
+    "limiter",
+    [
+        ConcurrencyLimiter(
+            limit=AdaptiveLimit(initial_limit=3, max_limit=3), queue_timeout=5
+        ),
+        ConcurrencyLimiter(per_consultation={"ConsultaMultas": 3}, queue_timeout=5),
+    ],
+)
+def test_limiter_caps_in_flight_consultations(limiter):
+    """
+    GIVEN um limite total ou por consulta de 3 consultas simultâneas
+    WHEN dezenas de buscas chegarem ao mesmo tempo
+    THEN o webservice nunca deve receber mais que 3 consultas de uma vez
+    AND as excedentes devem aguardar a sua vez.
+    """
+    SlowAPI.peak = 0
+    sp_service = SPService(api_class=SlowAPI, limiter=limiter)
+
+    def search(_):
+        return SPService(
+            api_class=sp_service.api_class, limiter=sp_service.limiter
+        ).execute(license_plate="ABC1234", renavam="1", debt_option="ticket")
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        list(executor.map(search, range(40)))
+
+    assert SlowAPI.peak == 3
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.rejected == 0
+
+
+def test_limiter_sheds_excess_load():
+    """
+    GIVEN um limiter sem fila e com todas as vagas ocupadas
+    WHEN outra consulta chegar
+    THEN deve ser rejeitada na hora com OverloadedException.
+    """
+    limiter = ConcurrencyLimiter(
+        limit=AdaptiveLimit(initial_limit=1, min_limit=1), queue_timeout=0
+    )
+    limiter.acquire("ConsultaIPVA")
+
+    with pytest.raises(OverloadedException, match="ConsultaIPVA"):
+        limiter.call("ConsultaIPVA", dict)
+    with pytest.raises(OverloadedException):
+        asyncio.run(limiter.acall("ConsultaIPVA", asyncio.sleep))
+
+    assert limiter.stats() == {
+        "limit": 1,
+        "in_flight": 1,
+        "rejected": 2,
+        "per_consultation": {"ConsultaIPVA": 1},
+    }
+
+
+def test_limiter_samples_only_upstream_outcomes():
+    """
+    GIVEN consultas que falham
+    WHEN a falha for transitória
+    THEN o limite deve cair
+    AND erros como veículo não encontrado não devem alterar o limite.
+    """
+    limiter = ConcurrencyLimiter(limit=AdaptiveLimit(initial_limit=10))
+
+    def fail(exc):
+        def fn():
+            raise exc
+
+        return fn
+
+    with pytest.raises(Exception):
+        limiter.call("ConsultaDPVAT", fail(Exception("veículo não encontrado")))
+    assert limiter.limit.limit == 10
+
+    with pytest.raises(DetranSPUnavailableException):
+        limiter.call("ConsultaDPVAT", fail(DetranSPUnavailableException("503")))
+    assert limiter.limit.limit == 9
+    assert limiter.in_flight == 0
+
+
+def test_async_limiter_waits_for_a_slot():
+    """
+    GIVEN um limite de 1 consulta simultânea
+    WHEN várias buscas assíncronas forem executadas
+    THEN todas devem terminar, uma de cada vez.
+    """
+    limiter = ConcurrencyLimiter(
+        limit=AdaptiveLimit(initial_limit=1, min_limit=1, max_limit=1),
+        queue_timeout=5,
+    )
+    running = []
+
+    async def fetch():
+        running.append(limiter.in_flight)
+        await asyncio.sleep(0.01)
+        return {}
+
+    async def main():
+        return await asyncio.gather(
+            *(limiter.acall("ConsultaMultas", fetch) for _ in range(5))
+        )
+
+    assert asyncio.run(main()) == [{}] * 5
+    assert running == [1] * 5
+
+
+def test_async_limiter_cancelled_waiter_does_not_leak_slot():
+    """
+    GIVEN uma busca assíncrona aguardando vaga no limiter
+    WHEN ela for cancelada e a vaga ocupada for liberada
+    THEN nenhuma vaga deve ficar presa
+    AND a próxima busca deve conseguir a vaga na hora.
+    """
+    limiter = ConcurrencyLimiter(
+        limit=AdaptiveLimit(initial_limit=1, min_limit=1, max_limit=1),
+        queue_timeout=5,
+    )
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return {}
+
+        holder = asyncio.create_task(limiter.acall("ConsultaMultas", hold))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(limiter.acall("ConsultaMultas", dict))
+        await asyncio.sleep(0.01)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+
+        assert limiter.in_flight == 0
+        assert limiter._waiters == []
+        limiter.queue_timeout = 0
+        return await limiter.acall("ConsultaMultas", hold)
+
+    assert asyncio.run(main()) == {}
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.rejected == 0
+
+
+def test_async_limiter_waiter_times_out():
+    """
+    GIVEN todas as vagas ocupadas por uma consulta síncrona
+    WHEN uma busca assíncrona esperar mais que queue_timeout
+    THEN deve receber OverloadedException sem ocupar vaga.
+    """
+    limiter = ConcurrencyLimiter(
+        limit=AdaptiveLimit(initial_limit=1, min_limit=1), queue_timeout=0.02
+    )
+    limiter.acquire("ConsultaIPVA")
+
+    with pytest.raises(OverloadedException):
+        asyncio.run(limiter.acall("ConsultaIPVA", asyncio.sleep))
+
+    assert limiter.in_flight == 1
+    assert limiter._waiters == []
+
+
+class StreamingAPI:
+    """
+    API falsa que responde em pedaços, registrando se a resposta foi
+    fechada.
+    """
+
+    closed = []
+
+    def __init__(self, license_plate, renavam, debt_option):
+        pass
+
+    def stream(self):
+        try:
+            yield b'{"Multas": {"Multa": [{"AIIP": "A1", "Valor": 1}, '
+            yield b'{"AIIP": "A2", "Valor": 2}]}}'
+        finally:
+            StreamingAPI.closed.append(True)
+
+
+def test_limiter_holds_slot_while_streaming():
+    """
+    GIVEN uma resposta lida em pedaços por trás do limiter
+    WHEN o corpo for lido
+    THEN a vaga deve ficar ocupada até o fim da leitura
+    AND a latência registrada deve incluir a leitura do corpo.
+    """
+    clock = iter(range(100))
+    limit = AdaptiveLimit(initial_limit=10, target_latency=1.5)
+    limiter = ConcurrencyLimiter(limit=limit, clock=lambda: next(clock))
+
+    chunks = limiter.stream("ConsultaMultas", lambda: iter([b"a", b"b"]))
+    assert limiter.stats()["in_flight"] == 1
+    assert list(chunks) == [b"a", b"b"]
+
+    assert limiter.stats()["in_flight"] == 0
+    # aberta em 0 e lida até 1: dentro do alvo; com mais um pedaço, não
+    assert limit.limit == 10.1
+    chunks = limiter.stream("ConsultaMultas", lambda: iter([b"a", b"b"]))
+    next(chunks)
+    next(clock)
+    list(chunks)
+    assert limit.limit < 10.1
+
+
+def test_limiter_releases_closed_stream():
+    """
+    GIVEN uma busca em streaming com o limiter
+    WHEN os débitos forem lidos só em parte
+    THEN a vaga deve seguir ocupada durante a leitura
+    AND ao fechar a busca a resposta deve ser fechada e a vaga liberada.
+    """
+    StreamingAPI.closed = []
+    limiter = ConcurrencyLimiter()
+    sp_service = SPService(api_class=StreamingAPI, limiter=limiter)
+
+    records = sp_service.stream_records(
+        license_plate="ABC1234", renavam="1", debt_option="ticket"
+    )
+    assert next(records) == ("Multas", {"AIIP": "A1", "Valor": 1})
+    assert limiter.stats()["in_flight"] == 1
+
+    records.close()
+
+    assert StreamingAPI.closed == [True]
+    assert limiter.stats()["in_flight"] == 0
+
+    records = sp_service.stream_records(
+        license_plate="ABC1234", renavam="1", debt_option="ticket"
+    )
+    assert len(list(records)) == 2
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_overloaded_exception_pickle():
+    """
+    GIVEN um OverloadedException levantado num processo filho
+    WHEN ele for serializado de volta (search_debts --executor=process)
+    THEN deve manter a consulta e a mesma mensagem.
+    """
+    exc = pickle.loads(pickle.dumps(OverloadedException("ConsultaIPVA")))
+
+    assert exc.consultation == "ConsultaIPVA"
+    assert str(exc) == "ConsultaIPVA: limite de consultas simultâneas atingido"
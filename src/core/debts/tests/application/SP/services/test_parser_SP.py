@@ -1,13 +1,18 @@
 import pytest
 
 from core.debts.application.dto import (
+    DebtRecordError,
     DPVATOutput,
     IPVAOutput,
     LicenciamentoOutput,
     MultaOutput,
     SPParserInput,
 )
-from core.debts.application.SP.services import SPParser
+from core.debts.application.SP.services import SPParser, SPService
+from core.debts.application.SP.services.synthetic import (
+    SyntheticDetran,
+    SyntheticProfile,
+)
 from core.debts.application.use_cases import (
     CreateDPVATUseCase,
     CreateIPVAUseCase,
@@ -196,3 +201,152 @@ def test_collect_all_debts(sp_service_output, sp_parser):
         SPParserInput(data=sp_service_output)
     )
     assert isinstance(parsed_all_debts, list)
+
+
+def test_collect_debts_batch(sp_service_output, sp_parser):
+    """
+    GIVEN parsear responses da api de SP com registros inválidos
+    WHEN collect_debts_batch for executado
+    THEN deve retornar os débitos válidos
+    AND um relatório de erros por registro inválido.
+    """
+    invalid_multa = {"AIIP": None, "Valor": "abc", "DescricaoEnquadramento": "x"}
+    multas = ConsultaMultas.json["Multas"]["Multa"]
+    sp_service_output.update({"Multas": {"Multa": [multas[0], invalid_multa]}})
+
+    batch = sp_parser.collect_debts_batch(
+        SPParserInput(data=sp_service_output), "Multas"
+    )
+
+    assert [debt.auto_infraction for debt in batch.debts] == ["5E5E5E5E  "]
+    assert batch.errors == [
+        DebtRecordError(
+            category="Multas",
+            index=1,
+            record=invalid_multa,
+            errors={
+                "amount": ["A valid number is required."],
+                "auto_infraction": ["This field may not be null."],
+            },
+        )
+    ]
+
+
+def test_collect_all_debts_batch(sp_service_output, sp_parser):
+    """
+    GIVEN parsear responses da api de SP válidas
+    WHEN collect_all_debts_batch for executado
+    THEN deve retornar os mesmos débitos de collect_all_debts sem erros.
+    """
+    sp_service_output.update(
+        {
+            "Multas": ConsultaMultas.json.get("Multas"),
+            "IPVAs": ConsultaIPVA.json.get("IPVAs"),
+            "DPVATs": ConsultaDPVAT.json.get("DPVATs"),
+            "Licenciamento": Licenciamento.json,
+        }
+    )
+    parser_input = SPParserInput(data=sp_service_output)
+
+    batch = sp_parser.collect_all_debts_batch(parser_input)
+
+    assert batch.errors == []
+    assert batch.debts == sp_parser.collect_all_debts(parser_input)
+
+
+def test_iter_all_debts(sp_service_output, sp_parser):
+    """
+    GIVEN parsear responses da api de SP
+    WHEN iter_all_debts for executado
+    THEN deve gerar, sob demanda, os mesmos débitos de collect_all_debts.
+    """
+    sp_service_output.update(
+        {
+            "Multas": ConsultaMultas.json.get("Multas"),
+            "IPVAs": ConsultaIPVA.json.get("IPVAs"),
+            "Licenciamento": Licenciamento.json,
+        }
+    )
+    parser_input = SPParserInput(data=sp_service_output)
+
+    debts = sp_parser.iter_all_debts(parser_input)
+
+    assert not isinstance(debts, list)
+    assert list(debts) == sp_parser.collect_all_debts(parser_input)
+
+
+def test_collect_all_debts_keeps_category_order(sp_parser):
+    """
+    GIVEN uma resposta sintética com muitos débitos de cada categoria
+    WHEN collect_all_debts for executado
+    THEN deve retornar os mesmos débitos das coletas por categoria, na ordem
+    multas, IPVAs, DPVATs e licenciamento.
+    """
+    detran = SyntheticDetran(
+        profile=SyntheticProfile(
+            vehicles=1, tickets=50, ipvas=20, dpvats=10, licensing_rate=1
+        )
+    )
+    plate, renavam = detran.vehicle(0)
+    response = SPService(api_class=detran.api_class()).execute(
+        license_plate=plate, renavam=renavam
+    )
+    parser_input = SPParserInput(data=response)
+
+    debts = sp_parser.collect_all_debts(parser_input)
+
+    assert debts == [
+        *sp_parser.collect_ticket_debts(parser_input),
+        *sp_parser.collect_ipva_debts(parser_input),
+        *sp_parser.collect_insurance_debts(parser_input),
+        *sp_parser.collect_licensing_debts(parser_input),
+    ]
+    assert len(debts) == 81
+
+
+def test_collect_ticket_debts_without_description(sp_service_output, sp_parser):
+    """
+    GIVEN uma multa sem DescricaoEnquadramento, aceita antes das regras de
+    validação valerem
+    WHEN collect_ticket_debts for executado
+    THEN a multa deve ser formatada com a descrição vazia.
+    """
+    multa = {
+        **ConsultaMultas.json["Multas"]["Multa"][0],
+        "DescricaoEnquadramento": None,
+    }
+    sp_service_output.update({"Multas": {"Multa": [multa]}})
+
+    (debt,) = sp_parser.collect_ticket_debts(SPParserInput(data=sp_service_output))
+
+    assert debt.description is None
+    assert debt.amount == 201.18
+
+
+def test_iter_records_batch(sp_parser):
+    """
+    GIVEN registros em streaming com um registro que não é objeto
+    WHEN iter_records_batch for executado
+    THEN deve gerar os débitos válidos e um DebtRecordError no lugar do
+    registro inválido, com o índice dentro da sua categoria.
+    """
+    multa = ConsultaMultas.json["Multas"]["Multa"][0]
+    ipva = ConsultaIPVA.json["IPVAs"]["IPVA"][0]
+
+    debts = list(
+        sp_parser.iter_records_batch(
+            [("Multas", multa), ("IPVAs", ipva), ("Multas", "5E5E5E5E")]
+        )
+    )
+
+    assert debts[:2] == list(
+        sp_parser.iter_records_debts([("Multas", multa), ("IPVAs", ipva)])
+    )
+    assert debts[2] == DebtRecordError(
+        category="Multas",
+        index=1,
+        record="5E5E5E5E",
+        errors={
+            "non_field_errors": ["Invalid data. Expected a dictionary, but got str."]
+        },
+    )
@@ -0,0 +1,226 @@
+import asyncio
+import pickle
+
+import pytest
+
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.exceptions import (
+    CircuitOpenException,
+    DetranSPUnavailableException,
+)
+from core.debts.application.SP.services.resilience import (
+    CircuitBreaker,
+    Resilience,
+    RetryPolicy,
+)
+
+
+class FaultyAPI:
+    """
+    API falsa que falha conforme o roteiro de `faults` (um item por chamada:
+    exceção a levantar ou `None` para responder normalmente).
+    """
+
+    faults = []
+    calls = 0
+
+    def __init__(self, license_plate, renavam, debt_option):
+        self.debt_option = debt_option
+
+    def fetch(self):
+        FaultyAPI.calls += 1
+        fault = FaultyAPI.faults.pop(0) if FaultyAPI.faults else None
+        if fault is not None:
+            raise fault
+        return {"Multas": {"Multa": [{"AIIP": "1", "Valor": 1}]}}
+
+    async def afetch(self):
+        return self.fetch()
+
+
+@pytest.fixture
+def resilience():
+    FaultyAPI.faults = []
+    FaultyAPI.calls = 0
+    sleeps = []
+    resilience = Resilience(
+        retry=RetryPolicy(max_attempts=3, base_delay=0.1, random=lambda: 1.0),
+        failure_threshold=3,
+        reset_timeout=60,
+        sleep=sleeps.append,
+    )
+    resilience.sleeps = sleeps
+    yield resilience
+
+
+def search(resilience):
+    sp_service = SPService(api_class=FaultyAPI, resilience=resilience)
+    return sp_service.execute(
+        license_plate="ABC1234", renavam="11111111111", debt_option="ticket"
+    )
+
+
+def test_transient_errors_are_retried_with_backoff(resilience):
+    """
+    GIVEN um webservice que falha duas vezes antes de responder
+    WHEN a busca for executada
+    THEN deve repetir a consulta com backoff exponencial
+    AND registrar as repetições sem abrir o circuito.
+    """
+    FaultyAPI.faults = [DetranSPUnavailableException("503"), TimeoutError()]
+
+    debts = search(resilience)
+
+    assert debts["Multas"] is not None
+    assert FaultyAPI.calls == 3
+    assert resilience.sleeps == [0.1, 0.2]
+    assert resilience.stats() == {
+        "retries": {"ConsultaMultas": 2},
+        "breakers": {"ConsultaMultas": {"state": "closed", "failures": 0}},
+    }
+
+
+def test_non_transient_errors_are_not_retried(resilience):
+    """
+    GIVEN um veículo não encontrado
+    WHEN a busca for executada
+    THEN o erro deve ser levantado sem repetição
+    AND não deve contar como falha do circuito.
+    """
+    FaultyAPI.faults = [Exception("veículo não encontrado")]
+
+    with pytest.raises(Exception, match="veículo não encontrado"):
+        search(resilience)
+
+    assert FaultyAPI.calls == 1
+    assert resilience.breaker("ConsultaMultas").failures == 0
+
+
+def test_circuit_opens_and_fails_fast(resilience):
+    """
+    GIVEN um webservice fora do ar
+    WHEN as falhas seguidas atingirem o limite
+    THEN o circuito deve abrir
+    AND as próximas buscas devem falhar sem chamar o webservice.
+    """
+    FaultyAPI.faults = [ConnectionError()] * 3
+
+    with pytest.raises(ConnectionError):
+        search(resilience)
+    with pytest.raises(CircuitOpenException):
+        search(resilience)
+
+    assert FaultyAPI.calls == 3
+    assert resilience.breaker("ConsultaMultas").state == CircuitBreaker.OPEN
+
+
+def test_half_open_probe(resilience, monkeypatch):
+    """
+    GIVEN um circuito aberto cujo tempo de espera passou
+    WHEN a chamada de teste falhar
+    THEN o circuito deve reabrir
+    AND quando a chamada de teste seguinte funcionar deve fechar.
+    """
+    breaker = resilience.breaker("ConsultaMultas")
+    FaultyAPI.faults = [ConnectionError()] * 4
+    with pytest.raises(ConnectionError):
+        search(resilience)
+
+    breaker.opened_at -= 60
+    with pytest.raises(ConnectionError):
+        search(resilience)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert FaultyAPI.calls == 4
+
+    breaker.opened_at -= 60
+    assert search(resilience)["Multas"] is not None
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    """
+    GIVEN um circuito meio-aberto com uma chamada de teste em andamento
+    WHEN outra chamada chegar
+    THEN ela deve falhar rápido.
+    """
+    breaker = CircuitBreaker(name="ConsultaIPVA", failure_threshold=1)
+    breaker.on_failure()
+    breaker.opened_at -= breaker.reset_timeout
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+
+def test_async_retry(resilience):
+    """
+    GIVEN um webservice que falha uma vez
+    WHEN a busca assíncrona for executada
+    THEN deve repetir a consulta e retornar os débitos.
+    """
+    FaultyAPI.faults = [DetranSPUnavailableException("502")]
+    resilience.retry.base_delay = 0
+    sp_service = SPService(api_class=FaultyAPI, resilience=resilience)
+
+    debts = asyncio.run(
+        sp_service.aexecute(
+            license_plate="ABC1234", renavam="11111111111", debt_option="ticket"
+        )
+    )
+
+    assert debts["Multas"] is not None
+    assert resilience.retries == {"ConsultaMultas": 1}
+
+
+class TruncatedStreamAPI(FaultyAPI):
+    """
+    API falsa cuja resposta em streaming termina no meio do JSON ou com a
+    conexão caindo, depois do primeiro registro.
+    """
+
+    def stream(self):
+        yield b'{"Multas": {"Multa": [{"AIIP": "1", "Valor": 1}, {"AIIP": "2", '
+        fault = FaultyAPI.faults.pop(0) if FaultyAPI.faults else None
+        if fault is not None:
+            raise fault
+
+
+@pytest.mark.parametrize(
+    "fault, expected",
+    [
+        (None, DetranSPUnavailableException),
+        (ConnectionResetError("reset"), ConnectionResetError),
+    ],
+)
+def test_stream_body_errors_count_as_failures(resilience, fault, expected):
+    """
+    GIVEN uma busca em streaming cuja resposta é interrompida no meio do corpo
+    WHEN os registros forem lidos
+    THEN os registros anteriores à falha devem ser gerados
+    AND a leitura deve terminar com uma exceção transitória
+    AND a falha deve contar no circuit breaker da consulta, sem repetição.
+    """
+    FaultyAPI.faults = [fault]
+    sp_service = SPService(api_class=TruncatedStreamAPI, resilience=resilience)
+    records = sp_service.stream_records(
+        license_plate="ABC1234", renavam="11111111111", debt_option="ticket"
+    )
+
+    assert next(records) == ("Multas", {"AIIP": "1", "Valor": 1})
+    with pytest.raises(expected):
+        next(records)
+
+    assert resilience.stats()["breakers"]["ConsultaMultas"]["failures"] == 1
+    assert resilience.sleeps == []
+
+
+def test_circuit_open_exception_pickle():
+    """
+    GIVEN um CircuitOpenException levantado num processo filho
+    WHEN ele for serializado de volta (search_debts --executor=process)
+    THEN deve manter a consulta e a mesma mensagem.
+    """
+    exc = pickle.loads(pickle.dumps(CircuitOpenException("ConsultaIPVA")))
+
+    assert exc.consultation == "ConsultaIPVA"
+    assert str(exc) == "ConsultaIPVA indisponível no momento"
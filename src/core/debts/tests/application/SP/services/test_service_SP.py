@@ -1,11 +1,20 @@
+import asyncio
 import json
 import pathlib
+import time
 from unittest.mock import Mock
 
 import pytest
 from jsonschema import validate
 
 from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.exceptions import (
+    CircuitOpenException,
+    DetranSPUnavailableException,
+    OverloadedException,
+)
+from core.debts.application.SP.services.service import FAILURES
+from django_app.container import Container
 
 
 @pytest.fixture
@@ -44,27 +53,25 @@ def test_get_json_response(sp_service, method, schema_name):
     validate_payload(response, schema_name)
 
 
-@pytest.mark.parametrize(
-    "mercosul_plate, gray_plate",
-    [
-        ("ABC1C34", "ABC1234"),
-        ("ACI6J67", "ACI6967"),
-        ("ABC1C34", "ABC1234"),
-        ("MAA0B92", "MAA0192"),
-        ("BCG7G17", "BCG7617"),
-        ("FAL7D00", "FAL7300"),
-        ("HAH2H74", "HAH2774"),
-        ("POD5A60", "POD5060"),
-    ],
-)
-def test_convert_to_gray_plate(sp_service, mercosul_plate, gray_plate):
+def test_license_plate_normalized_once(sp_service):
     """
-    GIVEN consultar débitos na api de SP
-    WHEN uma placa no padrão 'Mercosul' for informada
-    AND convert_to_gray_plate for executado
-    THEN deve retornar uma placa no padrão 'Gray'.
+    GIVEN uma busca com placa no padrão 'Mercosul'
+    WHEN execute for executado
+    THEN todas as consultas devem usar a placa no padrão 'Gray'.
     """
-    assert gray_plate == sp_service._convert_to_gray_plate(mercosul_plate)
+    plates = []
+
+    class PlateAPI:
+        def __init__(self, license_plate, renavam, debt_option):
+            plates.append(license_plate)
+
+        def fetch(self):
+            return {}
+
+    sp_service.api_class = PlateAPI
+    sp_service.execute(license_plate="abc-1c34", renavam="11111111111")
+
+    assert plates == ["ABC1234"] * 4
 
 
 @pytest.mark.parametrize(
@@ -93,3 +100,134 @@ def test_debt_search_options(sp_service, debt_option, call_option):
         sp_service.get_json_response.assert_called_with(call_option)
     else:
         assert sp_service.get_json_response.call_count == 4
+
+
+def test_debt_search_concurrent(sp_service):
+    """
+    GIVEN consultar débitos na api de SP em modo concorrente
+    WHEN debt_search for executado sem debt_option
+    THEN as 4 consultas devem rodar ao mesmo tempo
+    AND o tempo total deve ser próximo ao da consulta mais lenta.
+    """
+
+    def slow_response(method):
+        time.sleep(0.2)
+        return {}
+
+    sp_service.concurrent = True
+    sp_service.get_json_response = Mock(side_effect=slow_response)
+
+    started_at = time.monotonic()
+    sp_service.debt_search()
+    elapsed = time.monotonic() - started_at
+
+    assert sp_service.get_json_response.call_count == 4
+    assert elapsed < 0.6
+
+
+def test_debt_search_concurrent_partial_results(sp_service):
+    """
+    GIVEN consultar débitos na api de SP em modo concorrente
+    WHEN uma consulta falhar ou estourar o timeout
+    THEN as demais consultas devem ser retornadas
+    AND a consulta com problema deve retornar None e entrar em FAILURES.
+    """
+
+    def response(method):
+        if method == "ConsultaIPVA":
+            raise Exception("erro no webservice")
+        if method == "ConsultaDPVAT":
+            time.sleep(1)
+        return {"Multas": {"Multa": []}} if method == "ConsultaMultas" else {}
+
+    sp_service.concurrent = True
+    sp_service.timeouts = {"ConsultaDPVAT": 0.1}
+    sp_service.get_json_response = Mock(side_effect=response)
+
+    debts = sp_service.debt_search()
+
+    assert debts == {
+        "Multas": {"Multa": []},
+        "IPVAs": None,
+        "DPVATs": None,
+        "Licenciamento": None,
+        FAILURES: {
+            "ConsultaIPVA": "Exception('erro no webservice')",
+            "ConsultaDPVAT": "TimeoutError()",
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        OverloadedException("ConsultaIPVA"),
+        CircuitOpenException("ConsultaIPVA"),
+        DetranSPUnavailableException("erro no webservice do Detran-SP: HTTP 503"),
+    ],
+)
+def test_debt_search_concurrent_upstream_failure(sp_service, exc):
+    """
+    GIVEN consultar débitos na api de SP em modo concorrente
+    WHEN uma consulta falhar por sobrecarga ou indisponibilidade do webservice
+    THEN a busca deve falhar com o erro, e não voltar sem os débitos.
+    """
+
+    def response(method):
+        if method == "ConsultaIPVA":
+            raise exc
+        return {}
+
+    sp_service.concurrent = True
+    sp_service.get_json_response = Mock(side_effect=response)
+
+    with pytest.raises(type(exc)):
+        sp_service.debt_search()
+
+    async def aresponse(method):
+        return response(method)
+
+    sp_service.aget_json_response = aresponse
+    with pytest.raises(type(exc)):
+        asyncio.run(sp_service.adebt_search())
+
+
+def test_adebt_search_concurrent(sp_service):
+    """
+    GIVEN consultar débitos na api de SP de forma assíncrona
+    WHEN adebt_search for executado sem debt_option
+    THEN as 4 consultas devem rodar ao mesmo tempo
+    AND a consulta que falhar deve retornar None e entrar em FAILURES.
+    """
+
+    async def response(method):
+        await asyncio.sleep(0.2)
+        if method == "ConsultaIPVA":
+            raise Exception("erro no webservice")
+        return await SPService.aget_json_response(sp_service, method)
+
+    sp_service.aget_json_response = response
+
+    started_at = time.monotonic()
+    debts = asyncio.run(sp_service.adebt_search())
+    elapsed = time.monotonic() - started_at
+
+    assert elapsed < 0.6
+    assert debts["IPVAs"] is None
+    assert debts[FAILURES] == {"ConsultaIPVA": "Exception('erro no webservice')"}
+    assert debts["Multas"] == sp_service.get_json_response("ConsultaMultas")["Multas"]
+    assert debts["Licenciamento"] == sp_service.get_json_response(
+        "ConsultaLicenciamento"
+    )
+
+
+def test_container_timeout_from_config():
+    """
+    GIVEN o timeout do webservice configurado em detran_api.timeout
+    WHEN o container criar o serviço
+    THEN a busca concorrente deve usar esse timeout por consulta.
+    """
+    container = Container()
+    container.config.detran_api.timeout.from_value(2.5)
+
+    assert container.application_service_SPService().timeout == 2.5
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.singleflight import SingleFlight
+
+
+@pytest.fixture
+def single_flight():
+    yield SingleFlight()
+
+
+def test_identical_calls_are_coalesced(single_flight):
+    """
+    GIVEN várias chamadas idênticas ao mesmo tempo
+    WHEN single_flight.do for executado
+    THEN a função deve rodar uma única vez
+    AND todas as chamadas devem receber o mesmo resultado.
+    """
+    barrier = threading.Barrier(10)
+    fn = Mock(side_effect=lambda: time.sleep(0.2) or {"Multas": None})
+
+    def call(_):
+        barrier.wait()
+        return single_flight.do(("ABC1234", "1", ""), fn)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(call, range(10)))
+
+    assert fn.call_count == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats() == {"coalesced": 9, "in_flight": 0}
+
+
+def test_errors_are_shared_and_not_kept(single_flight):
+    """
+    GIVEN uma chamada que falha
+    WHEN a mesma chave for chamada novamente depois da falha
+    THEN a função deve ser executada de novo.
+    """
+    fn = Mock(side_effect=[Exception("erro no webservice"), {}])
+
+    with pytest.raises(Exception):
+        single_flight.do("key", fn)
+
+    assert single_flight.do("key", fn) == {}
+    assert fn.call_count == 2
+
+
+def test_service_coalesces_async_searches(single_flight):
+    """
+    GIVEN buscas assíncronas idênticas ao mesmo tempo
+    WHEN aexecute for executado
+    THEN o webservice deve ser consultado uma única vez.
+    """
+    sp_service = SPService(single_flight=single_flight)
+    calls = []
+
+    async def adebt_search():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"Multas": None}
+
+    sp_service.adebt_search = adebt_search
+
+    async def search():
+        return await asyncio.gather(
+            *(
+                SPService.aexecute(sp_service, license_plate="ABC1234", renavam="1")
+                for _ in range(5)
+            )
+        )
+
+    results = asyncio.run(search())
+
+    assert len(calls) == 1
+    assert results == [{"Multas": None}] * 5
+    assert single_flight.stats() == {"coalesced": 4, "in_flight": 0}
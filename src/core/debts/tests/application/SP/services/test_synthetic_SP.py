@@ -0,0 +1,109 @@
+import pytest
+
+from core.debts.application.dto import SPParserInput
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.synthetic import (
+    SyntheticDetran,
+    SyntheticProfile,
+    renavam_check_digit,
+)
+from django_app.container import Container
+
+CONSULTATIONS = (
+    "ConsultaMultas",
+    "ConsultaIPVA",
+    "ConsultaDPVAT",
+    "ConsultaLicenciamento",
+)
+
+
+@pytest.fixture
+def parser():
+    yield Container().application_service_SPParser()
+
+
+def test_fleet_vehicles():
+    """
+    GIVEN uma frota sintética
+    WHEN os veículos forem gerados
+    THEN cada veículo deve ter placa e RENAVAM únicos e válidos
+    AND deve ser encontrado de volta pela placa e RENAVAM.
+    """
+    detran = SyntheticDetran(profile=SyntheticProfile(vehicles=30_000))
+
+    vehicles = list(detran.vehicles())
+
+    assert len(set(vehicles)) == 30_000
+    assert vehicles[0] == ("AAA0000", "00000000019")
+    assert detran.index(*vehicles[-1]) == 29_999
+    assert detran.index("AAA0000", "00000000010") is None
+    assert detran.index("ZZZ9999", "1") is None
+    assert renavam_check_digit("1111111111") == "6"
+
+
+def test_payloads_are_deterministic():
+    """
+    GIVEN duas frotas com a mesma semente e uma com semente diferente
+    WHEN o mesmo veículo for consultado
+    THEN as frotas de mesma semente devem responder igual
+    AND a de semente diferente deve responder outros débitos.
+    """
+    profile = dict(vehicles=100, tickets=5, ipvas=3, dpvats=2, licensing_rate=1)
+    first = SyntheticDetran(profile=SyntheticProfile(seed=1, **profile))
+    second = SyntheticDetran(profile=SyntheticProfile(seed=1, **profile))
+    other = SyntheticDetran(profile=SyntheticProfile(seed=2, **profile))
+    plate, renavam = first.vehicle(42)
+
+    for consultation in CONSULTATIONS:
+        payload = first.fetch(plate, renavam, consultation)
+        assert payload == second.fetch(plate, renavam, consultation)
+        assert payload != other.fetch(plate, renavam, consultation)
+
+    assert len(first.fetch(plate, renavam, "ConsultaMultas")["Multas"]["Multa"]) == 5
+
+
+def test_synthetic_api_replaces_api(parser):
+    """
+    GIVEN o SPService usando a frota sintética no lugar do API
+    WHEN os débitos de um veículo da frota forem buscados e formatados
+    THEN todos os débitos gerados devem ser formatados
+    AND um veículo fora da frota não deve ser encontrado.
+    """
+    detran = SyntheticDetran(
+        profile=SyntheticProfile(
+            vehicles=10, tickets=lambda rng: 3, ipvas=(1, 1), licensing_rate=1
+        )
+    )
+    plate, renavam = detran.vehicle(7)
+    sp_service = SPService(api_class=detran.api_class())
+
+    response = sp_service.execute(license_plate=plate, renavam=renavam)
+    debts = parser.collect_all_debts(SPParserInput(data=response))
+
+    assert [debt.type for debt in debts][:4] == ["ticket", "ticket", "ticket", "ipva"]
+    assert debts[-1].type == "licensing"
+
+    with pytest.raises(Exception, match="veículo não encontrado"):
+        sp_service.execute(license_plate="ABC1234", renavam="11111111111")
+
+
+@pytest.mark.parametrize("malformed_rate", [0.0, 0.2, 1.0])
+def test_malformed_records(parser, malformed_rate):
+    """
+    GIVEN uma taxa de registros malformados
+    WHEN os débitos da frota forem formatados em lote
+    THEN a proporção de registros inválidos deve seguir a taxa configurada.
+    """
+    detran = SyntheticDetran(
+        profile=SyntheticProfile(vehicles=300, malformed_rate=malformed_rate)
+    )
+    sp_service = SPService(api_class=detran.api_class())
+
+    valid = invalid = 0
+    for plate, renavam in detran.vehicles():
+        response = sp_service.execute(license_plate=plate, renavam=renavam)
+        batch = parser.collect_all_debts_batch(SPParserInput(data=response))
+        valid += len(batch.debts)
+        invalid += len(batch.errors)
+
+    assert invalid / (valid + invalid) == pytest.approx(malformed_rate, abs=0.05)
@@ -0,0 +1,238 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from dependency_injector import providers
+
+from core.debts.application.dto import DebtRecordError, SearchDebtsInput
+from core.debts.application.SP.services.exceptions import IncompleteSearchException
+from django_app.container import Container
+
+
+class PlateEchoAPI:
+    """
+    API falsa que devolve uma multa com a placa consultada no AIIP.
+    """
+
+    def __init__(self, license_plate, renavam, debt_option):
+        self.license_plate = license_plate
+        self.renavam = renavam
+        self.debt_option = debt_option
+
+    def fetch(self):
+        if self.debt_option != "ConsultaMultas":
+            return {}
+        return {
+            "Multas": {
+                "Multa": [
+                    {
+                        "AIIP": self.license_plate,
+                        "Valor": int(self.renavam),
+                        "DescricaoEnquadramento": self.renavam,
+                    }
+                ]
+            }
+        }
+
+
+@pytest.fixture
+def container():
+    container = Container()
+    container.detran_SP_api.override(providers.Object(PlateEchoAPI))
+    yield container
+
+
+def test_search_debts_concurrent_requests(container):
+    """
+    GIVEN centenas de buscas simultâneas com placas diferentes
+    WHEN o caso de uso for executado em paralelo
+    THEN cada busca deve retornar apenas os débitos do seu veículo.
+    """
+
+    def search(index):
+        input_param = SearchDebtsInput(
+            license_plate=f"ABC{index:04d}", renavam=f"{index:011d}"
+        )
+        output = next(container.use_case_search_debts_sp().execute(input_param))
+        return index, output.debts_list
+
+    with ThreadPoolExecutor(max_workers=64) as executor:
+        results = list(executor.map(search, range(1, 501)))
+
+    for index, debts in results:
+        assert len(debts) == 1
+        assert debts[0].auto_infraction == f"ABC{index:04d}"
+        assert debts[0].description == f"{index:011d}"
+
+
+def test_search_fleet_debts(container):
+    """
+    GIVEN uma frota com veículos válidos e um veículo com opção inválida
+    WHEN a busca em lote for executada
+    THEN deve retornar um resultado por veículo
+    AND o erro do veículo inválido deve vir na sua própria linha.
+    """
+    inputs = [
+        (index, SearchDebtsInput(license_plate=f"ABC{index:04d}", renavam="1"))
+        for index in range(50)
+    ]
+    inputs.append(
+        (50, SearchDebtsInput(license_plate="ABC0050", renavam="1", debt_option="x"))
+    )
+
+    results = list(container.use_case_search_fleet_debts_sp().execute(inputs))
+
+    assert sorted(result.index for result in results) == list(range(51))
+    for result in results:
+        if result.index == 50:
+            assert result.debts_list is None
+            assert result.error == "opção inválida"
+        else:
+            assert result.error is None
+            assert result.debts_list[0].auto_infraction == result.license_plate
+
+
+def test_stream_debts_from_streamed_responses():
+    """
+    GIVEN o serviço configurado para ler as respostas em streaming
+    WHEN a busca em streaming for executada
+    THEN deve gerar os mesmos débitos da busca com as respostas inteiras.
+    """
+    container = Container()
+    input_param = SearchDebtsInput(license_plate="ABC1234", renavam="11111111111")
+    expected = next(container.use_case_search_debts_sp().execute(input_param))
+
+    container.config.detran_api.stream_responses.from_value(True)
+    use_case = container.use_case_search_debts_sp()
+
+    assert use_case.service_detran_SP.stream_responses is True
+    assert list(use_case.stream(input_param)) == expected.debts_list
+
+
+def test_search_debts_incomplete(container):
+    """
+    GIVEN uma busca completa em que uma consulta falha de forma inesperada
+    WHEN o caso de uso for executado
+    THEN deve levantar IncompleteSearchException com os débitos encontrados
+    AND a busca em lote deve reportar o erro na linha do veículo.
+    """
+
+    class FailingAPI(PlateEchoAPI):
+        def fetch(self):
+            if self.debt_option == "ConsultaIPVA":
+                raise RuntimeError("resposta inválida")
+            return super().fetch()
+
+    container.detran_SP_api.override(providers.Object(FailingAPI))
+    input_param = SearchDebtsInput(license_plate="ABC0001", renavam="00000000001")
+
+    with pytest.raises(IncompleteSearchException) as exc:
+        next(container.use_case_search_debts_sp().execute(input_param))
+
+    assert exc.value.failures == {"ConsultaIPVA": "RuntimeError('resposta inválida')"}
+    assert [debt.auto_infraction for debt in exc.value.debts_list] == ["ABC0001"]
+    with pytest.raises(IncompleteSearchException):
+        container.use_case_search_debts_sp().stream(input_param)
+
+    [result] = container.use_case_search_fleet_debts_sp().execute([(0, input_param)])
+    assert result.debts_list is None
+    assert result.error == "consultas sem resposta: ConsultaIPVA"
+
+
+class MixedRecordsAPI(PlateEchoAPI):
+    """
+    API falsa com uma multa válida, uma com valor em texto (convertido pela
+    validação) e uma malformada.
+    """
+
+    def fetch(self):
+        if self.debt_option != "ConsultaMultas":
+            return {}
+        return {
+            "Multas": {
+                "Multa": [
+                    {"AIIP": "A1", "Valor": 1500, "DescricaoEnquadramento": "x"},
+                    {"AIIP": "A2", "Valor": "2500", "DescricaoEnquadramento": None},
+                    {"AIIP": None, "Valor": "abc", "DescricaoEnquadramento": "x"},
+                ]
+            }
+        }
+
+
+def test_search_debts_invalid_records(container):
+    """
+    GIVEN uma resposta com registros coercíveis e um registro malformado
+    WHEN a busca, a busca em streaming e a busca em lote forem executadas
+    THEN os registros válidos devem ser formatados
+    AND o malformado deve ser reportado por registro, sem falhar a busca.
+    """
+    container.detran_SP_api.override(providers.Object(MixedRecordsAPI))
+    input_param = SearchDebtsInput(license_plate="ABC0001", renavam="00000000001")
+    expected_error = DebtRecordError(
+        category="Multas",
+        index=2,
+        record={"AIIP": None, "Valor": "abc", "DescricaoEnquadramento": "x"},
+        errors={
+            "amount": ["A valid number is required."],
+            "auto_infraction": ["This field may not be null."],
+        },
+    )
+
+    output = next(container.use_case_search_debts_sp().execute(input_param))
+
+    assert [(debt.auto_infraction, debt.amount) for debt in output.debts_list] == [
+        ("A1", 15.0),
+        ("A2", 25.0),
+    ]
+    assert output.invalid_records == [expected_error]
+
+    streamed = list(container.use_case_search_debts_sp().stream(input_param))
+    assert streamed == [*output.debts_list, expected_error]
+
+    [result] = container.use_case_search_fleet_debts_sp().execute([(0, input_param)])
+    assert result.error is None
+    assert result.debts_list == output.debts_list
+    assert result.invalid_records == [expected_error]
+
+
+def test_search_debts_without_invalid_records(container):
+    """
+    GIVEN uma resposta sem registros inválidos
+    WHEN a busca em lote for executada
+    THEN o resultado do veículo não deve ter invalid_records.
+    """
+    input_param = SearchDebtsInput(license_plate="ABC0001", renavam="00000000001")
+
+    [result] = container.use_case_search_fleet_debts_sp().execute([(0, input_param)])
+
+    assert result.invalid_records is None
+    assert (
+        next(container.use_case_search_debts_sp().execute(input_param)).invalid_records
+        == []
+    )
+
+
+def test_search_debts_unexpected_error(container):
+    """
+    GIVEN uma consulta que falha com um erro que não é do webservice
+    WHEN o caso de uso for executado, síncrono ou assíncrono
+    THEN o erro deve ser propagado, e não virar um gerador vazio.
+    """
+
+    class BrokenAPI(PlateEchoAPI):
+        def fetch(self):
+            raise RuntimeError("resposta inválida")
+
+        async def afetch(self):
+            self.fetch()
+
+    container.detran_SP_api.override(providers.Object(BrokenAPI))
+    input_param = SearchDebtsInput(
+        license_plate="ABC0001", renavam="00000000001", debt_option="ticket"
+    )
+
+    with pytest.raises(RuntimeError, match="resposta inválida"):
+        next(container.use_case_search_debts_sp().execute(input_param))
+
+    with pytest.raises(RuntimeError, match="resposta inválida"):
+        asyncio.run(anext(container.use_case_search_debts_sp().aexecute(input_param)))
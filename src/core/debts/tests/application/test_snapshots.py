@@ -0,0 +1,148 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+from dependency_injector import providers
+
+from core.debts.application.dto import DebtOutputMapper, SearchDebtsInput
+from core.debts.application.snapshots import DebtSnapshotStore, diff_debts
+from core.debts.application.SP.services.api import API
+from core.debts.application.SP.services.exceptions import IncompleteSearchException
+from django_app.container import Container
+
+
+class MemorySnapshotStore(DebtSnapshotStore):
+    def __init__(self, fresh_debts: Optional[List[Dict]] = None) -> None:
+        self.fresh_debts = fresh_debts
+        self.saved: List[List[Dict]] = []
+
+    def fresh(self, license_plate, renavam, debt_option):
+        return self.fresh_debts
+
+    def save(self, license_plate, renavam, debt_option, debts):
+        diff = diff_debts(self.saved[-1] if self.saved else [], debts)
+        self.saved.append(debts)
+        return diff
+
+
+class CountingAPI:
+    calls = 0
+
+    def __init__(self, license_plate, renavam, debt_option):
+        CountingAPI.calls += 1
+
+    def fetch(self):
+        return {}
+
+
+def ticket(auto_infraction, amount):
+    return {"type": "ticket", "auto_infraction": auto_infraction, "amount": amount}
+
+
+def ipva(year, installment, amount):
+    return {"type": "ipva", "year": year, "installment": installment, "amount": amount}
+
+
+def test_diff_debts():
+    """
+    GIVEN duas buscas do mesmo veículo
+    WHEN diff_debts comparar os débitos
+    THEN deve separar os novos, os quitados e os alterados pela identidade.
+    """
+    before = [ticket("A1", 100), ticket("B2", 200), ipva(2021, 1, 50)]
+    after = [ticket("A1", 150), ipva(2021, 1, 50), ipva(2021, 2, 50)]
+
+    diff = diff_debts(before, after)
+
+    assert diff.new == [ipva(2021, 2, 50)]
+    assert diff.paid == [ticket("B2", 200)]
+    assert diff.changed == [{"before": ticket("A1", 100), "after": ticket("A1", 150)}]
+    assert not diff_debts(after, list(after))
+
+
+def test_diff_debts_duplicates():
+    """
+    GIVEN débitos repetidos com a mesma identidade
+    WHEN um deles deixar de aparecer
+    THEN só ele deve ser considerado quitado.
+    """
+    debts = [ticket("A1", 100), ticket("A1", 100)]
+
+    diff = diff_debts(debts, debts[:1])
+
+    assert diff.paid == [ticket("A1", 100)]
+    assert not diff.new and not diff.changed
+
+
+def test_search_debts_with_snapshot_store():
+    """
+    GIVEN um snapshot_store sem resultado recente
+    WHEN a busca for executada
+    THEN deve consultar o webservice e registrar os débitos como dicts.
+    """
+    container = Container()
+    store = MemorySnapshotStore()
+    container.debts_snapshot_store.override(providers.Object(store))
+    input_param = SearchDebtsInput(license_plate="ABC1234", renavam="11111111111")
+
+    output = container.use_case_search_debts_sp().search(input_param)
+
+    assert len(store.saved) == 1
+    assert len(store.saved[0]) == len(output.debts_list) == 6
+    assert all(isinstance(debt, dict) for debt in store.saved[0])
+
+
+def test_search_debts_fresh_snapshot():
+    """
+    GIVEN um snapshot recente do veículo
+    WHEN a busca for executada
+    THEN deve retorná-lo sem consultar o webservice.
+    """
+    container = Container()
+    debts = [ticket("A1", 100)]
+    container.debts_snapshot_store.override(
+        providers.Object(MemorySnapshotStore(fresh_debts=debts))
+    )
+    container.detran_SP_api.override(providers.Object(CountingAPI))
+    input_param = SearchDebtsInput(license_plate="ABC1234", renavam="11111111111")
+    CountingAPI.calls = 0
+
+    output = container.use_case_search_debts_sp().search(input_param)
+
+    assert output.debts_list == debts
+    assert CountingAPI.calls == 0
+
+
+def test_search_debts_incomplete_is_not_saved():
+    """
+    GIVEN um snapshot_store e uma busca em que uma consulta não responde
+    WHEN a busca for executada (síncrona ou assíncrona)
+    THEN deve levantar IncompleteSearchException sem registrar o snapshot
+    AND a próxima busca completa deve ser comparada só com buscas completas.
+    """
+    container = Container()
+    store = MemorySnapshotStore()
+    container.debts_snapshot_store.override(providers.Object(store))
+
+    class FailingAPI(API):
+        vehicles = [("ABC1234", "11111111111"), ("INC1234", "11111111111")]
+
+        def fetch(self):
+            if self.debt_option == "ConsultaIPVA" and self.license_plate == "INC1234":
+                raise RuntimeError("resposta inválida")
+            return super().fetch()
+
+    container.detran_SP_api.override(providers.Object(FailingAPI))
+    incomplete = SearchDebtsInput(license_plate="INC1234", renavam="11111111111")
+    use_case = container.use_case_search_debts_sp
+
+    with pytest.raises(IncompleteSearchException):
+        use_case().search(incomplete)
+    with pytest.raises(IncompleteSearchException):
+        asyncio.run(use_case().asearch(incomplete))
+
+    assert store.saved == []
+    output = use_case().search(
+        SearchDebtsInput(license_plate="ABC1234", renavam="11111111111")
+    )
+    assert store.saved == [[DebtOutputMapper.to_dict(d) for d in output.debts_list]]
@@ -0,0 +1,115 @@
+import pytest
+
+from core.debts.application.dto import (
+    DPVATInput,
+    IPVAInput,
+    LicenciamentoInput,
+    MultaInput,
+)
+from core.debts.application.use_cases import (
+    CreateDPVATUseCase,
+    CreateIPVAUseCase,
+    CreateLicenciamentoUseCase,
+    CreateMultaUseCase,
+)
+from core.debts.domain.exceptions import EntityValidationException
+
+
+@pytest.mark.parametrize(
+    "use_case, input_param",
+    [
+        (
+            CreateMultaUseCase(),
+            MultaInput(amount=20118, auto_infraction="5E5E5E5E  ", description="x"),
+        ),
+        (CreateIPVAUseCase(), IPVAInput(amount=136569, installment=8, year=2021)),
+        (CreateIPVAUseCase(), IPVAInput(amount=101250, installment=2, year=2020)),
+        (CreateDPVATUseCase(), DPVATInput(amount=523, description=None, year=2020)),
+        (
+            CreateLicenciamentoUseCase(),
+            LicenciamentoInput(amount=9891, description="Taxa", year=2021),
+        ),
+    ],
+)
+def test_execute_direct(use_case, input_param):
+    """
+    GIVEN um input de débito válido
+    WHEN execute_direct for executado
+    THEN deve retornar o mesmo output de execute.
+    """
+    assert use_case.execute_direct(input_param) == use_case.execute(input_param)
+
+
+def test_execute_direct_without_installment():
+    """
+    GIVEN um IPVA sem cota
+    WHEN execute_direct for executado
+    THEN o output não deve ter o campo installment, como em execute.
+    """
+    input_param = IPVAInput(amount=136569, installment=None, year=2021)
+
+    output = CreateIPVAUseCase().execute_direct(input_param)
+
+    assert not hasattr(output, "installment")
+    assert output.title == CreateIPVAUseCase().execute(input_param).title
+
+
+def test_execute_direct_validation():
+    """
+    GIVEN um input de débito inválido
+    WHEN execute_direct for executado
+    THEN deve lançar EntityValidationException, como em execute.
+    """
+    input_param = MultaInput(amount="abc", auto_infraction="A", description="B")
+
+    with pytest.raises(EntityValidationException) as direct_exc:
+        CreateMultaUseCase().execute_direct(input_param)
+
+    with pytest.raises(EntityValidationException) as exc:
+        CreateMultaUseCase().execute(input_param)
+
+    assert direct_exc.value.error == exc.value.error
+
+
+@pytest.mark.parametrize(
+    "use_case, input_param, expected",
+    [
+        (
+            CreateMultaUseCase(),
+            MultaInput(amount="1500", auto_infraction=123, description="x"),
+            {"amount": 15.0, "auto_infraction": "123"},
+        ),
+        (
+            CreateIPVAUseCase(),
+            IPVAInput(amount="136569", installment=8, year="2021.0"),
+            {"amount": 1365.69, "year": 2021, "description": "IPVA 2021"},
+        ),
+        (
+            CreateIPVAUseCase(),
+            IPVAInput(amount=101250.0, installment=2, year=2020.0),
+            {"year": 2020, "description": "IPVA 2020"},
+        ),
+        (
+            CreateDPVATUseCase(),
+            DPVATInput(amount="523", description=None, year="2020"),
+            {"amount": 5.23, "description": "DPVAT 2020", "year": 2020},
+        ),
+        (
+            CreateLicenciamentoUseCase(),
+            LicenciamentoInput(amount=9891.0, description=None, year=2021.0),
+            {"amount": 98.91, "year": 2021},
+        ),
+    ],
+)
+def test_execute_direct_coerced_values(use_case, input_param, expected):
+    """
+    GIVEN um input com texto ou float em campos numéricos, aceitos pela
+    validação
+    WHEN execute_direct for executado
+    THEN o output deve ser montado com os valores convertidos, igual ao de
+    execute.
+    """
+    output = use_case.execute_direct(input_param)
+
+    assert {name: getattr(output, name) for name in expected} == expected
+    assert output == use_case.execute(input_param)
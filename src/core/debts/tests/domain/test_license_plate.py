@@ -0,0 +1,58 @@
+import pytest
+
+from core.debts.domain.exceptions import InvalidLicensePlateException
+from core.debts.domain.license_plate import normalize_license_plate
+
+
+@pytest.mark.parametrize(
+    "mercosul_plate, gray_plate",
+    [
+        ("ABC1C34", "ABC1234"),
+        ("ACI6J67", "ACI6967"),
+        ("ABC1C34", "ABC1234"),
+        ("MAA0B92", "MAA0192"),
+        ("BCG7G17", "BCG7617"),
+        ("FAL7D00", "FAL7300"),
+        ("HAH2H74", "HAH2774"),
+        ("POD5A60", "POD5060"),
+    ],
+)
+def test_convert_to_gray_plate(mercosul_plate, gray_plate):
+    """
+    GIVEN uma placa no padrão 'Mercosul'
+    WHEN normalize_license_plate for executado
+    THEN deve retornar a placa no padrão 'Gray'.
+    """
+    assert gray_plate == normalize_license_plate(mercosul_plate)
+
+
+@pytest.mark.parametrize(
+    "license_plate, expected",
+    [
+        ("ABC1234", "ABC1234"),
+        ("abc1c34", "ABC1234"),
+        (" ABC-1234 ", "ABC1234"),
+        ("abc-1c34", "ABC1234"),
+    ],
+)
+def test_normalize_license_plate(license_plate, expected):
+    """
+    GIVEN uma placa válida com minúsculas, espaços ou hífen
+    WHEN normalize_license_plate for executado
+    THEN deve retornar a placa no padrão 'Gray' em maiúsculas.
+    """
+    assert normalize_license_plate(license_plate) == expected
+
+
+@pytest.mark.parametrize(
+    "license_plate",
+    ["", "ABC", "ABC12", "ABC12345", "AB1C234", "ABC1K34", "ABC 1234", "1BC1234", None],
+)
+def test_invalid_license_plate(license_plate):
+    """
+    GIVEN uma placa fora dos padrões 'Gray' e 'Mercosul'
+    WHEN normalize_license_plate for executado
+    THEN deve levantar InvalidLicensePlateException.
+    """
+    with pytest.raises(InvalidLicensePlateException):
+        normalize_license_plate(license_plate)
@@ -0,0 +1,208 @@
+import pytest
+from rest_framework import serializers
+from rest_framework.fields import CharField, FloatField, IntegerField
+
+from core.debts.domain.entities import IPVA
+from core.debts.domain.exceptions import EntityValidationException
+from core.debts.domain.validators import (
+    DPVATValidatorFactory,
+    FastValidatorAdapter,
+    IPVAValidatorFactory,
+    LicenciamentoValidatorFactory,
+    MultaValidatorFactory,
+    compile_rules,
+)
+
+
+class DeclaredRules(serializers.Serializer):
+    amount = FloatField(required=True)
+    description = CharField(required=False, allow_null=True, allow_blank=True)
+    title = CharField(required=True)
+    year = IntegerField(required=True)
+
+
+class DeclaredFastValidator(FastValidatorAdapter):
+    rules = compile_rules(DeclaredRules)
+
+
+@pytest.mark.parametrize(
+    "data, errors",
+    [
+        (
+            {},
+            {
+                "amount": ["This field is required."],
+                "title": ["This field is required."],
+                "year": ["This field is required."],
+            },
+        ),
+        (
+            {"amount": "abc", "description": [], "title": None, "year": True},
+            {
+                "amount": ["A valid number is required."],
+                "description": ["Not a valid string."],
+                "title": ["This field may not be null."],
+                "year": ["A valid integer is required."],
+            },
+        ),
+        (
+            {"amount": 1, "title": "   ", "year": "2021.5"},
+            {
+                "title": ["This field may not be blank."],
+                "year": ["A valid integer is required."],
+            },
+        ),
+        (
+            {"amount": 1, "title": True, "year": "9" * 1001},
+            {
+                "title": ["Not a valid string."],
+                "year": ["String value too large."],
+            },
+        ),
+    ],
+)
+def test_fast_validator_errors(data, errors):
+    """
+    GIVEN dados inválidos para campos declarados num Serializer
+    WHEN o validador compilado for executado
+    THEN deve retornar os mesmos erros do DRF, no formato {campo: [mensagens]}.
+    """
+    validator = DeclaredFastValidator()
+
+    assert validator.validate(data) is False
+    assert validator.errors == errors
+
+
+@pytest.mark.parametrize(
+    "data, validated_data",
+    [
+        (
+            {"amount": "10.5", "title": 10, "year": "2021.0", "extra": 1},
+            {"amount": 10.5, "title": "10", "year": 2021},
+        ),
+        (
+            {"amount": True, "description": "  ", "title": " IPVA ", "year": 2021},
+            {"amount": 1.0, "description": "", "title": "IPVA", "year": 2021},
+        ),
+        (
+            {"amount": 1, "description": None, "title": "x", "year": " 7 "},
+            {"amount": 1.0, "description": None, "title": "x", "year": 7},
+        ),
+    ],
+)
+def test_fast_validator_coercion(data, validated_data):
+    """
+    GIVEN dados aceitos pelo DRF com coerção (números em texto, espaços,
+    bool em FloatField, campos não declarados)
+    WHEN o validador compilado for executado
+    THEN deve aceitar e devolver os dados convertidos como o DRF.
+    """
+    validator = DeclaredFastValidator()
+
+    assert validator.validate(data) is True
+    assert validator.validated_data == validated_data
+
+
+@pytest.mark.parametrize(
+    "data, errors",
+    [
+        (
+            {},
+            {
+                "amount": ["This field is required."],
+                "auto_infraction": ["This field is required."],
+                "description": ["This field is required."],
+                "title": ["This field is required."],
+                "type": ["This field is required."],
+            },
+        ),
+        (
+            {
+                "amount": "abc",
+                "auto_infraction": None,
+                "description": 10,
+                "title": "",
+                "type": "ticket",
+            },
+            {
+                "amount": ["A valid number is required."],
+                "auto_infraction": ["This field may not be null."],
+                "title": ["This field may not be blank."],
+            },
+        ),
+    ],
+)
+def test_multa_validator_errors(data, errors):
+    """
+    GIVEN dados inválidos de uma multa
+    WHEN o validador for executado
+    THEN deve retornar os erros dos campos anotados nos Rules.
+    """
+    validator = MultaValidatorFactory.create()
+
+    assert validator.validate(data) is False
+    assert validator.errors == errors
+
+
+@pytest.mark.parametrize(
+    "factory, data",
+    [
+        (
+            IPVAValidatorFactory,
+            {
+                "amount": 100,
+                "description": None,
+                "installment": None,
+                "title": "IPVA",
+                "type": "ipva",
+                "year": 2021,
+            },
+        ),
+        (
+            DPVATValidatorFactory,
+            {
+                "amount": 5.23,
+                "description": None,
+                "title": "Seguro Obrigatório",
+                "type": "insurance",
+                "year": 2020,
+            },
+        ),
+        (
+            LicenciamentoValidatorFactory,
+            {
+                "amount": 9891.0,
+                "description": "",
+                "title": "Licenciamento",
+                "type": "licensing",
+                "year": 2021,
+            },
+        ),
+    ],
+)
+def test_fast_validator_valid_data(factory, data):
+    """
+    GIVEN dados válidos de um débito
+    WHEN o validador for executado
+    THEN deve retornar True e os dados validados.
+    """
+    validator = factory.create()
+
+    assert validator.validate(data) is True
+    assert validator.validated_data == data
+
+
+def test_entity_validation_exception():
+    """
+    GIVEN uma entidade com campos inválidos
+    WHEN ela for criada
+    THEN deve lançar EntityValidationException com os erros.
+    """
+    with pytest.raises(EntityValidationException) as exc:
+        IPVA(amount=100, description="", installment=[1], title="", year="x")
+
+    assert exc.value.error == {
+        "installment": ["Invalid value."],
+        "year": ["A valid integer is required."],
+    }
+    assert IPVA(amount="100", description="", installment=1, title="", year="2021")
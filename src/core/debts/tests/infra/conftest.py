@@ -0,0 +1,41 @@
+"""
+Testes da app Django rodando no pytest, sem o pytest-django: o Django é
+configurado ao coletar este diretório e o banco de testes é criado uma vez
+por sessão, como no `manage.py test`.
+"""
+import os
+
+import django
+import pytest
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from core.debts import metrics
+from django_app.container import container
+
+
+def pytest_configure():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+    django.setup()
+    # o `ready()` liga o sink do settings; fora destes testes vale o padrão
+    metrics.set_sink(metrics.NullSink())
+
+
+@pytest.fixture(scope="session", autouse=True)
+def django_test_environment():
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    yield
+    teardown_databases(old_config, verbosity=0)
+    teardown_test_environment()
+
+
+@pytest.fixture(autouse=True)
+def metrics_sink():
+    metrics.set_sink(container.metrics_sink())
+    yield
+    metrics.set_sink(metrics.NullSink())
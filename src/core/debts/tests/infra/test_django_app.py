@@ -0,0 +1,683 @@
+import json
+import tempfile
+from dataclasses import replace
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from dependency_injector import providers
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.fields import CharField, FloatField, IntegerField
+
+from core.debts.application.dto import (
+    DebtRecordError,
+    FleetDebtsOutput,
+    IPVAOutPutMapper,
+    SearchDebtsInput,
+    SearchDebtsOutput,
+)
+from core.debts.application.SP.services import SPService
+from core.debts.application.SP.services.api import API
+from core.debts.application.SP.services.cache import DjangoResponseCache
+from core.debts.application.SP.services.exceptions import OverloadedException
+from core.debts.application.SP.services.resilience import Resilience
+from core.debts.application.SP.services.synthetic import (
+    SyntheticDetran,
+    SyntheticProfile,
+)
+from core.debts.application.SP.use_case import SearchcDebtsUseCase
+from core.debts.domain.validators import (
+    DRFValidatorAdapter,
+    FastValidatorAdapter,
+    compile_rules,
+)
+from core.debts.infra.django_app import renderers
+from core.debts.infra.django_app.models import Debt
+from core.debts.infra.django_app.snapshots import DjangoDebtSnapshotStore
+from core.debts.infra.django_app.validators import (
+    SearchDebtsValidator,
+    search_validator,
+)
+from core.debts.infra.django_app.writers import DjangoDebtWriter
+from django_app.container import container
+
+
+class DebtResourceTests(TestCase):
+    params = {"license_plate": "ABC1234", "renavam": "11111111111"}
+
+    def test_get_debts(self):
+        response = self.client.get("/debts/", self.params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["debts_list"]), 6)
+
+    def test_get_debts_stream(self):
+        response = self.client.get("/debts/stream/", self.params)
+        sync_response = self.client.get("/debts/", self.params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        debts = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(debts, sync_response.json()["debts_list"])
+
+    def test_post_fleet_debts(self):
+        vehicles = [
+            self.params,
+            {**self.params, "debt_option": "ipva"},
+            {"x": 1},
+            {**self.params, "license_plate": "ABC12"},
+            "ABC1234",
+        ]
+
+        response = self.client.post(
+            "/debts/bulk/", {"vehicles": vehicles}, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = {
+            result["index"]: result
+            for result in map(
+                json.loads, b"".join(response.streaming_content).splitlines()
+            )
+        }
+        self.assertEqual(len(results[0]["debts_list"]), 6)
+        self.assertEqual(len(results[1]["debts_list"]), 2)
+        self.assertEqual(results[2]["error"], "veículo inválido")
+        self.assertEqual(set(results[2]["errors"]), {"x", "license_plate", "renavam"})
+        self.assertEqual(
+            {
+                name: results[3][name]
+                for name in ("license_plate", "renavam", "error", "errors")
+            },
+            {
+                "license_plate": "ABC12",
+                "renavam": self.params["renavam"],
+                "error": "veículo inválido",
+                "errors": {"license_plate": ["placa inválida"]},
+            },
+        )
+        self.assertEqual(results[4]["errors"], {"vehicle": ["objeto esperado"]})
+
+    def test_get_debts_vehicle_not_found(self):
+        params = {**self.params, "license_plate": "ZZZ9999"}
+
+        for url in ("/debts/", "/debts/stream/"):
+            response = self.client.get(url, params)
+
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json(), {"error": "veículo não encontrado"})
+
+    def test_get_debts_invalid_params(self):
+        with patch.object(SearchcDebtsUseCase, "execute") as execute:
+            for params, field in (
+                ({**self.params, "license_plate": "ABC12"}, "license_plate"),
+                ({**self.params, "renavam": "1111"}, "renavam"),
+                ({**self.params, "debt_option": "boleto"}, "debt_option"),
+                ({**self.params, "color": "red"}, "color"),
+                ({"renavam": "11111111111"}, "license_plate"),
+            ):
+                response = self.client.get("/debts/", params)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()["errors"]), [field])
+
+        execute.assert_not_called()
+
+    @override_settings(
+        DEBTS={
+            **settings.DEBTS,
+            "detran_api": {**settings.DEBTS["detran_api"], "backend": "http"},
+        }
+    )
+    def test_get_debts_renavam_check_digit(self):
+        response = self.client.get("/debts/stream/", self.params)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"errors": {"renavam": ["RENAVAM inválido"]}})
+
+    def test_post_fleet_debts_without_vehicles(self):
+        response = self.client.post(
+            "/debts/bulk/", {"vehicles": []}, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    async def test_get_debts_async(self):
+        response = await self.async_client.get("/async/debts/", self.params)
+        sync_response = await self.async_client.get("/debts/", self.params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_get_debts_async_ipva_without_installment(self):
+        detran = SyntheticDetran(profile=SyntheticProfile(vehicles=50))
+        without_installment = 0
+
+        with container.detran_SP_api.override(providers.Object(detran.api_class())):
+            for plate, renavam in detran.vehicles():
+                params = {
+                    "license_plate": plate,
+                    "renavam": renavam,
+                    "debt_option": "ipva",
+                }
+                response = await self.async_client.get("/async/debts/", params)
+                sync_response = await self.async_client.get("/debts/", params)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), sync_response.json())
+                without_installment += any(
+                    "installment" not in debt for debt in response.json()["debts_list"]
+                )
+
+        self.assertGreater(without_installment, 0)
+
+    def test_get_debts_upstream_failures(self):
+        class FailingAPI(API):
+            vehicles = [("OVL1234", "11111111111"), ("INC1234", "11111111111")]
+
+            def fetch(self):
+                if self.debt_option != "ConsultaIPVA":
+                    return super().fetch()
+                if self.license_plate == "OVL1234":
+                    raise OverloadedException("ConsultaIPVA")
+                raise RuntimeError("resposta inválida")
+
+        overloaded = {**self.params, "license_plate": "OVL1234"}
+        incomplete = {**self.params, "license_plate": "INC1234"}
+
+        with container.detran_SP_api.override(providers.Object(FailingAPI)):
+            for url in ("/debts/", "/debts/stream/", "/async/debts/"):
+                with self.subTest(url=url):
+                    response = self.client.get(url, overloaded)
+
+                    self.assertEqual(response.status_code, 503)
+                    self.assertEqual(
+                        response.json(),
+                        {
+                            "error": "ConsultaIPVA: limite de consultas "
+                            "simultâneas atingido"
+                        },
+                    )
+
+                    response = self.client.get(url, incomplete)
+
+                    self.assertEqual(response.status_code, 503)
+                    body = response.json()
+                    self.assertEqual(
+                        body["error"], "consultas sem resposta: ConsultaIPVA"
+                    )
+                    self.assertEqual(list(body["failures"]), ["ConsultaIPVA"])
+                    self.assertEqual(len(body["debts_list"]), 4)
+
+    def test_get_debts_stream_truncated_response(self):
+        class TruncatedAPI(API):
+            def stream(self, chunk_size=1024):
+                body = b"".join(super().stream(chunk_size))
+                if self.debt_option == "ConsultaMultas":
+                    # corta logo depois do primeiro registro
+                    body = body[: body.index(b"}") + 1]
+                return iter([body])
+
+        resilience = Resilience()
+        service = providers.Factory(
+            SPService,
+            api_class=TruncatedAPI,
+            resilience=resilience,
+            stream_responses=True,
+        )
+
+        with container.application_service_SPService.override(service):
+            response = self.client.get("/debts/stream/", self.params)
+            lines = [
+                json.loads(line)
+                for line in b"".join(response.streaming_content).splitlines()
+            ]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["auto_infraction"], "5E5E5E5E  ")
+        self.assertRegex(lines[-1]["error"], "^ConsultaMultas: resposta incompleta")
+        self.assertEqual(
+            resilience.stats()["breakers"]["ConsultaMultas"]["failures"], 1
+        )
+
+    def test_get_debts_invalid_records(self):
+        detran = SyntheticDetran(
+            profile=SyntheticProfile(seed=7, vehicles=5, malformed_rate=1.0)
+        )
+        records = 0
+
+        # sem o cache, que guarda as respostas sem registros malformados
+        with container.detran_SP_api.override(
+            providers.Object(detran.api_class())
+        ), container.detran_SP_response_cache.override(providers.Object(None)):
+            for plate, renavam in detran.vehicles():
+                params = {"license_plate": plate, "renavam": renavam}
+                response = self.client.get("/debts/", params)
+                async_response = self.client.get("/async/debts/", params)
+                stream_response = self.client.get("/debts/stream/", params)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["debts_list"], [])
+                self.assertEqual(async_response.json(), response.json())
+                lines = [
+                    json.loads(line)
+                    for line in b"".join(stream_response.streaming_content).splitlines()
+                ]
+                self.assertEqual(lines, response.json()["invalid_records"])
+                records += len(lines)
+
+        self.assertGreater(records, 0)
+
+
+class MetricsResourceTests(TestCase):
+    def test_get_metrics(self):
+        self.client.get("/debts/", DebtResourceTests.params)
+
+        response = self.client.get("/metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        for metric in (
+            'debts_upstream_seconds_count{consultation="ConsultaMultas"}',
+            'debts_parser_seconds_count{category="batch"}',
+            'debts_view_seconds_count{view="DebtResource"}',
+            'debts_render_seconds_count{renderer="DebtsJSONRenderer"}',
+            "# TYPE debts_single_flight_coalesced_total counter",
+            "debts_response_cache_hits_total ",
+            "debts_response_cache_misses_total ",
+            "debts_limiter_in_flight 0",
+            'debts_circuit_breaker_state{consultation="ConsultaMultas"} 0',
+        ):
+            self.assertIn(metric, body)
+
+
+class DjangoResponseCacheTests(TestCase):
+    def test_shared_backend(self):
+        writer = DjangoResponseCache(alias="default")
+        reader = DjangoResponseCache(alias="default")
+
+        writer.set("ABC1234", "11111111111", "ConsultaIPVA", {"IPVAs": {}})
+
+        self.assertEqual(
+            reader.get("ABC1234", "11111111111", "ConsultaIPVA"), {"IPVAs": {}}
+        )
+        self.assertEqual(reader.stats(), {"hits": 1, "misses": 0})
+
+
+class SearchDebtsValidatorTests(SimpleTestCase):
+    def test_search_validator_settings(self):
+        for backend, check, expected in (
+            ("http", True, True),
+            ("synthetic", True, True),
+            ("stub", True, False),
+            ("http", False, False),
+        ):
+            debts = {
+                **settings.DEBTS,
+                "detran_api": {**settings.DEBTS["detran_api"], "backend": backend},
+                "validation": {"renavam_check_digit": check},
+            }
+            with self.subTest(backend=backend, check=check):
+                with override_settings(DEBTS=debts):
+                    self.assertIs(search_validator().check_renavam_digit, expected)
+
+    def test_validate(self):
+        validator = SearchDebtsValidator()
+
+        valid = validator.validate(
+            {"license_plate": "abc-1c34", "renavam": "00000000019"}
+        )
+
+        self.assertTrue(valid)
+        self.assertEqual(
+            validator.input_param,
+            SearchDebtsInput(license_plate="ABC1234", renavam="00000000019"),
+        )
+
+    def test_invalid(self):
+        validator = SearchDebtsValidator()
+
+        valid = validator.validate(
+            {"license_plate": ["ABC1234"], "renavam": 11111111111, "debt_option": "x"}
+        )
+
+        self.assertFalse(valid)
+        self.assertEqual(
+            set(validator.errors), {"license_plate", "renavam", "debt_option"}
+        )
+
+
+class FastValidatorParityTests(SimpleTestCase):
+    class Rules(serializers.Serializer):
+        amount = FloatField(required=True)
+        description = CharField(required=False, allow_null=True, allow_blank=True)
+        title = CharField(required=True)
+        year = IntegerField(required=True)
+
+    def test_same_result_as_drf(self):
+        rules = self.Rules
+
+        class FastValidator(FastValidatorAdapter):
+            rules = compile_rules(self.Rules)
+
+        class DRFValidator(DRFValidatorAdapter):
+            def validate(self, data):
+                return super().validate(rules(data=data))
+
+        samples = [
+            {},
+            {"amount": "1.5", "title": 10, "year": "2021.0", "extra": []},
+            {"amount": True, "description": " ", "title": " x ", "year": " 7 "},
+            {"amount": "abc", "description": [], "title": None, "year": True},
+            {"amount": 1, "description": None, "title": "  ", "year": "1.5"},
+            {"amount": 10**400, "title": False, "year": "9" * 1001},
+        ]
+        for data in samples:
+            fast, drf = FastValidator(), DRFValidator()
+            with self.subTest(data=data):
+                self.assertEqual(fast.validate(data), drf.validate(data))
+                self.assertEqual(fast.errors, drf.errors)
+                self.assertEqual(fast.validated_data, drf.validated_data)
+
+
+class DjangoDebtSnapshotStoreTests(TestCase):
+    vehicle = ("ABC1234", "11111111111", "")
+    ticket = {"type": "ticket", "auto_infraction": "A1", "amount": 100.0}
+    ipva = {"type": "ipva", "year": 2021, "installment": 1, "amount": 50.0}
+
+    def test_history(self):
+        store = DjangoDebtSnapshotStore(max_age=300)
+
+        store.save(*self.vehicle, debts=[self.ticket, self.ipva])
+        unchanged = store.save(*self.vehicle, debts=[self.ticket, self.ipva])
+        paid = store.save(*self.vehicle, debts=[self.ticket])
+
+        self.assertFalse(unchanged)
+        self.assertEqual(paid.paid, [self.ipva])
+        history = list(store.history(*self.vehicle))
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history[0].changes["paid"], [self.ipva])
+        self.assertEqual(store.fresh(*self.vehicle), [self.ticket])
+
+    def test_fresh(self):
+        store = DjangoDebtSnapshotStore(max_age=300)
+        store.save(*self.vehicle, debts=[self.ticket])
+
+        self.assertEqual(store.fresh("abc1234 ", "11111111111", ""), [self.ticket])
+        self.assertIsNone(store.fresh("ABC1234", "11111111111", "ipva"))
+        self.assertIsNone(DjangoDebtSnapshotStore(max_age=0).fresh(*self.vehicle))
+
+        store.history(*self.vehicle).update(
+            searched_at=timezone.now() - timedelta(seconds=301)
+        )
+        self.assertIsNone(store.fresh(*self.vehicle))
+
+
+class DjangoDebtWriterTests(TestCase):
+    def result(self, index, amount):
+        return FleetDebtsOutput(
+            index=index,
+            license_plate=f"abc123{index}",
+            renavam="11111111111",
+            debts_list=[
+                {
+                    "type": "ticket",
+                    "auto_infraction": f"A{index}",
+                    "amount": amount,
+                    "title": "Multa",
+                    "description": "x",
+                },
+                IPVAOutPutMapper.build(
+                    amount=amount,
+                    description="IPVA 2021",
+                    installment=None,
+                    title="IPVA - Cota Única",
+                    type="ipva",
+                    year=2021,
+                ),
+            ],
+        )
+
+    def test_upsert_in_batches(self):
+        writer = DjangoDebtWriter(batch_size=3)
+
+        written = writer.write(self.result(index, 10.0) for index in range(3))
+        writer.write([self.result(0, 20.0)])
+
+        self.assertEqual(written, 6)
+        self.assertEqual(Debt.objects.count(), 6)
+        self.assertEqual(
+            Debt.objects.get(type="ticket", key="A0", license_plate="ABC1230").amount,
+            20.0,
+        )
+        self.assertEqual(
+            Debt.objects.get(type="ipva", license_plate="ABC1230").key, "2021:"
+        )
+
+    def test_ignore_errors(self):
+        writer = DjangoDebtWriter()
+        writer.add(FleetDebtsOutput(index=0, license_plate=None, renavam=None))
+        writer.add(
+            FleetDebtsOutput(
+                index=1,
+                license_plate="ABC1234",
+                renavam="11111111111",
+                debts_list=[],
+                error="consultas sem resposta: ConsultaIPVA",
+            )
+        )
+        # lista incompleta: apagaria os débitos dos registros inválidos
+        writer.add(
+            replace(
+                self.result(2, 10.0),
+                invalid_records=[
+                    DebtRecordError(
+                        category="Multas",
+                        index=1,
+                        record={"AIIP": None},
+                        errors={"auto_infraction": ["This field may not be null."]},
+                    )
+                ],
+            )
+        )
+
+        self.assertEqual(writer.pending, 0)
+
+    def test_delete_paid_debts(self):
+        writer = DjangoDebtWriter(batch_size=2)
+        writer.write([self.result(0, 10.0), self.result(1, 10.0)])
+
+        # a multa do veículo 0 foi paga; o IPVA continua em aberto
+        latest = self.result(0, 10.0)
+        writer.write([replace(latest, debts_list=latest.debts_list[1:])])
+
+        self.assertEqual(writer.deleted, 1)
+        self.assertEqual(
+            set(Debt.objects.values_list("license_plate", "type", "key")),
+            {
+                ("ABC1230", "ipva", "2021:"),
+                ("ABC1231", "ticket", "A1"),
+                ("ABC1231", "ipva", "2021:"),
+            },
+        )
+
+        # busca só de multas sem débitos não mexe no IPVA
+        writer.write([replace(latest, debts_list=[], debt_option="ticket")])
+        self.assertEqual(Debt.objects.filter(license_plate="ABC1230").count(), 1)
+
+        # busca completa sem débitos: o veículo não deve mais nada
+        writer.write([replace(latest, debts_list=[])])
+        self.assertFalse(Debt.objects.filter(license_plate="ABC1230").exists())
+        self.assertEqual(Debt.objects.filter(license_plate="ABC1231").count(), 2)
+
+
+class DebtsJSONRendererTests(SimpleTestCase):
+    output = SearchDebtsOutput(
+        debts_list=[
+            IPVAOutPutMapper.build(
+                amount=1365.69,
+                description="IPVA 2021",
+                installment=None,
+                title="IPVA - Cota Única",
+                type="ipva",
+                year=2021,
+            )
+        ]
+    )
+    expected = {
+        "debts_list": [
+            {
+                "amount": 1365.69,
+                "description": "IPVA 2021",
+                "title": "IPVA - Cota Única",
+                "type": "ipva",
+                "year": 2021,
+            }
+        ],
+        "invalid_records": [],
+    }
+
+    def test_render_output(self):
+        rendered = renderers.DebtsJSONRenderer().render(self.output)
+
+        self.assertEqual(json.loads(rendered), self.expected)
+
+    def test_render_without_orjson(self):
+        with patch.object(renderers, "orjson", None):
+            rendered = renderers.DebtsJSONRenderer().render(self.output)
+
+        self.assertEqual(json.loads(rendered), self.expected)
+
+    def test_renderer_setting(self):
+        params = {"license_plate": "ABC1234", "renavam": "11111111111"}
+        fast_response = self.client.get("/debts/", params)
+
+        with override_settings(DEBTS={**settings.DEBTS, "fast_renderer": False}):
+            default_response = self.client.get("/debts/", params)
+
+        self.assertEqual(fast_response.json(), default_response.json())
+
+
+class SearchDebtsCommandTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.output = self.directory / "output.jsonl"
+
+    def read_output(self):
+        return {
+            result["index"]: result
+            for result in map(json.loads, self.output.read_text().splitlines())
+        }
+
+    def test_search_csv(self):
+        vehicles = self.directory / "vehicles.csv"
+        vehicles.write_text(
+            "license_plate,renavam,debt_option\n"
+            "ABC1234,11111111111,\n"
+            "ABC1234,11111111111,ipva\n"
+            "ABC1234,11111111111,boleto\n"
+        )
+
+        call_command("search_debts", vehicles, self.output, stdout=StringIO())
+
+        results = self.read_output()
+        self.assertEqual(len(results[0]["debts_list"]), 6)
+        self.assertEqual(len(results[1]["debts_list"]), 2)
+        self.assertEqual(results[2]["error"], "veículo inválido")
+        self.assertEqual(list(results[2]["errors"]), ["debt_option"])
+
+    def test_search_malformed_rows(self):
+        vehicles = self.directory / "vehicles.jsonl"
+        vehicles.write_text(
+            '{"license_plate": "ABC1234", "renavam": "11111111111"}\n'
+            '{"license_plate": "ABC1234"}\n'
+            '{"license_plate": "ABC1234", "renavam": \n'
+            '["ABC1234", "11111111111"]\n'
+            '{"license_plate": "AB-12", "renavam": "11111111111", "owner": "x"}\n'
+            '{"license_plate": "ABC1234", "renavam": "11111111111",'
+            ' "debt_option": "ipva"}\n'
+        )
+        stdout = StringIO()
+
+        call_command("search_debts", vehicles, self.output, stdout=stdout)
+
+        results = self.read_output()
+        self.assertEqual(len(results), 6)
+        self.assertEqual(len(results[0]["debts_list"]), 6)
+        self.assertEqual(len(results[5]["debts_list"]), 2)
+        self.assertEqual(
+            {index: results[index]["errors"] for index in range(1, 5)},
+            {
+                1: {"renavam": ["campo obrigatório"]},
+                2: {"line": ["JSON inválido"]},
+                3: {"vehicle": ["objeto esperado"]},
+                4: {"license_plate": ["placa inválida"]},
+            },
+        )
+        self.assertEqual(results[1]["license_plate"], "ABC1234")
+        self.assertIn("veículos: 6 (ignorados: 0), erros: 4", stdout.getvalue())
+
+    def test_search_csv_malformed_rows(self):
+        vehicles = self.directory / "vehicles.csv"
+        vehicles.write_text(
+            "license_plate,renavam\n"
+            "ABC1234\n"
+            "ABC1234,11111111111,ipva\n"
+            "ABC1234,11111111111\n"
+        )
+
+        call_command("search_debts", vehicles, self.output, stdout=StringIO())
+
+        results = self.read_output()
+        self.assertEqual(results[0]["errors"], {"renavam": ["campo obrigatório"]})
+        self.assertEqual(results[1]["errors"], {"line": ["colunas a mais"]})
+        self.assertEqual(len(results[2]["debts_list"]), 6)
+
+    def test_resume_from_checkpoint(self):
+        vehicles = self.directory / "vehicles.jsonl"
+        vehicles.write_text(
+            '{"license_plate": "ABC1234", "renavam": "11111111111"}\n'
+            '{"license_plate": "ABC1234", "renavam": "11111111111",'
+            ' "debt_option": "dpvat"}\n'
+        )
+        self.output.write_text('{"index": 0, "debts_list": []}\n{"index": 1, "de')
+        stdout = StringIO()
+
+        call_command("search_debts", vehicles, self.output, "--resume", stdout=stdout)
+
+        results = self.read_output()
+        self.assertEqual(results[0]["debts_list"], [])
+        self.assertEqual(len(results[1]["debts_list"]), 1)
+        self.assertIn("veículos: 1 (ignorados: 1), erros: 0", stdout.getvalue())
+
+    def test_save(self):
+        vehicles = self.directory / "vehicles.jsonl"
+        vehicles.write_text(
+            '{"license_plate": "ABC1234", "renavam": "11111111111"}\n'
+            '{"license_plate": "ABC1234", "renavam": "11111111111",'
+            ' "debt_option": "boleto"}\n'
+        )
+
+        call_command(
+            "search_debts",
+            vehicles,
+            self.output,
+            "--save",
+            "--batch-size=4",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(len(self.read_output()), 2)
+        self.assertEqual(Debt.objects.count(), 6)
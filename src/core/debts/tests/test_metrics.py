@@ -0,0 +1,136 @@
+import pytest
+
+from core.debts import metrics
+from core.debts.application.dto import SPParserInput
+from core.debts.application.SP.services import SPService
+from core.debts.domain.entities import Multa
+from django_app.container import Container
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(metrics.NullSink())
+
+
+def test_search_stages_are_timed(sink):
+    """
+    GIVEN o sink em memória ligado
+    WHEN uma busca completa for executada e formatada
+    THEN deve haver um histograma para cada etapa da busca.
+    """
+    response = SPService().execute(license_plate="ABC1234", renavam="11111111111")
+    parser = Container().application_service_SPParser()
+    debts = parser.collect_all_debts(SPParserInput(data=response))
+
+    upstream = sink.histogram("debts_upstream_seconds", consultation="ConsultaIPVA")
+    assert upstream.count == 1
+    assert sink.histogram("debts_parser_seconds", category="all").count == 1
+    assert sink.histogram("debts_validation_seconds", entity="Multa").count == 2
+    validations = sum(
+        histogram.count
+        for (name, _), histogram in sink.histograms.items()
+        if name == "debts_validation_seconds"
+    )
+    assert validations == len(debts)
+    assert (
+        sink.histogram("debts_mapper_seconds", mapper="IPVAOutPutMapper.build").count
+        == 2
+    )
+
+
+def test_entities_are_not_timed(sink):
+    """
+    GIVEN o sink em memória ligado
+    WHEN uma entidade for criada direto no domínio
+    THEN nenhuma validação deve ser medida, a medição fica nos casos de uso.
+    """
+    Multa(amount=1500, auto_infraction="1E1", description="Multa")
+
+    assert sink.histograms == {}
+
+
+def test_generator_time_excludes_consumer(sink):
+    """
+    GIVEN um gerador instrumentado
+    WHEN o consumidor demorar entre um item e outro
+    THEN só o tempo gasto dentro do gerador deve ser registrado
+    AND o registro deve acontecer mesmo se o gerador for fechado antes do fim.
+    """
+    clock = iter(range(100))
+    metrics.perf_counter, perf_counter = lambda: next(clock), metrics.perf_counter
+
+    @metrics.timed("generator_seconds")
+    def numbers():
+        yield from range(10)
+
+    try:
+        generator = numbers()
+        next(generator)
+        next(clock)
+        next(generator)
+        generator.close()
+    finally:
+        metrics.perf_counter = perf_counter
+
+    histogram = sink.histogram("generator_seconds")
+    assert (histogram.count, histogram.sum) == (1, 2)
+
+
+def test_prometheus_exposition(sink):
+    """
+    GIVEN tempos registrados
+    WHEN os histogramas forem exportados
+    THEN devem estar no formato de texto do Prometheus, com buckets
+    cumulativos, soma e contagem.
+    """
+    sink.observe("debts_view_seconds", 0.003, (("view", "DebtResource"),))
+    sink.observe("debts_view_seconds", 20, (("view", "DebtResource"),))
+
+    lines = sink.to_prometheus().splitlines()
+
+    assert lines[0] == "# TYPE debts_view_seconds histogram"
+    assert 'debts_view_seconds_bucket{view="DebtResource",le="0.001"} 0' in lines
+    assert 'debts_view_seconds_bucket{view="DebtResource",le="0.005"} 1' in lines
+    assert 'debts_view_seconds_bucket{view="DebtResource",le="+Inf"} 2' in lines
+    assert 'debts_view_seconds_count{view="DebtResource"} 2' in lines
+    assert lines[-2] == 'debts_view_seconds_sum{view="DebtResource"} 20.003'
+
+
+def test_disabled_sink_records_nothing():
+    """
+    GIVEN o sink padrão, desligado
+    WHEN uma busca for executada
+    THEN nada deve ser medido.
+    """
+    assert metrics.get_sink().enabled is False
+
+    SPService().execute(license_plate="ABC1234", renavam="11111111111")
+
+    assert metrics.get_sink().to_prometheus() == ""
+
+
+def test_samples_to_prometheus():
+    """
+    GIVEN counters e gauges lidos dos stats() dos serviços
+    WHEN forem convertidos para o formato do Prometheus
+    THEN cada métrica deve ter o seu TYPE e uma linha por conjunto de labels.
+    """
+    text = metrics.samples_to_prometheus(
+        [
+            ("debts_upstream_retries_total", "counter", (("consultation", "B"),), 2),
+            ("debts_limiter_limit", "gauge", (), 20),
+            ("debts_upstream_retries_total", "counter", (("consultation", "A"),), 1),
+        ]
+    )
+
+    assert text.splitlines() == [
+        "# TYPE debts_limiter_limit gauge",
+        "debts_limiter_limit 20",
+        "# TYPE debts_upstream_retries_total counter",
+        'debts_upstream_retries_total{consultation="A"} 1',
+        'debts_upstream_retries_total{consultation="B"} 2',
+    ]
+    assert metrics.samples_to_prometheus([]) == ""
@@ -1,16 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from dependency_injector import containers, providers
 
 from core.debts.application.SP.services import SPParser, SPService
-from core.debts.application.SP.use_case import SearchcDebtsUseCase
+from core.debts.application.SP.services.api import API
+from core.debts.application.SP.services.cache import (
+    DjangoResponseCache,
+    InMemoryResponseCache,
+)
+from core.debts.application.SP.services.http_api import HTTPAPI, ConnectionPool
+from core.debts.application.SP.services.limiter import AdaptiveLimit, ConcurrencyLimiter
+from core.debts.application.SP.services.resilience import Resilience, RetryPolicy
+from core.debts.application.SP.services.singleflight import SingleFlight
+from core.debts.application.SP.services.synthetic import (
+    SyntheticDetran,
+    SyntheticProfile,
+)
+from core.debts.application.SP.use_case import (
+    SearchcDebtsUseCase,
+    SearchFleetDebtsUseCase,
+)
 from core.debts.application.use_cases import (
     CreateDPVATUseCase,
     CreateIPVAUseCase,
     CreateLicenciamentoUseCase,
     CreateMultaUseCase,
 )
+from core.debts.infra.django_app.snapshots import DjangoDebtSnapshotStore
+from core.debts.infra.django_app.writers import DjangoDebtWriter
+from core.debts.metrics import InMemorySink, NullSink
 
 
 class Container(containers.DeclarativeContainer):
+    config = providers.Configuration(
+        default={
+            "response_cache": {
+                "backend": "memory",
+                "maxsize": 10_000,
+                "alias": "default",
+                "ttls": {},
+            },
+            "fleet": {"max_workers": 8, "max_vehicles": 5_000},
+            "detran_api": {
+                "backend": "stub",
+                "base_url": "",
+                "pool_size": 10,
+                "async_workers": 10,
+                "timeout": 10.0,
+                "synthetic": {"seed": 0, "vehicles": 100_000, "malformed_rate": 0.0},
+                "stream_responses": False,
+            },
+            "resilience": {
+                "max_attempts": 3,
+                "base_delay": 0.1,
+                "max_delay": 1.0,
+                "failure_threshold": 5,
+                "reset_timeout": 30.0,
+            },
+            "metrics": {"sink": "null"},
+            "snapshots": {"backend": "none", "max_age": 300},
+            "persistence": {"batch_size": 500},
+            "limiter": {
+                "initial_limit": 20,
+                "min_limit": 2,
+                "max_limit": 64,
+                "target_latency": 1.0,
+                "per_consultation": {},
+                "queue_timeout": 1.0,
+            },
+        }
+    )
+
+    metrics_sink = providers.Selector(
+        config.metrics.sink,
+        null=providers.Singleton(NullSink),
+        memory=providers.Singleton(InMemorySink),
+    )
+
     use_case_create_multa = providers.Singleton(CreateMultaUseCase)
     use_case_create_IPVA = providers.Singleton(CreateIPVAUseCase)
     use_case_create_DPVAT = providers.Singleton(CreateDPVATUseCase)
@@ -24,12 +91,120 @@ class Container(containers.DeclarativeContainer):
         use_case_create_licenciamento=use_case_create_licenciamento,
     )
 
-    application_service_SPService = providers.Singleton(SPService)
+    detran_SP_executor = providers.Singleton(ThreadPoolExecutor, max_workers=32)
+
+    detran_SP_response_cache = providers.Selector(
+        config.response_cache.backend,
+        memory=providers.Singleton(
+            InMemoryResponseCache,
+            maxsize=config.response_cache.maxsize,
+            ttls=config.response_cache.ttls,
+        ),
+        django=providers.Singleton(
+            DjangoResponseCache,
+            alias=config.response_cache.alias,
+            ttls=config.response_cache.ttls,
+        ),
+        none=providers.Object(None),
+    )
+
+    detran_SP_single_flight = providers.Singleton(SingleFlight)
 
-    use_case_search_debts_sp = providers.Singleton(
+    detran_SP_connection_pool = providers.Singleton(
+        ConnectionPool,
+        base_url=config.detran_api.base_url,
+        maxsize=config.detran_api.pool_size,
+        timeout=config.detran_api.timeout,
+    )
+
+    detran_SP_api = providers.Selector(
+        config.detran_api.backend,
+        stub=providers.Object(API),
+        http=providers.Singleton(
+            partial,
+            HTTPAPI,
+            pool=detran_SP_connection_pool,
+            executor=providers.Singleton(
+                ThreadPoolExecutor,
+                max_workers=config.detran_api.async_workers,
+                thread_name_prefix="detran-sp",
+            ),
+        ),
+        synthetic=providers.Singleton(
+            SyntheticDetran.api_class,
+            providers.Singleton(
+                SyntheticDetran,
+                profile=providers.Factory(
+                    SyntheticProfile,
+                    seed=config.detran_api.synthetic.seed,
+                    vehicles=config.detran_api.synthetic.vehicles,
+                    malformed_rate=config.detran_api.synthetic.malformed_rate,
+                ),
+            ),
+        ),
+    )
+
+    detran_SP_resilience = providers.Singleton(
+        Resilience,
+        retry=providers.Factory(
+            RetryPolicy,
+            max_attempts=config.resilience.max_attempts,
+            base_delay=config.resilience.base_delay,
+            max_delay=config.resilience.max_delay,
+        ),
+        failure_threshold=config.resilience.failure_threshold,
+        reset_timeout=config.resilience.reset_timeout,
+    )
+
+    detran_SP_limiter = providers.Singleton(
+        ConcurrencyLimiter,
+        limit=providers.Factory(
+            AdaptiveLimit,
+            initial_limit=config.limiter.initial_limit,
+            min_limit=config.limiter.min_limit,
+            max_limit=config.limiter.max_limit,
+            target_latency=config.limiter.target_latency,
+        ),
+        per_consultation=config.limiter.per_consultation,
+        queue_timeout=config.limiter.queue_timeout,
+    )
+
+    application_service_SPService = providers.Factory(
+        SPService,
+        concurrent=True,
+        timeout=config.detran_api.timeout,
+        executor=detran_SP_executor,
+        cache=detran_SP_response_cache,
+        single_flight=detran_SP_single_flight,
+        api_class=detran_SP_api,
+        resilience=detran_SP_resilience,
+        limiter=detran_SP_limiter,
+        stream_responses=config.detran_api.stream_responses,
+    )
+
+    debts_snapshot_store = providers.Selector(
+        config.snapshots.backend,
+        django=providers.Singleton(
+            DjangoDebtSnapshotStore, max_age=config.snapshots.max_age
+        ),
+        none=providers.Object(None),
+    )
+
+    debts_writer = providers.Factory(
+        DjangoDebtWriter, batch_size=config.persistence.batch_size
+    )
+
+    use_case_search_debts_sp = providers.Factory(
         SearchcDebtsUseCase,
         service_parser_SP=application_service_SPParser,
         service_detran_SP=application_service_SPService,
+        snapshot_store=debts_snapshot_store,
+    )
+
+    use_case_search_fleet_debts_sp = providers.Factory(
+        SearchFleetDebtsUseCase,
+        use_case_search_debts_SP=use_case_search_debts_sp.provider,
+        max_workers=config.fleet.max_workers,
     )
 
 
@@ -84,6 +84,22 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Compartilhado entre workers: usar com DEBTS["response_cache"]["alias"].
+    "debts": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / ".cache" / "debts",
+        "OPTIONS": {"MAX_ENTRIES": 10_000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -124,3 +140,74 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Busca de débitos (ver django_app.container.Container.config)
+
+DEBTS = {
+    "response_cache": {
+        # "memory" (por processo), "django" (usa CACHES[alias]) ou "none"
+        "backend": "memory",
+        "maxsize": 10_000,
+        "alias": "debts",
+        # TTL em segundos por consulta, sobrescreve os valores padrão;
+        # "VeiculoNaoEncontrado" é o TTL do cache negativo (padrão: 30)
+        "ttls": {},
+    },
+    # Busca em lote (/debts/bulk/): buscas simultâneas e veículos por requisição
+    "fleet": {"max_workers": 8, "max_vehicles": 5_000},
+    # Webservice do Detran-SP: "stub" (API em memória), "http" (HTTPAPI com
+    # pool de conexões keep-alive em base_url) ou "synthetic" (frota sintética
+    # determinística para testes de carga, ver SyntheticDetran)
+    "detran_api": {
+        "backend": "stub",
+        "base_url": "",
+        "pool_size": 10,
+        # threads do executor próprio das consultas assíncronas do "http"
+        # (/async/debts/); acima de pool_size só esperam por uma conexão
+        "async_workers": 10,
+        "timeout": 10.0,
+        "synthetic": {"seed": 0, "vehicles": 100_000, "malformed_rate": 0.0},
+        # /debts/stream/ lê as respostas em pedaços e formata cada débito
+        # conforme chega, sem montar a resposta inteira (sem cache)
+        "stream_responses": False,
+    },
+    # Falhas transitórias do webservice: tentativas por consulta (com backoff
+    # exponencial e jitter) e circuit breaker, que abre após failure_threshold
+    # falhas seguidas e testa de novo depois de reset_timeout segundos
+    "resilience": {
+        "max_attempts": 3,
+        "base_delay": 0.1,
+        "max_delay": 1.0,
+        "failure_threshold": 5,
+        "reset_timeout": 30.0,
+    },
+    # Bulkhead de consultas simultâneas ao webservice: limite total adaptativo
+    # (AIMD, cai quando a latência passa de target_latency), limite fixo por
+    # consulta (ex.: {"ConsultaMultas": 8}) e espera máxima por uma vaga antes
+    # de rejeitar com OverloadedException
+    "limiter": {
+        "initial_limit": 20,
+        "min_limit": 2,
+        "max_limit": 64,
+        "target_latency": 1.0,
+        "per_consultation": {},
+        "queue_timeout": 1.0,
+    },
+    # Tempos de cada etapa da busca: "null" (desligado) ou "memory"
+    # (histogramas no processo, expostos em /metrics/ no formato Prometheus)
+    "metrics": {"sink": "memory"},
+    # Histórico das buscas no banco (DebtSnapshot): "django" ou "none". Uma
+    # busca repetida em menos de max_age segundos é servida do último
+    # snapshot, sem consultar o webservice (0 só registra o histórico)
+    "snapshots": {"backend": "none", "max_age": 300},
+    # search_debts --save: débitos gravados no modelo Debt com um upsert em
+    # lote a cada batch_size linhas
+    "persistence": {"batch_size": 500},
+    # Validação dos parâmetros das rotas de busca (400 antes de consultar o
+    # webservice). O dígito verificador do RENAVAM só é ignorado com o
+    # backend "stub", que responde ao RENAVAM fictício 11111111111
+    "validation": {"renavam_check_digit": True},
+    # Serializa a rota /debts/ com o DebtsJSONRenderer (orjson, se instalado)
+    "fast_renderer": True,
+}